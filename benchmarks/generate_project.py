@@ -0,0 +1,457 @@
+"""Generate a synthetic Django project for benchmarking django-upgrade.
+
+Projects are deterministic for a given size, and contain code for every
+fixer to rewrite, spread over the kinds of file that fixers look for:
+settings, models, admin, URLs, views, tests, migrations, and management
+commands.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+
+class ProjectSize(NamedTuple):
+    apps: int
+    models_per_app: int
+    fields_per_model: int
+
+
+SIZES = {
+    "small": ProjectSize(apps=2, models_per_app=2, fields_per_model=50),
+    "medium": ProjectSize(apps=20, models_per_app=4, fields_per_model=100),
+    "large": ProjectSize(apps=100, models_per_app=4, fields_per_model=300),
+}
+
+# Files are written from templates, with __N__ replaced by the app number.
+
+SETTINGS = """\
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEBUG = True
+USE_L10N = True
+ADMINS = [("Admin", "admin@example.com")]
+MANAGERS = [("Manager", "manager@example.com")]
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+FORMS_URLFIELD_ASSUME_HTTPS = True
+PASSWORD_RESET_TIMEOUT_DAYS = 4
+DEFAULT_FILE_STORAGE = "storages.backends.s3.S3Storage"
+STATICFILES_STORAGE = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "NAME": "benchmark",
+        "HOST": "127.0.0.1",
+        "PORT": "5432",
+    }
+}
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+__INSTALLED_APPS__]
+"""
+
+ROOT_URLS = """\
+from django.conf.urls import include, url
+from django.contrib import admin
+
+urlpatterns = [
+    url(r"^admin/", admin.site.urls),
+__URL_INCLUDES__]
+"""
+
+APP_INIT = """\
+default_app_config = "app__N__.apps.App__N__Config"
+"""
+
+APPS = """\
+from django.apps import AppConfig
+
+
+class App__N__Config(AppConfig):
+    name = "app__N__"
+"""
+
+MODELS_HEADER = """\
+from django.contrib.postgres.fields import FloatRangeField
+from django.db import models
+from django.db.models import CheckConstraint, NullBooleanField, Q
+
+from app__N__.managers import PublishedManager
+from core.models import User
+
+
+class Status(models.IntegerChoices):
+    DRAFT = 1
+    PUBLISHED = 2
+"""
+
+MODEL = '''
+
+class Article__M__(models.Model):
+    """
+    An article, with many fields.
+    """
+
+    published = PublishedManager()
+    title = models.CharField(max_length=200, verbose_name="Title")
+    status = models.IntegerField(choices=Status.choices, default=Status.DRAFT)
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    editor = models.ForeignKey("auth.User")
+    valuable = NullBooleanField("Valuable")
+    price_range = FloatRangeField("Price range")
+__FIELDS__
+    class Meta:
+        index_together = [["title", "status"]]
+        constraints = [
+            CheckConstraint(check=Q(status__gte=1), name="article__M___status"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    @models.permalink
+    def get_absolute_url(self):
+        return ("article_detail", [self.pk])
+'''
+
+# Field definitions cycled through to make models of any size.
+FIELDS = (
+    "    field___I__ = models.CharField(max_length=100, verbose_name='Field __I__')",
+    "    field___I__ = models.IntegerField(default=__I__)",
+    "    field___I__ = models.BooleanField(default=False)",
+    "    field___I__ = models.DateTimeField(auto_now_add=True)",
+    "    field___I__ = models.TextField(blank=True, help_text='Notes __I__')",
+    "    field___I__ = models.DecimalField(decimal_places=2, max_digits=10)",
+)
+
+MANAGERS = """\
+from django.db import models
+
+
+class PublishedManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(status=2)
+"""
+
+ADMIN = """\
+from django.contrib import admin
+from django.contrib.admin.utils import lookup_needs_distinct
+
+from app__N__.models import Article0
+
+
+class Article0Admin(admin.ModelAdmin):
+    list_display = ["title", "upper_title", "is_published"]
+
+    def upper_title(self, obj):
+        return f"<b>{obj.title.upper()}</b>"
+
+    upper_title.allow_tags = True
+    upper_title.short_description = "Title"
+
+    def is_published(self, obj):
+        return obj.status == 2
+
+    is_published.boolean = True
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        return queryset, lookup_needs_distinct(self.opts, search_term)
+
+
+def make_published(modeladmin, request, queryset):
+    queryset.update(status=2)
+
+
+make_published.short_description = "Mark as published"
+
+admin.site.register(Article0, Article0Admin)
+"""
+
+URLS = """\
+from django.conf.urls import include, url
+from django.utils.translation import gettext_lazy as _
+
+from app__N__ import views
+
+urlpatterns = [
+    url(r"^$", views.index, name="index"),
+    url(r"^articles/(?P<pk>[0-9]+)/$", views.detail, name="article_detail"),
+    url(r"^articles/(?P<slug>[-a-zA-Z0-9_]+)/edit/$", views.edit),
+    url(_(r"^about/$"), views.about),
+    url(r"^api/", include("app__N__.api_urls")),
+]
+"""
+
+VIEWS = """\
+from django.contrib.staticfiles import find
+from django.core import paginator
+from django.core.validators import EmailValidator
+from django.db.transaction import savepoint
+from django.forms import ModelMultipleChoiceField
+from django.shortcuts import redirect, render_to_response
+from django.urls import reverse
+from django.utils import encoding, translation
+from django.utils.crypto import get_random_string
+from django.utils.html import format_html
+from django.utils.http import is_safe_url
+from django.utils.text import unescape_entities
+
+from app__N__.models import Article0
+
+validator = EmailValidator(whitelist=["example.com"])
+
+
+articles_field = ModelMultipleChoiceField(
+    Article0.objects.all(), error_messages={"list": "Enter values!"}
+)
+
+
+def index(request):
+    if request.user.is_authenticated():
+        agent = request.META["HTTP_USER_AGENT"]
+        articles = Article0.objects.select_related("author", "author__profile")
+        return render_to_response("index.html", {"articles": articles, "agent": agent})
+    return redirect(reverse("login"))
+
+
+def detail(request, pk):
+    sid = savepoint("detail")
+    title = encoding.force_text(Article0.objects.get(pk=pk).title)
+    label = translation.ugettext("Article")
+    banner = format_html("<h1>{}</h1>".format(title))
+    return render_to_response(
+        "detail.html", {"title": unescape_entities(title), "label": label}
+    )
+
+
+def edit(request, slug):
+    next_url = request.GET.get("next")
+    if not is_safe_url(next_url):
+        next_url = "/"
+    token = get_random_string()
+    pages = paginator.QuerySetPaginator(Article0.objects.all(), 10)
+    css = find("edit.css", all=True)
+    return redirect(next_url)
+
+
+def about(request):
+    return render_to_response("about.html")
+"""
+
+REPORTS = """\
+import datetime
+import datetime as dt
+
+import django
+from django.contrib.postgres.aggregates import ArrayAgg, StringAgg
+from django.db.models import Value
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.functional import lru_cache
+from django.utils.timezone import FixedOffset
+from django.utils.timezone import utc
+
+report_ready = Signal(["report", "user"])
+
+if django.VERSION < (4, 0):
+    LEGACY = True
+else:
+    LEGACY = False
+
+
+def summary(queryset):
+    return queryset.aggregate(
+        ids=ArrayAgg("id", ordering=("title",)),
+        titles=StringAgg("title", delimiter=Value(", ")),
+        names=StringAgg("author__name", ", "),
+    )
+
+
+def dates(value):
+    day = dt.datetime.strptime(value, "%Y-%m-%d").date()
+    year_ago = (timezone.localtime() - dt.timedelta(days=365)).date()
+    now = timezone.localtime(timezone.now(), timezone.utc)
+    today = timezone.localdate(timezone.now())
+    stamp = f"Now: {dt.datetime.now().strftime('%Y-%m-%d')}"
+    offset = FixedOffset(60)
+    created = datetime.datetime(2024, 1, 1, tzinfo=utc)
+    return day, year_ago, now, today, stamp, offset, created
+
+
+@lru_cache
+def fiscal_year_start(year):
+    return dt.date(year, 4, 1)
+"""
+
+MAIL = """\
+from django.core import mail
+from django.core.mail import send_mail
+
+
+def notify(subject, message, recipients):
+    connection = mail.get_connection()
+    mail.send_mass_mail([], fail_silently=False, connection=mail.get_connection())
+    send_mail(subject, message, "noreply@example.com", recipients, fail_silently=True)
+    backend = mail.get_connection("app.backends.Backend", True)
+    return connection, backend
+"""
+
+TESTS = """\
+import unittest
+
+import django
+import pytest
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+
+class ArticleTests(TestCase):
+    allow_database_queries = True
+
+    def test_form_error(self):
+        response = self.client.post("/articles/1/edit/", {})
+        self.assertFormError(response, "form", "title", "This field is required.")
+
+    def test_formset_error(self):
+        self.assertFormsetError("formset", 0, "title", "Required.")
+
+    def test_headers(self):
+        factory = RequestFactory(HTTP_HOST="example.com")
+        self.assertEqual(factory.get("/").get_host(), "example.com")
+        response = self.client.get("/", HTTP_ACCEPT="text/plain")
+        self.assertEqual(response.status_code, 200)
+
+
+class LegacyTests(SimpleTestCase):
+    @unittest.skipIf(django.VERSION < (4, 1), "Django 4.1+")
+    def test_new_feature(self):
+        pass
+
+
+@pytest.mark.parametrize(
+    "status, expected",
+    [
+        (1, False),
+        (2, True),
+    ],
+    ids=["draft", "published"],
+)
+def test_is_published(status, expected):
+    assert (status == 2) is expected
+"""
+
+MIGRATION = """\
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Article0",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200, verbose_name="Title")),
+                ("valuable", models.NullBooleanField()),
+            ],
+        ),
+    ]
+"""
+
+COMMAND = """\
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    requires_system_checks = False
+
+    def handle(self, *args, **options):
+        self.stdout.write("Done")
+"""
+
+
+def iter_project_files(size: ProjectSize) -> Iterator[tuple[str, str]]:
+    """
+    Yield (path, contents) for each file in a project of the given size.
+    """
+    apps = [f"app{n}" for n in range(size.apps)]
+    yield "project/__init__.py", ""
+    yield (
+        "project/settings.py",
+        SETTINGS.replace(
+            "__INSTALLED_APPS__", "".join(f'    "{app}",\n' for app in apps)
+        ),
+    )
+    yield (
+        "project/urls.py",
+        ROOT_URLS.replace(
+            "__URL_INCLUDES__",
+            "".join(f'    url(r"^{app}/", include("{app}.urls")),\n' for app in apps),
+        ),
+    )
+
+    for n, app in enumerate(apps):
+        for path, template in (
+            ("__init__.py", APP_INIT),
+            ("apps.py", APPS),
+            ("models.py", models_source(size)),
+            ("managers.py", MANAGERS),
+            ("admin.py", ADMIN),
+            ("urls.py", URLS),
+            ("views.py", VIEWS),
+            ("reports.py", REPORTS),
+            ("mail.py", MAIL),
+            ("tests.py", TESTS),
+            ("migrations/__init__.py", ""),
+            ("migrations/0001_initial.py", MIGRATION),
+            ("management/__init__.py", ""),
+            ("management/commands/__init__.py", ""),
+            (f"management/commands/sync_{app}.py", COMMAND),
+        ):
+            yield f"{app}/{path}", template.replace("__N__", str(n))
+
+
+def models_source(size: ProjectSize) -> str:
+    parts = [MODELS_HEADER]
+    for m in range(size.models_per_app):
+        fields = "".join(
+            FIELDS[i % len(FIELDS)].replace("__I__", str(i)) + "\n"
+            for i in range(size.fields_per_model)
+        )
+        parts.append(MODEL.replace("__M__", str(m)).replace("__FIELDS__", fields))
+    return "".join(parts)
+
+
+def generate_project(root: Path, size: ProjectSize) -> None:
+    for path, contents in iter_project_files(size):
+        file_path = root / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(contents)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("root", help="Directory to write the project to.")
+    parser.add_argument("--size", choices=SIZES, default="small")
+    args = parser.parse_args(argv)
+
+    generate_project(Path(args.root), SIZES[args.size])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
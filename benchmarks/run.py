@@ -0,0 +1,304 @@
+"""Measure django-upgrade's end-to-end throughput on a synthetic project.
+
+Each measurement runs the django-upgrade CLI in a fresh process, with
+--check so that the project stays unchanged, and reports the median time
+as files and megabytes per second, along with the peak RSS of the process.
+
+Run from the repository root:
+
+    python -m benchmarks.run run --size medium
+    python -m benchmarks.run compare main HEAD --size large
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from benchmarks.generate_project import SIZES, generate_project
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+class Result:
+    """
+    Measurements from repeated runs of one version of django-upgrade.
+    """
+
+    __slots__ = ("label", "files", "size", "times", "max_rss")
+
+    def __init__(self, label: str, files: int, size: int) -> None:
+        self.label = label
+        self.files = files
+        # Total size of the files, in bytes
+        self.size = size
+        self.times: list[float] = []
+        # Peak RSS across runs, in bytes
+        self.max_rss = 0
+
+    def add(self, time: float, max_rss: int) -> None:
+        self.times.append(time)
+        self.max_rss = max(self.max_rss, max_rss)
+
+    @property
+    def median_time(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.median_time
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.size / 1_000_000 / self.median_time
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "label": self.label,
+            "files": self.files,
+            "bytes": self.size,
+            "times": self.times,
+            "median_time": self.median_time,
+            "files_per_second": self.files_per_second,
+            "mb_per_second": self.mb_per_second,
+            "max_rss": self.max_rss,
+        }
+
+
+class Runner:
+    """
+    Runs the django-upgrade CLI from one source tree over a list of files.
+    """
+
+    __slots__ = ("label", "env", "args")
+
+    def __init__(
+        self,
+        label: str,
+        src: Path,
+        filenames: Sequence[str],
+        *,
+        jobs: int,
+        target_version: str,
+    ) -> None:
+        self.label = label
+        self.env = python_env(src)
+        help_text = run_python(self.env, "-m", "django_upgrade", "--help")
+        self.args = [
+            sys.executable,
+            "-m",
+            "django_upgrade",
+            "--target-version",
+            target_version,
+            "--check",
+        ]
+        # Older versions lack these options, and always run without a cache,
+        # in one process.
+        if "--no-cache" in help_text:
+            self.args.append("--no-cache")
+        if "--jobs" in help_text:
+            self.args.extend(["--jobs", str(jobs)])
+        self.args.extend(filenames)
+
+    def measure(self) -> tuple[float, int]:
+        """
+        Run once, returning the time taken and the peak RSS in bytes.
+        """
+        with tempfile.TemporaryFile() as stderr:
+            start = perf_counter()
+            proc = subprocess.Popen(
+                self.args, env=self.env, stdout=subprocess.DEVNULL, stderr=stderr
+            )
+            # Wait with wait4() to get the resource usage of this child alone.
+            _, status, rusage = os.wait4(proc.pid, 0)
+            elapsed = perf_counter() - start
+            proc.returncode = os.waitstatus_to_exitcode(status)
+
+            # --check exits with 1 when it would rewrite files.
+            if proc.returncode not in (0, 1):
+                stderr.seek(0)
+                raise SystemExit(
+                    f"{self.label}: django-upgrade exited with {proc.returncode}:\n"
+                    + stderr.read().decode(errors="replace")
+                )
+
+        # ru_maxrss is in bytes on macOS, and kilobytes elsewhere.
+        if sys.platform == "darwin":
+            return elapsed, rusage.ru_maxrss
+        return elapsed, rusage.ru_maxrss * 1024
+
+
+def python_env(src: Path) -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": str(src)}
+
+
+def run_python(env: dict[str, str], *args: str) -> str:
+    return subprocess.run(
+        [sys.executable, *args],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+
+def max_target_version(src: Path) -> tuple[int, int]:
+    output = run_python(
+        python_env(src),
+        "-c",
+        "from django_upgrade.main import SUPPORTED_TARGET_VERSIONS as versions; "
+        + "print(*max(versions))",
+    )
+    major, minor = map(int, output.split())
+    return major, minor
+
+
+def project_files(root: Path) -> list[str]:
+    return sorted(str(path) for path in root.rglob("*.py"))
+
+
+def extract_revision(revision: str, dest: Path) -> Path:
+    """
+    Extract the source of django_upgrade at a git revision into dest, and
+    return the directory to put on the Python path.
+    """
+    try:
+        archive = subprocess.run(
+            ["git", "-C", str(REPO_ROOT), "archive", "--format=tar", revision, "src"],
+            capture_output=True,
+            check=True,
+        ).stdout
+    except subprocess.CalledProcessError as exc:
+        message = exc.stderr.decode(errors="replace").strip()
+        raise SystemExit(f"Could not archive {revision!r}: {message}")
+
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+        else:
+            tar.extractall(dest)
+    return dest / "src"
+
+
+def print_results(results: Sequence[Result]) -> None:
+    first = results[0]
+    print(
+        f"{len(first.times)} runs over {first.files} files, "
+        + f"{first.size / 1_000_000:.2f} MB"
+    )
+    print()
+    print(
+        f"{'Version':<24} {'Time (s)':>10} {'Files/s':>10} {'MB/s':>10}"
+        + f" {'Peak RSS (MB)':>14}"
+    )
+    for result in results:
+        print(
+            f"{result.label:<24} {result.median_time:>10.3f}"
+            + f" {result.files_per_second:>10.1f} {result.mb_per_second:>10.3f}"
+            + f" {result.max_rss / 1_000_000:>14.1f}"
+        )
+    for result in results[1:]:
+        print()
+        print(
+            f"{result.label} is {first.median_time / result.median_time:.2f}x "
+            + f"as fast as {first.label}"
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    # Options shared by both commands
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--size", choices=SIZES, default="medium")
+    common.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of measured runs of each version, after one warmup run.",
+    )
+    common.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Value for django-upgrade’s --jobs option.",
+    )
+    common.add_argument(
+        "--target-version",
+        help="Django version to target, defaults to the newest supported.",
+    )
+    common.add_argument(
+        "--json",
+        metavar="PATH",
+        help="Also write the results to the given file as JSON.",
+    )
+
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("run", parents=[common], help="Measure the working tree.")
+    compare_parser = subparsers.add_parser(
+        "compare",
+        parents=[common],
+        help="Measure two git revisions, alternating between them.",
+    )
+    compare_parser.add_argument("revisions", nargs=2, metavar="REVISION")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        project = tmp_path / "project"
+        generate_project(project, SIZES[args.size])
+        filenames = project_files(project)
+        size = sum(os.path.getsize(filename) for filename in filenames)
+
+        if args.command == "run":
+            sources = [("working tree", REPO_ROOT / "src")]
+        else:
+            sources = [
+                (revision, extract_revision(revision, tmp_path / f"rev{n}"))
+                for n, revision in enumerate(args.revisions)
+            ]
+
+        target_version = args.target_version
+        if target_version is None:
+            # Compare like with like, at the newest version all support.
+            major, minor = min(max_target_version(src) for _, src in sources)
+            target_version = f"{major}.{minor}"
+
+        runners = [
+            Runner(
+                label,
+                src,
+                filenames,
+                jobs=args.jobs,
+                target_version=target_version,
+            )
+            for label, src in sources
+        ]
+        results = [Result(runner.label, len(filenames), size) for runner in runners]
+        # Warm up, so every measured run finds compiled bytecode.
+        for runner in runners:
+            runner.measure()
+        # Interleave the versions, so changes in machine load affect both.
+        for _ in range(args.repeat):
+            for runner, result in zip(runners, results):
+                result.add(*runner.measure())
+
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([result.as_json() for result in results], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Generate the manifest of fixers, which lets django-upgrade import only
+the fixers it needs.
+
+Run after adding or changing a fixer's name, min_version, condition,
+triggers, or registered node types.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from pathlib import Path
+
+from django_upgrade.data import FIXERS, import_all_fixers
+
+_MANIFEST_FILE = (
+    Path(__file__).parent.parent / "src" / "django_upgrade" / "fixer_manifest.py"
+)
+
+HEADER = """\
+# Generated by scripts/generate_fixer_manifest.py, do not edit.
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class FixerInfo(NamedTuple):
+    min_version: tuple[int, int]
+    # Name of a boolean State attribute required for the fixer to run.
+    condition: str | None
+    # Names of the AST node types the fixer visits.
+    node_types: tuple[str, ...]
+    # Identifiers, one of which must appear in a file for the fixer to
+    # rewrite it, or None if the fixer has to see every file.
+    triggers: tuple[str, ...] | None
+
+
+FIXER_MANIFEST: dict[str, FixerInfo] = {
+"""
+
+
+def render_manifest() -> str:
+    import_all_fixers()
+    lines = [HEADER]
+    for name, fixer in sorted(FIXERS.items()):
+        node_types = tuple(
+            sorted(type_.__name__ for type_, _ in fixer.ast_funcs.items())
+        )
+        lines.append(
+            f"    {name!r}: FixerInfo(\n"
+            + f"        min_version={fixer.min_version!r},\n"
+            + f"        condition={fixer.condition!r},\n"
+            + f"        node_types={node_types!r},\n"
+            + f"        triggers={render_triggers(fixer.triggers)},\n"
+            + "    ),\n"
+        )
+    lines.append("}\n")
+    return "".join(lines).replace("'", '"')
+
+
+def render_triggers(triggers: tuple[str, ...] | None) -> str:
+    if triggers is None:
+        return "None"
+    if len(triggers) == 1:
+        return f"({triggers[0]!r},)"
+    return "(\n" + "".join(f"            {t!r},\n" for t in triggers) + "        )"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with a non-zero status if the manifest is out of date.",
+    )
+    args = parser.parse_args(argv)
+
+    content = render_manifest()
+    if args.check:
+        if _MANIFEST_FILE.read_text() != content:
+            print(f"{_MANIFEST_FILE} is out of date")
+            return 1
+        return 0
+
+    _MANIFEST_FILE.write_text(content)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
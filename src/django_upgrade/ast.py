@@ -1,30 +1,81 @@
 from __future__ import annotations
 
 import ast
+import re
 import warnings
+from collections import defaultdict
 from collections.abc import Container
-from typing import TYPE_CHECKING, Literal, cast
-from weakref import WeakKeyDictionary
+from typing import TYPE_CHECKING, Literal, NamedTuple, cast
 
 from tokenize_rt import Offset
 
+from django_upgrade.data import Scratch
+
 if TYPE_CHECKING:
-    from django_upgrade.data import State
+    from django_upgrade.data import ParentChain, State
+
+
+class CallSite(NamedTuple):
+    node: ast.Call
+    # The call’s ancestors, as viewed by data.Parents.
+    chain: ParentChain
+
+
+class ModuleSummary:
+    """
+    Facts about a whole module that fixers check before rewriting parts of
+    it, gathered in one walk shared between fixers.
+    """
+
+    __slots__ = ("names", "name_counts", "calls")
+
+    def __init__(
+        self,
+        names: frozenset[str],
+        name_counts: dict[str, int],
+        calls: dict[str, list[CallSite]],
+    ) -> None:
+        # Names bound or used anywhere in the module.
+        self.names = names
+        # Number of ast.Name nodes for each name.
+        self.name_counts = name_counts
+        # Calls of plain names, by name.
+        self.calls = calls
+
 
+# Each file’s summary, built on first use.
+_summary: Scratch[ModuleSummary | None] = Scratch(lambda: None)
 
-_module_names: WeakKeyDictionary[ast.Module, frozenset[str]] = WeakKeyDictionary()
 
+def get_module_summary(state: State, module: ast.Module) -> ModuleSummary:
+    """
+    Summarize module, the tree of the file that state is for, once per file.
+    """
+    summary = _summary.get(state)
+    if summary is None:
+        summary = _summarize(module)
+        _summary.set(state, summary)
+    return summary
 
-def get_module_names(module: ast.Module) -> frozenset[str]:
-    try:
-        return _module_names[module]
-    except KeyError:
-        pass
 
+def _summarize(module: ast.Module) -> ModuleSummary:
     names: set[str] = set()
-    for node in ast.walk(module):
+    name_counts: defaultdict[str, int] = defaultdict(int)
+    calls: defaultdict[str, list[CallSite]] = defaultdict(list)
+    nodes: list[tuple[ast.AST, ParentChain]] = [(module, None)]
+    while nodes:
+        node, chain = nodes.pop()
         if isinstance(node, ast.Name):
             names.add(node.id)
+            name_counts[node.id] += 1
+            # Skip ctx, the only child.
+            continue
+        elif isinstance(node, ast.Constant):
+            # No children.
+            continue
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                calls[node.func.id].append(CallSite(node, chain))
         elif isinstance(node, ast.Import):
             for alias in node.names:
                 if alias.asname is not None:
@@ -44,16 +95,41 @@ def get_module_names(module: ast.Module) -> frozenset[str]:
         elif isinstance(node, ast.MatchMapping) and node.rest is not None:
             names.add(node.rest)
 
-    result = frozenset(names)
-    _module_names[module] = result
-    return result
+        subchain: ParentChain = (
+            node,
+            chain,
+            1 if chain is None else chain[2] + 1,
+            node if chain is None else chain[3],
+        )
+        for child in ast.iter_child_nodes(node):
+            nodes.append((child, subchain))
+
+    name_counts.default_factory = None
+    calls.default_factory = None
+    return ModuleSummary(frozenset(names), name_counts, calls)
+
+
+def get_module_names(state: State, module: ast.Module) -> frozenset[str]:
+    return get_module_summary(state, module).names
 
 
-def ast_parse(contents_text: str) -> ast.Module:
-    # intentionally ignore warnings, we can't do anything about them
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        return ast.parse(contents_text.encode())
+# Filename given to parsed code, so its warnings can be told apart.
+PARSE_FILENAME = "<django-upgrade>"
+
+# Intentionally ignore warnings from parsing, we can't do anything about them.
+# One process-wide filter avoids the cost of catch_warnings() per file, and
+# unlike it, is thread-safe.
+warnings.filterwarnings("ignore", module=re.escape(PARSE_FILENAME))
+
+
+def ast_parse(contents: str | bytes) -> ast.Module:
+    """
+    Parse contents, preferably as the UTF-8 bytes read from a file, to avoid
+    encoding them again.
+    """
+    if isinstance(contents, str):
+        contents = contents.encode()
+    return ast.parse(contents, filename=PARSE_FILENAME)
 
 
 def ast_start_offset(node: ast.expr | ast.keyword | ast.stmt) -> Offset:
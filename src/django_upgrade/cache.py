@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import time
+from collections import OrderedDict
+
+from django_upgrade.data import Settings
+
+# Maximum number of entries kept, each an empty file.
+MAX_ENTRIES = 2**18
+# How often to check the number of entries, in seconds.
+EVICT_INTERVAL = 60 * 60
+# Files modified within this many seconds of being read might be modified
+# again without their mtime changing, so are only cached by content.
+MTIME_GRACE = 2
+# Number of keys kept in memory by LRUCache.
+LRU_SIZE = 2**14
+# Number of fixed files’ contents kept in memory by LRUCache.
+LRU_FIXED_SIZE = 2**8
+
+
+def default_cache_dir() -> str:
+    if env_dir := os.environ.get("DJANGO_UPGRADE_CACHE_DIR"):
+        return env_dir
+    if sys.platform == "win32":  # pragma: no cover
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "django-upgrade")
+
+
+class Cache:
+    """
+    Records which files django-upgrade left unchanged, so they can be
+    skipped on later runs.
+
+    Each record is an empty file, named after the hash of a key that
+    includes the tool version and Settings. Files are first looked up by
+    their path, size, and mtime, and then by a hash of their contents. Empty
+    files are created atomically, so many processes can share the cache.
+    """
+
+    __slots__ = ("directory", "prefix")
+
+    def __init__(self, directory: str, settings: Settings, version: str) -> None:
+        self.directory = directory
+        self.prefix = "\0".join(
+            (
+                version,
+                # Which files parse depends on the Python version.
+                str(sys.implementation.cache_tag),
+                repr(settings.target_version),
+                repr(sorted(settings.enabled_fixers)),
+                repr(
+                    sorted(
+                        (module, sorted(names.items()))
+                        for module, names in settings.compat_imports.items()
+                    )
+                ),
+            )
+        )
+
+    def stat_key(self, filename: str, stat: os.stat_result) -> str | None:
+        if stat.st_mtime > time.time() - MTIME_GRACE:
+            return None
+        return self._hash(
+            "stat",
+            filename,
+            os.path.abspath(filename),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            str(stat.st_ino),
+        )
+
+    def contents_key(self, filename: str, contents: bytes) -> str:
+        # The filename is included since some fixers depend on it.
+        return self._hash("contents", filename, hashlib.sha256(contents).hexdigest())
+
+    def _hash(self, *parts: str) -> str:
+        return hashlib.sha256("\0".join((self.prefix, *parts)).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def __contains__(self, key: str) -> bool:
+        path = self._path(key)
+        try:
+            # Touch the entry, so evict() removes the least recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Read-only, or shared with other users
+            return os.path.exists(path)
+        return True
+
+    def add(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            return
+        except OSError:
+            # Caching is best-effort
+            return
+        os.close(fd)
+
+    def get_fixed(self, key: str) -> str | None:
+        """
+        Return the fixed text of the file with the given contents key, if
+        remembered. Only LRUCache remembers fixed files, in memory.
+        """
+        return None
+
+    def add_fixed(self, key: str, text: str) -> None:
+        pass
+
+    def evict(self, max_entries: int = MAX_ENTRIES) -> None:
+        """
+        Remove the least recently used entries above max_entries. Only
+        checked every EVICT_INTERVAL, since it requires listing all entries.
+        """
+        stamp = os.path.join(self.directory, "last-evict")
+        try:
+            if os.stat(stamp).st_mtime > time.time() - EVICT_INTERVAL:
+                return
+        except FileNotFoundError:
+            pass
+        except OSError:  # pragma: no cover
+            return
+
+        try:
+            with open(stamp, "w"):
+                pass
+            with os.scandir(self.directory) as it:
+                shards = [entry.path for entry in it if entry.is_dir()]
+        except OSError:
+            return
+
+        entries: list[tuple[float, str]] = []
+        for shard in shards:
+            try:
+                with os.scandir(shard) as it:
+                    entries.extend((entry.stat().st_mtime, entry.path) for entry in it)
+            except OSError:  # pragma: no cover
+                # Concurrently evicted
+                continue
+
+        if len(entries) <= max_entries:
+            return
+
+        entries.sort()
+        for _, path in entries[: len(entries) - max_entries]:
+            try:
+                os.unlink(path)
+            except OSError:  # pragma: no cover
+                # Concurrently evicted
+                pass
+
+
+class LRUCache(Cache):
+    """
+    A Cache with an in-memory layer of recently seen keys, for long-lived
+    processes that check the same files repeatedly. It also remembers the
+    fixed text of recently changed files, so checking them again, such as
+    with --check or --diff, skips fixing them.
+    """
+
+    __slots__ = ("maxsize", "recent", "fixed_maxsize", "fixed")
+
+    def __init__(
+        self,
+        directory: str,
+        settings: Settings,
+        version: str,
+        maxsize: int = LRU_SIZE,
+        fixed_maxsize: int = LRU_FIXED_SIZE,
+    ) -> None:
+        super().__init__(directory, settings, version)
+        self.maxsize = maxsize
+        self.recent: OrderedDict[str, None] = OrderedDict()
+        self.fixed_maxsize = fixed_maxsize
+        self.fixed: OrderedDict[str, str] = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        if key in self.recent:
+            self.recent.move_to_end(key)
+            return True
+        if super().__contains__(key):
+            self._remember(key)
+            return True
+        return False
+
+    def add(self, key: str) -> None:
+        if key not in self.recent:
+            super().add(key)
+        self._remember(key)
+
+    def get_fixed(self, key: str) -> str | None:
+        text = self.fixed.get(key)
+        if text is not None:
+            self.fixed.move_to_end(key)
+        return text
+
+    def add_fixed(self, key: str, text: str) -> None:
+        self.fixed[key] = text
+        self.fixed.move_to_end(key)
+        if len(self.fixed) > self.fixed_maxsize:
+            self.fixed.popitem(last=False)
+
+    def _remember(self, key: str) -> None:
+        self.recent[key] = None
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.maxsize:
+            self.recent.popitem(last=False)
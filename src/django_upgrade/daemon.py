@@ -0,0 +1,242 @@
+"""
+A long-lived server that keeps the fixers and settings loaded, and a thin
+client for it.
+
+The client only imports the standard library, so it starts much faster than
+django-upgrade itself. Each client invocation sends one JSON request line
+over a Unix socket and reads one JSON response line back.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+from collections.abc import Sequence
+from contextlib import redirect_stderr, redirect_stdout
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from django_upgrade.cache import LRUCache
+    from django_upgrade.data import Settings
+
+
+def default_socket_path() -> str:
+    """
+    A socket path unique to the current directory, so each project gets its
+    own daemon with its own settings.
+    """
+    digest = hashlib.sha256(os.getcwd().encode()).hexdigest()[:12]
+    return os.path.join(_socket_dir(), f"django-upgrade-{digest}.sock")
+
+
+def _socket_dir() -> str:
+    """
+    A directory for sockets that only the current user can access, so other
+    users can neither impersonate the daemon nor read the files sent to it.
+    """
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return runtime_dir
+
+    uid = os.getuid()
+    path = os.path.join(tempfile.gettempdir(), f"django-upgrade-{uid}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as exc:
+        raise SystemExit(f"django-upgrade: could not create {path!r}: {exc}")
+
+    # Another user could have created the directory first.
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or st.st_mode & 0o077:
+        raise SystemExit(
+            f"django-upgrade: {path!r} must be a directory owned by the current "
+            + "user with mode 0700, or set XDG_RUNTIME_DIR"
+        )
+    return path
+
+
+def daemon_main(argv: Sequence[str] | None = None) -> int:
+    from django_upgrade.main import add_settings_arguments, get_settings
+
+    parser = argparse.ArgumentParser(prog="django-upgrade-daemon")
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Path of the Unix socket to listen on.",
+    )
+    add_settings_arguments(parser)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don’t read or write the cache of unchanged files.",
+    )
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):  # pragma: no cover
+        parser.error("daemon mode requires Unix socket support")
+
+    server = make_server(
+        args.socket or default_socket_path(),
+        get_settings(args),
+        use_cache=not args.no_cache,
+    )
+    print(f"Listening on {server.server_address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        close_server(server)
+    return 0
+
+
+def make_server(path: str, settings: Settings, *, use_cache: bool) -> DaemonServer:
+    from importlib import metadata
+
+    from django_upgrade.cache import LRUCache, default_cache_dir
+
+    cache = None
+    if use_cache:
+        cache = LRUCache(
+            default_cache_dir(), settings, metadata.version("django-upgrade")
+        )
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    return DaemonServer(path, settings, cache)
+
+
+def close_server(server: DaemonServer) -> None:
+    server.server_close()
+    try:
+        os.unlink(server.server_address)  # type: ignore [arg-type]
+    except FileNotFoundError:  # pragma: no cover
+        pass
+
+
+if hasattr(socket, "AF_UNIX"):  # pragma: no branch
+
+    class DaemonServer(socketserver.UnixStreamServer):
+        """
+        Serves requests one at a time, since fixing changes the working
+        directory and standard streams.
+        """
+
+        def __init__(
+            self, path: str, settings: Settings, cache: LRUCache | None
+        ) -> None:
+            self.settings = settings
+            self.cache = cache
+            super().__init__(path, DaemonHandler)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server_fix(json.loads(line))
+            except Exception as exc:
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    def server_fix(self, request: dict[str, Any]) -> dict[str, Any]:
+        from functools import partial
+
+        from django_upgrade.files import iter_filenames
+        from django_upgrade.main import fix_file, fix_files
+
+        fix = partial(
+            fix_file,
+            settings=self.server.settings,
+            exit_zero_even_if_changed=request["exit_zero_even_if_changed"],
+            check=request["check"],
+            cache=self.server.cache,
+        )
+        stdin = io.TextIOWrapper(
+            io.BytesIO(request.get("stdin", "").encode("utf-8", "surrogateescape"))
+        )
+        out = io.StringIO()
+        err = io.StringIO()
+        old_cwd = os.getcwd()
+        old_stdin = sys.stdin
+        os.chdir(request["cwd"])
+        sys.stdin = stdin
+        try:
+            with redirect_stdout(out), redirect_stderr(err):
+                returncode = fix_files(iter_filenames(request["filenames"]), fix)
+        finally:
+            sys.stdin = old_stdin
+            os.chdir(old_cwd)
+        return {
+            "returncode": returncode,
+            "stdout": out.getvalue(),
+            "stderr": err.getvalue(),
+        }
+
+
+def client_main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="django-upgrade-client")
+    parser.add_argument(
+        "filenames",
+        nargs="+",
+        help="Filenames or directories to fix, or '-' for stdin.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Path of the daemon’s Unix socket.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only output files to change, do not change files.",
+    )
+    parser.add_argument(
+        "--exit-zero-even-if-changed",
+        action="store_true",
+        help="Exit with a zero return code even if files have changed.",
+    )
+    args = parser.parse_args(argv)
+
+    request: dict[str, Any] = {
+        "cwd": os.getcwd(),
+        "filenames": args.filenames,
+        "check": args.check,
+        "exit_zero_even_if_changed": args.exit_zero_even_if_changed,
+    }
+    if "-" in args.filenames:
+        request["stdin"] = sys.stdin.buffer.read().decode("utf-8", "surrogateescape")
+
+    path = args.socket or default_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError as exc:
+        raise SystemExit(
+            f"django-upgrade: could not connect to daemon at {path!r}: {exc}"
+        )
+    if not line:
+        raise SystemExit("django-upgrade: daemon closed the connection")
+
+    response = json.loads(line)
+    if "error" in response:
+        raise SystemExit(f"django-upgrade: daemon error: {response['error']}")
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["returncode"]  # type: ignore [no-any-return]
@@ -4,13 +4,20 @@ import ast
 import pkgutil
 import re
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from functools import cached_property
-from typing import TYPE_CHECKING, Any, TypeVar
+from itertools import count
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast, overload
 
 from tokenize_rt import Offset, Token
 
 from django_upgrade import fixers
+from django_upgrade.fixer_manifest import FIXER_MANIFEST
+
+if TYPE_CHECKING:
+    from django_upgrade.stats import FileStats
+    from django_upgrade.tokens import Edit
 
 
 class Settings:
@@ -18,6 +25,13 @@ class Settings:
         "target_version",
         "enabled_fixers",
         "compat_imports",
+        "active_fixers",
+        "conditions",
+        "any_unconditional",
+        "dispatch_tables",
+        "trigger_re",
+        "trigger_bytes_re",
+        "scratch",
     )
 
     def __init__(
@@ -31,10 +45,102 @@ class Settings:
         self.compat_imports = compat_imports or {}
         self.enabled_fixers = {
             name
-            for name in FIXERS
+            for name in FIXER_MANIFEST
             if (only_fixers is None or name in only_fixers)
             and (skip_fixers is None or name not in skip_fixers)
         }
+        # Enabled fixers that support the target version, in manifest order.
+        self.active_fixers = tuple(
+            name
+            for name, info in FIXER_MANIFEST.items()
+            if name in self.enabled_fixers and info.min_version <= target_version
+        )
+        # Conditions of the active fixers. Which of them hold for a file
+        # give its classification, a bitmask selecting its dispatch table.
+        self.conditions = tuple(
+            sorted(
+                {
+                    condition
+                    for name in self.active_fixers
+                    if (condition := FIXER_MANIFEST[name].condition) is not None
+                }
+            )
+        )
+        self.any_unconditional = any(
+            FIXER_MANIFEST[name].condition is None for name in self.active_fixers
+        )
+        # Dispatch tables by classification, built on first use.
+        self.dispatch_tables: dict[int, DispatchTable] = {}
+        self.trigger_re = compile_triggers(self)
+        self.trigger_bytes_re = (
+            None
+            if self.trigger_re is None
+            else re.compile(self.trigger_re.pattern.encode())
+        )
+        # Values of fixers’ Scratch slots shared by all files, by index.
+        self.scratch: list[Any] = []
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = {name: getattr(self, name) for name in self.__slots__}
+        # Scratch indexes depend on the order fixers were imported in, which
+        # differs between processes, so workers start with empty slots.
+        state["scratch"] = []
+        # Rebuilt on first use, since MappingProxyType can’t be pickled.
+        state["dispatch_tables"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def could_change_filename(self, filename: str) -> bool:
+        """
+        Whether any fixer could run on the file, judged from its filename.
+        """
+        return (
+            self.any_unconditional
+            or State(self, filename, defaultdict(set)).classification != 0
+        )
+
+    def could_change(self, contents: str) -> bool:
+        """
+        Whether any fixer could rewrite contents, judged from their triggers.
+        """
+        return self.trigger_re is None or self.trigger_re.search(contents) is not None
+
+    def could_change_bytes(self, contents: bytes) -> bool:
+        """
+        Like could_change(), but on UTF-8 encoded contents, so files can be
+        checked before decoding.
+        """
+        return (
+            self.trigger_bytes_re is None
+            or self.trigger_bytes_re.search(contents) is not None
+        )
+
+
+def compile_triggers(settings: Settings) -> re.Pattern[str] | None:
+    """
+    Compile a regex matching the triggers of all fixers that could run with
+    the given settings, or return None if any of them has no triggers and so
+    must see every file.
+    """
+    triggers: set[str] = set()
+    for name in settings.active_fixers:
+        info = FIXER_MANIFEST[name]
+        if info.triggers is None:
+            return None
+        triggers.update(info.triggers)
+
+    if "compatibility_imports" in settings.enabled_fixers:
+        # Configured replacements move names not known ahead of time.
+        for rewrites in settings.compat_imports.values():
+            triggers.update(rewrites)
+
+    if not triggers:
+        # No fixer can run, so match nothing.
+        return re.compile("(?!)")
+    return re.compile("|".join(re.escape(trigger) for trigger in sorted(triggers)))
 
 
 apps_re = re.compile(r"(^|[\\/])apps\.py$")
@@ -48,7 +154,14 @@ models_re = re.compile(r"(^|[\\/])models([\\/]|\.py)")
 
 
 class State:
-    __slots__ = ("settings", "filename", "from_imports", "__weakref__", "__dict__")
+    __slots__ = (
+        "settings",
+        "filename",
+        "from_imports",
+        "scratch",
+        "__weakref__",
+        "__dict__",
+    )
 
     def __init__(
         self,
@@ -59,6 +172,19 @@ class State:
         self.settings = settings
         self.filename = filename
         self.from_imports = from_imports
+        # Values of fixers’ Scratch slots, by index, grown on first use.
+        self.scratch: list[Any] = []
+
+    @cached_property
+    def classification(self) -> int:
+        """
+        Bitmask of which of the settings’ fixer conditions hold for the file.
+        """
+        classification = 0
+        for bit, condition in enumerate(self.settings.conditions):
+            if getattr(self, condition):
+                classification |= 1 << bit
+        return classification
 
     @cached_property
     def looks_like_admin_file(self) -> bool:
@@ -89,11 +215,69 @@ class State:
         return models_re.search(self.filename) is not None
 
 
+# A linked list of a node’s ancestors, innermost first, as tuples of
+# (parent, the parent’s chain, depth, module). Extending it for a child
+# takes constant time and memory, unlike tuple concatenation.
+ParentChain = tuple[ast.AST, "ParentChain", int, ast.AST] | None
+
+
+class Parents(Sequence[ast.AST]):
+    """
+    The ancestors of a node, from the module down to its parent, as a view
+    over a ParentChain. Fixers mostly index near the ends, like parents[0]
+    or parents[-1], which is fast.
+
+    visit() reuses one view for all nodes, so it is only valid during a call
+    to an AST function. Copy it with tuple() to keep it for longer.
+    """
+
+    __slots__ = ("_chain",)
+
+    def __init__(self, chain: ParentChain) -> None:
+        self._chain = chain
+
+    def __len__(self) -> int:
+        return 0 if self._chain is None else self._chain[2]
+
+    @overload
+    def __getitem__(self, index: int) -> ast.AST: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[ast.AST, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> ast.AST | tuple[ast.AST, ...]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        chain = self._chain
+        length = 0 if chain is None else chain[2]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("parents index out of range")
+        assert chain is not None
+        if index == 0:
+            return chain[3]
+        for _ in range(length - 1 - index):
+            chain = chain[1]
+            assert chain is not None
+        return chain[0]
+
+    def __iter__(self) -> Iterator[ast.AST]:
+        return reversed(list(self.__reversed__()))
+
+    def __reversed__(self) -> Iterator[ast.AST]:
+        chain = self._chain
+        while chain is not None:
+            yield chain[0]
+            chain = chain[1]
+
+
 AST_T = TypeVar("AST_T", bound=ast.AST)
-TokenFunc = Callable[[list[Token], int], None]
-ASTFunc = Callable[
-    [State, AST_T, tuple[ast.AST, ...]], Iterable[tuple[Offset, TokenFunc]]
-]
+T = TypeVar("T")
+# Token callbacks either change the tokens, or return a list of Edits if
+# registered with @plans_edits.
+TokenFunc = Callable[[list[Token], int], "list[Edit] | None"]
+ASTFunc = Callable[[State, AST_T, Parents], Iterable[tuple[Offset, TokenFunc]]]
 
 if TYPE_CHECKING:
     from typing import Protocol
@@ -109,26 +293,36 @@ class ASTCallbackMapping(Protocol):
         ...
 
 
+# Map from AST node type to the functions to call on its nodes. Read-only,
+# since tables are shared between files.
+DispatchTable = Mapping[type[ast.AST], tuple[ASTFunc[Any], ...]]
+
+
 def visit(
     tree: ast.Module,
     settings: Settings,
     filename: str,
+    file_stats: FileStats | None = None,
 ) -> dict[Offset, list[TokenFunc]]:
     state = State(
         settings=settings,
         filename=filename,
         from_imports=defaultdict(set),
     )
-    ast_funcs = get_ast_funcs(state, settings)
+    ast_funcs = get_ast_funcs(state, settings, file_stats)
 
-    nodes: list[tuple[ast.AST, tuple[ast.AST, ...]]] = [(tree, ())]
+    nodes: list[tuple[ast.AST, ParentChain]] = [(tree, None)]
+    parents = Parents(None)
     ret = defaultdict(list)
     while nodes:
-        node, parents = nodes.pop()
+        node, chain = nodes.pop()
 
-        for ast_func in ast_funcs[type(node)]:
-            for offset, token_func in ast_func(state, node, parents):
-                ret[offset].append(token_func)
+        type_funcs = ast_funcs.get(type(node))
+        if type_funcs:
+            parents._chain = chain
+            for ast_func in type_funcs:
+                for offset, token_func in ast_func(state, node, parents):
+                    ret[offset].append(token_func)
 
         if (
             isinstance(node, ast.ImportFrom)
@@ -141,16 +335,21 @@ def visit(
                 if name.asname is None and name.name != "*"
             )
 
-        subparents = parents + (node,)
+        subchain: ParentChain = (
+            node,
+            chain,
+            1 if chain is None else chain[2] + 1,
+            node if chain is None else chain[3],
+        )
         for name in reversed(node._fields):
             value = getattr(node, name)
 
             if isinstance(value, ast.AST):
-                nodes.append((value, subparents))
+                nodes.append((value, subchain))
             elif isinstance(value, list):
                 for subvalue in reversed(value):
                     if isinstance(subvalue, ast.AST):
-                        nodes.append((subvalue, subparents))
+                        nodes.append((subvalue, subchain))
     return ret
 
 
@@ -160,18 +359,27 @@ class Fixer:
         "min_version",
         "ast_funcs",
         "condition",
+        "triggers",
     )
 
     def __init__(
         self,
         module_name: str,
         min_version: tuple[int, int],
-        condition: Callable[[State], bool] | None = None,
+        # Name of a boolean State attribute that must be true for the fixer
+        # to run, like "looks_like_settings_file".
+        condition: str | None = None,
+        # Identifiers, at least one of which must appear in a file’s source
+        # for the fixer to rewrite it. Files containing no triggers of any
+        # enabled fixer are skipped without parsing. None means the fixer
+        # has to see every file.
+        triggers: tuple[str, ...] | None = None,
     ) -> None:
         self.name = module_name.rpartition(".")[2]
         self.min_version = min_version
         self.ast_funcs: ASTCallbackMapping = defaultdict(list)
         self.condition = condition
+        self.triggers = triggers
 
         FIXERS[self.name] = self
 
@@ -184,11 +392,73 @@ class Fixer:
 
         return decorator
 
+    def scratch(self, factory: Callable[[], T]) -> Scratch[T]:
+        """
+        Declare a slot for per-file data on each State, created by factory.
+        """
+        return Scratch(factory)
+
+
+# Marks Scratch slots without a value on a State.
+_UNSET: Any = object()
+
+# Source of indexes into State.scratch.
+_scratch_indexes = count()
+
+
+class Scratch(Generic[T]):
+    """
+    A fixer’s per-file data, stored in a slot on each State, so it’s freed
+    with the State. A Settings also has slots, for data shared between the
+    files fixed with it.
+    """
+
+    __slots__ = ("index", "factory")
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self.index = next(_scratch_indexes)
+        self.factory = factory
+
+    def get(self, owner: State | Settings) -> T:
+        """
+        Return the value for owner, creating it on first use.
+        """
+        scratch = self._scratch(owner)
+        value = scratch[self.index]
+        if value is _UNSET:
+            value = scratch[self.index] = self.factory()
+        return cast(T, value)
+
+    def set(self, owner: State | Settings, value: T) -> None:
+        self._scratch(owner)[self.index] = value
+
+    def pop(self, owner: State | Settings) -> T:
+        """
+        Return the value for owner, and reset it to be created afresh.
+        """
+        value = self.get(owner)
+        owner.scratch[self.index] = _UNSET
+        return value
 
+    def _scratch(self, owner: State | Settings) -> list[Any]:
+        scratch = owner.scratch
+        if self.index >= len(scratch):
+            scratch.extend([_UNSET] * (self.index + 1 - len(scratch)))
+        return scratch
+
+
+# Fixers imported so far. Fixer modules are imported on demand, using
+# FIXER_MANIFEST to decide which are needed.
 FIXERS: dict[str, Fixer] = {}
 
 
-def _import_fixers() -> None:
+def load_fixer(name: str) -> Fixer:
+    if name not in FIXERS:
+        __import__(f"{fixers.__name__}.{name}")
+    return FIXERS[name]
+
+
+def import_all_fixers() -> None:
     # https://github.com/python/mypy/issues/1422
     fixers_path: str = fixers.__path__  # type: ignore [assignment]
     mod_infos = pkgutil.walk_packages(fixers_path, f"{fixers.__name__}.")
@@ -196,17 +466,37 @@ def _import_fixers() -> None:
         __import__(name, fromlist=["_trash"])
 
 
-_import_fixers()
-
-
-def get_ast_funcs(state: State, settings: Settings) -> ASTCallbackMapping:
-    ast_funcs: ASTCallbackMapping = defaultdict(list)
-    for fixer in FIXERS.values():
-        if fixer.name not in settings.enabled_fixers:
-            continue
-        if fixer.min_version <= state.settings.target_version and (
-            fixer.condition is None or fixer.condition(state)
-        ):
+def get_ast_funcs(
+    state: State,
+    settings: Settings,
+    file_stats: FileStats | None = None,
+) -> DispatchTable:
+    """
+    Return the dispatch table for the file, shared between files with the
+    same classification unless wrapping functions to collect file_stats.
+    """
+    if file_stats is None:
+        try:
+            return settings.dispatch_tables[state.classification]
+        except KeyError:
+            pass
+
+    ast_funcs: defaultdict[type[ast.AST], list[ASTFunc[Any]]] = defaultdict(list)
+    for name in settings.active_fixers:
+        condition = FIXER_MANIFEST[name].condition
+        if condition is None or getattr(state, condition):
+            fixer = load_fixer(name)
             for type_, type_funcs in fixer.ast_funcs.items():
+                if file_stats is not None:
+                    type_funcs = [
+                        file_stats.wrap_ast_func(fixer.name, func)
+                        for func in type_funcs
+                    ]
                 ast_funcs[type_].extend(type_funcs)
-    return ast_funcs
+
+    table = MappingProxyType(
+        {type_: tuple(type_funcs) for type_, type_funcs in ast_funcs.items()}
+    )
+    if file_stats is None:
+        settings.dispatch_tables[state.classification] = table
+    return table
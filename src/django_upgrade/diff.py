@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+
+# Lines of unchanged context around each hunk.
+CONTEXT = 3
+
+
+def unified_diff(old: str, new: str, filename: str, context: int = CONTEXT) -> str:
+    """
+    Return a unified diff from old to new, in the format used by git.
+
+    Fixers usually change a few lines in a large file, so the common leading
+    and trailing lines are skipped before running difflib, which then only
+    compares the changed region and its context.
+    """
+    a = split_lines(old)
+    b = split_lines(new)
+
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    start = max(prefix - context, 0)
+    a_end = min(len(a) - suffix + context, len(a))
+    b_end = min(len(b) - suffix + context, len(b))
+    a_region = a[start:a_end]
+    b_region = b[start:b_end]
+
+    output = [f"--- a/{filename}\n", f"+++ b/{filename}\n"]
+    matcher = SequenceMatcher(None, a_region, b_region, autojunk=False)
+    for group in matcher.get_grouped_opcodes(context):
+        first, last = group[0], group[-1]
+        a_range = _format_range(start + first[1], start + last[2])
+        b_range = _format_range(start + first[3], start + last[4])
+        output.append(f"@@ -{a_range} +{b_range} @@\n")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                output.extend(_prefixed(" ", a_region[i1:i2]))
+                continue
+            output.extend(_prefixed("-", a_region[i1:i2]))
+            output.extend(_prefixed("+", b_region[j1:j2]))
+    return "".join(output)
+
+
+def split_lines(text: str) -> list[str]:
+    """
+    Split text into lines, keeping their endings. Unlike str.splitlines(),
+    only split on "\\n", like patch tools do.
+    """
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _format_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if length == 0:
+        # An empty range refers to the line before it
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def _prefixed(prefix: str, lines: list[str]) -> list[str]:
+    result = []
+    for line in lines:
+        if line.endswith("\n"):
+            result.append(prefix + line)
+        else:
+            result.append(f"{prefix}{line}\n\\ No newline at end of file\n")
+    return result
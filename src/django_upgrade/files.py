@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from typing import BinaryIO
+
+# Directories never worth descending into.
+SKIP_DIRS = frozenset(
+    (
+        ".git",
+        ".hg",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".svn",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+        "venv",
+    )
+)
+
+
+def iter_filenames(paths: Iterable[str], exclude: Sequence[str] = ()) -> Iterator[str]:
+    """
+    Yield the filenames to fix for the given paths. Files and '-' pass
+    through unchanged, whilst directories are expanded to the Python files
+    within them, lazily.
+    """
+    exclude_rules = [IgnoreRule.from_pattern(pattern, base="") for pattern in exclude]
+    for path in paths:
+        if path != "-" and os.path.isdir(path):
+            yield from walk_directory(path, exclude_rules)
+        else:
+            yield path
+
+
+# Size of reads when streaming a list of filenames.
+READ_SIZE = 64 * 1024
+
+
+def read_filenames(path: str, *, null: bool = False) -> Iterator[str]:
+    """
+    Yield filenames listed in the file at path, or stdin for '-', separated
+    by newlines or, with null, NUL characters. Data is read as it becomes
+    available, so filenames are yielded before a piped producer finishes.
+    """
+    separator = b"\0" if null else b"\n"
+    if path == "-":
+        yield from _split_stream(sys.stdin.buffer, separator)
+    else:
+        try:
+            with open(path, "rb") as f:
+                yield from _split_stream(f, separator)
+        except OSError as exc:
+            raise SystemExit(
+                f"django-upgrade: could not read --files-from {path!r}: {exc}"
+            )
+
+
+def _split_stream(f: BinaryIO, separator: bytes) -> Iterator[str]:
+    remainder = b""
+    while True:
+        chunk = f.read1(READ_SIZE)  # type: ignore [attr-defined]
+        if not chunk:
+            break
+        *names, remainder = (remainder + chunk).split(separator)
+        for name in names:
+            if separator == b"\n":
+                name = name.removesuffix(b"\r")
+            if name:
+                yield os.fsdecode(name)
+    if separator == b"\n":
+        remainder = remainder.removesuffix(b"\r")
+    if remainder:
+        yield os.fsdecode(remainder)
+
+
+def git_changed_filenames(ref: str, exclude: Sequence[str] = ()) -> list[str]:
+    """
+    Return the Python files that git reports as added or modified since the
+    merge base of ref and HEAD, including uncommitted changes. Paths are
+    relative to the current directory, keeping the directory names that
+    some fixers depend on.
+    """
+    try:
+        toplevel = _run_git("rev-parse", "--show-toplevel").decode().rstrip("\n")
+        output = _run_git(
+            "-C",
+            toplevel,
+            "diff",
+            "--name-only",
+            "-z",
+            "--diff-filter=ACMR",
+            "--merge-base",
+            ref,
+            "--",
+            "*.py",
+        )
+    except FileNotFoundError:
+        raise SystemExit("django-upgrade: git is required to use --since")
+    except subprocess.CalledProcessError as exc:
+        message = exc.stderr.decode(errors="replace").strip()
+        raise SystemExit(
+            f"django-upgrade: could not find changes since {ref!r}: {message}"
+        )
+
+    exclude_rules = [IgnoreRule.from_pattern(pattern, base="") for pattern in exclude]
+    filenames = []
+    for name in output.decode().split("\0"):
+        if not name:
+            continue
+        filename = os.path.relpath(os.path.join(toplevel, name))
+        if not _is_file_ignored(_normalize(filename), exclude_rules):
+            filenames.append(filename)
+    return filenames
+
+
+def _run_git(*args: str) -> bytes:
+    return subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+
+def walk_directory(root: str, exclude_rules: Sequence[IgnoreRule]) -> Iterator[str]:
+    """
+    Yield Python files below root, in sorted depth-first order. Skips
+    virtualenvs, SKIP_DIRS, and paths matched by exclude_rules or .gitignore
+    files.
+    """
+    abs_root = _absolute(root).rstrip("/")
+    # Stack of (remaining directory entries, absolute directory path,
+    # .gitignore rules in effect)
+    stack = [
+        (
+            _scan(root),
+            abs_root,
+            _load_parent_gitignores(abs_root) + _load_gitignore(abs_root),
+        )
+    ]
+    while stack:
+        entries, abs_directory, rules = stack[-1]
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if is_dir:
+                if entry.name in SKIP_DIRS or os.path.exists(
+                    os.path.join(entry.path, "pyvenv.cfg")
+                ):
+                    continue
+            elif not (entry.name.endswith(".py") and entry.is_file()):
+                continue
+
+            abs_path = f"{abs_directory}/{entry.name}"
+            if is_ignored(_normalize(entry.path), is_dir, exclude_rules) or (
+                is_ignored(abs_path, is_dir, rules)
+            ):
+                continue
+
+            if is_dir:
+                stack.append(
+                    (_scan(entry.path), abs_path, rules + _load_gitignore(abs_path))
+                )
+                break
+            else:
+                yield entry.path
+        else:
+            stack.pop()
+
+
+def _scan(directory: str) -> Iterator[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as it:
+            return iter(sorted(it, key=lambda entry: entry.name))
+    except OSError:
+        return iter(())
+
+
+def is_ignored(path: str, is_dir: bool, rules: Sequence[IgnoreRule]) -> bool:
+    """
+    Check rules against path in order, with the last matching rule winning,
+    like git does.
+    """
+    ignored = False
+    for rule in rules:
+        if rule.negated == ignored and rule.matches(path, is_dir):
+            ignored = not rule.negated
+    return ignored
+
+
+def _is_file_ignored(path: str, rules: Sequence[IgnoreRule]) -> bool:
+    """
+    Check if a file is ignored, either directly or by a parent directory.
+    """
+    parts = path.split("/")
+    return any(
+        is_ignored("/".join(parts[:i]), True, rules) for i in range(1, len(parts))
+    ) or is_ignored(path, False, rules)
+
+
+class IgnoreRule:
+    """
+    A single gitignore-style pattern, relative to its base directory.
+    """
+
+    __slots__ = ("base", "regex", "negated", "dir_only")
+
+    def __init__(
+        self, base: str, regex: re.Pattern[str], negated: bool, dir_only: bool
+    ):
+        self.base = base
+        self.regex = regex
+        self.negated = negated
+        self.dir_only = dir_only
+
+    @classmethod
+    def from_pattern(cls, pattern: str, *, base: str) -> IgnoreRule:
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # Patterns containing a slash are anchored to their base directory,
+        # others match at any depth.
+        if "/" in pattern:
+            pattern = pattern.lstrip("/")
+        else:
+            pattern = "**/" + pattern
+        return cls(
+            base=base,
+            regex=re.compile(_translate_glob(pattern)),
+            negated=negated,
+            dir_only=dir_only,
+        )
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not path.startswith(self.base):
+                return False
+            path = path[len(self.base) :]
+        return self.regex.fullmatch(path) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Convert a gitignore glob into a regex.
+    """
+    result = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            result.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            result.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 2)) != -1:
+            chars = pattern[i + 1 : end]
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            result.append(f"[{chars}]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            result.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            result.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(result)
+
+
+def _load_gitignore(abs_directory: str) -> list[IgnoreRule]:
+    try:
+        with open(f"{abs_directory}/.gitignore", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    base = abs_directory.rstrip("/") + "/"
+    return [
+        IgnoreRule.from_pattern(line.rstrip(), base=base)
+        for line in lines
+        if line.strip() and not line.startswith("#")
+    ]
+
+
+def _load_parent_gitignores(abs_root: str) -> list[IgnoreRule]:
+    """
+    Load .gitignore files from the parent directories of abs_root, up to the
+    top of its git repository, outermost first.
+    """
+    parents = []
+    directory = abs_root
+    while True:
+        if os.path.exists(f"{directory}/.git"):
+            break
+        parent = directory.rpartition("/")[0] or "/"
+        if os.name == "nt" and parent.endswith(":"):  # pragma: no cover
+            parent += "/"
+        if parent == directory:
+            # Not in a git repository
+            return []
+        directory = parent
+        parents.append(directory)
+
+    rules = []
+    for directory in reversed(parents):
+        rules.extend(_load_gitignore(directory))
+    return rules
+
+
+def _normalize(path: str) -> str:
+    path = path.replace(os.sep, "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+def _absolute(path: str) -> str:
+    return _normalize(os.path.abspath(path))
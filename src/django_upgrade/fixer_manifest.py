@@ -0,0 +1,487 @@
+# Generated by scripts/generate_fixer_manifest.py, do not edit.
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class FixerInfo(NamedTuple):
+    min_version: tuple[int, int]
+    # Name of a boolean State attribute required for the fixer to run.
+    condition: str | None
+    # Names of the AST node types the fixer visits.
+    node_types: tuple[str, ...]
+    # Identifiers, one of which must appear in a file for the fixer to
+    # rewrite it, or None if the fixer has to see every file.
+    triggers: tuple[str, ...] | None
+
+
+FIXER_MANIFEST: dict[str, FixerInfo] = {
+    "admin_allow_tags": FixerInfo(
+        min_version=(2, 0),
+        condition=None,
+        node_types=("Assign",),
+        triggers=("allow_tags",),
+    ),
+    "admin_decorators": FixerInfo(
+        min_version=(3, 2),
+        condition=None,
+        node_types=("ClassDef", "Module"),
+        triggers=(
+            "admin_order_field",
+            "allowed_permissions",
+            "boolean",
+            "empty_value_display",
+            "short_description",
+        ),
+    ),
+    "admin_lookup_needs_distinct": FixerInfo(
+        min_version=(4, 0),
+        condition=None,
+        node_types=("ImportFrom", "Name"),
+        triggers=("lookup_needs_distinct",),
+    ),
+    "admin_register": FixerInfo(
+        min_version=(1, 7),
+        condition=None,
+        node_types=("Call", "ClassDef"),
+        triggers=("register",),
+    ),
+    "assert_form_error": FixerInfo(
+        min_version=(4, 1),
+        condition="looks_like_test_file",
+        node_types=("Call",),
+        triggers=(
+            "assertFormError",
+            "assertFormsetError",
+        ),
+    ),
+    "assert_set_methods": FixerInfo(
+        min_version=(4, 2),
+        condition="looks_like_test_file",
+        node_types=("Call",),
+        triggers=(
+            "assertFormsetError",
+            "assertQuerysetEqual",
+        ),
+    ),
+    "check_constraint_condition": FixerInfo(
+        min_version=(5, 1),
+        condition=None,
+        node_types=("Call",),
+        triggers=("CheckConstraint",),
+    ),
+    "compatibility_imports": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("ImportFrom",),
+        triggers=(
+            "ACTION_CHECKBOX_NAME",
+            "BaseContext",
+            "BitAnd",
+            "BitOr",
+            "BitXor",
+            "BoundField",
+            "Context",
+            "ContextDecorator",
+            "ContextPopException",
+            "EmptyResultSet",
+            "FieldDoesNotExist",
+            "JSONField",
+            "KeyTextTransform",
+            "KeyTransform",
+            "NoReverseMatch",
+            "RequestContext",
+            "Resolver404",
+            "ResolverMatch",
+            "SelectDateWidget",
+            "SimpleCookie",
+            "TRANSLATOR_COMMENT_MARK",
+            "clear_script_prefix",
+            "clear_url_caches",
+            "get_callable",
+            "get_mod_func",
+            "get_ns_resolver",
+            "get_resolver",
+            "get_script_prefix",
+            "get_urlconf",
+            "is_valid_path",
+            "lru_cache",
+            "pretty_name",
+            "resolve",
+            "reverse",
+            "reverse_lazy",
+            "set_script_prefix",
+            "set_urlconf",
+            "setup_databases",
+            "static",
+            "translate_url",
+        ),
+    ),
+    "crypto_get_random_string": FixerInfo(
+        min_version=(3, 1),
+        condition=None,
+        node_types=("Call",),
+        triggers=("get_random_string",),
+    ),
+    "datetime_fromisoformat": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=("strptime",),
+    ),
+    "default_app_config": FixerInfo(
+        min_version=(3, 2),
+        condition="looks_like_dunder_init_file",
+        node_types=("Assign",),
+        triggers=("default_app_config",),
+    ),
+    "default_auto_field": FixerInfo(
+        min_version=(6, 0),
+        condition="looks_like_settings_file",
+        node_types=("Assign",),
+        triggers=("DEFAULT_AUTO_FIELD",),
+    ),
+    "django_urls": FixerInfo(
+        min_version=(2, 0),
+        condition=None,
+        node_types=("Call", "ImportFrom"),
+        triggers=(
+            "re_path",
+            "url",
+        ),
+    ),
+    "email_validator": FixerInfo(
+        min_version=(3, 2),
+        condition=None,
+        node_types=("Call",),
+        triggers=("EmailValidator",),
+    ),
+    "format_html": FixerInfo(
+        min_version=(5, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=("format_html",),
+    ),
+    "forms_model_multiple_choice_field": FixerInfo(
+        min_version=(3, 1),
+        condition=None,
+        node_types=("Call",),
+        triggers=("ModelMultipleChoiceField",),
+    ),
+    "index_together": FixerInfo(
+        min_version=(4, 2),
+        condition="looks_like_models_file",
+        node_types=("ClassDef",),
+        triggers=("index_together",),
+    ),
+    "mail_api_kwargs": FixerInfo(
+        min_version=(6, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=(
+            "EmailMessage",
+            "EmailMultiAlternatives",
+            "get_connection",
+            "mail_admins",
+            "mail_managers",
+            "send_mail",
+            "send_mass_mail",
+        ),
+    ),
+    "mail_fail_silently": FixerInfo(
+        min_version=(6, 1),
+        condition=None,
+        node_types=("Call",),
+        triggers=("fail_silently",),
+    ),
+    "mail_get_connection": FixerInfo(
+        min_version=(6, 1),
+        condition=None,
+        node_types=("Call", "ImportFrom"),
+        triggers=("get_connection",),
+    ),
+    "management_commands": FixerInfo(
+        min_version=(3, 2),
+        condition="looks_like_command_file",
+        node_types=("Assign",),
+        triggers=("requires_system_checks",),
+    ),
+    "model_field_choices": FixerInfo(
+        min_version=(5, 0),
+        condition="looks_like_models_file",
+        node_types=("Call",),
+        triggers=("choices",),
+    ),
+    "model_relationship_as_str": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=(
+            "ForeignKey",
+            "ManyToManyField",
+            "OneToOneField",
+        ),
+    ),
+    "null_boolean_field": FixerInfo(
+        min_version=(3, 1),
+        condition="looks_like_models_file",
+        node_types=("Call", "ImportFrom"),
+        triggers=("NullBooleanField",),
+    ),
+    "on_delete": FixerInfo(
+        min_version=(1, 9),
+        condition=None,
+        node_types=("Call", "ImportFrom"),
+        triggers=(
+            "ForeignKey",
+            "OneToOneField",
+        ),
+    ),
+    "parametrize_param": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=("parametrize",),
+    ),
+    "password_reset_timeout_days": FixerInfo(
+        min_version=(3, 1),
+        condition="looks_like_settings_file",
+        node_types=("Assign",),
+        triggers=("PASSWORD_RESET_TIMEOUT_DAYS",),
+    ),
+    "permalink": FixerInfo(
+        min_version=(1, 11),
+        condition=None,
+        node_types=("FunctionDef", "ImportFrom"),
+        triggers=("permalink",),
+    ),
+    "postgres_aggregate_order_by": FixerInfo(
+        min_version=(5, 2),
+        condition=None,
+        node_types=("Call",),
+        triggers=("ordering",),
+    ),
+    "postgres_float_range_field": FixerInfo(
+        min_version=(2, 2),
+        condition=None,
+        node_types=("ImportFrom", "Name"),
+        triggers=("FloatRangeField",),
+    ),
+    "queryset_paginator": FixerInfo(
+        min_version=(2, 2),
+        condition=None,
+        node_types=("Attribute", "ImportFrom", "Name"),
+        triggers=("QuerySetPaginator",),
+    ),
+    "redirect_reverse": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=("redirect",),
+    ),
+    "redundant_date_call": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=("localtime",),
+    ),
+    "render_to_response": FixerInfo(
+        min_version=(2, 0),
+        condition=None,
+        node_types=("Call", "ImportFrom"),
+        triggers=("render_to_response",),
+    ),
+    "reorder_model_field_kwargs": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=("Field",),
+    ),
+    "reorder_model_fields": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("ClassDef",),
+        triggers=(
+            "Model",
+            "models",
+        ),
+    ),
+    "request_headers": FixerInfo(
+        min_version=(2, 2),
+        condition=None,
+        node_types=("Call", "Compare", "Subscript"),
+        triggers=("META",),
+    ),
+    "request_user_attributes": FixerInfo(
+        min_version=(1, 10),
+        condition=None,
+        node_types=("Call",),
+        triggers=(
+            "is_anonymous",
+            "is_authenticated",
+        ),
+    ),
+    "settings_admins_managers": FixerInfo(
+        min_version=(6, 0),
+        condition="looks_like_settings_file",
+        node_types=("Assign",),
+        triggers=(
+            "ADMINS",
+            "MANAGERS",
+        ),
+    ),
+    "settings_database_postgresql": FixerInfo(
+        min_version=(1, 9),
+        condition="looks_like_settings_file",
+        node_types=("Dict",),
+        triggers=("DATABASES",),
+    ),
+    "settings_forms_urlfield_assume_https": FixerInfo(
+        min_version=(6, 0),
+        condition="looks_like_settings_file",
+        node_types=("Assign",),
+        triggers=("FORMS_URLFIELD_ASSUME_HTTPS",),
+    ),
+    "settings_storages": FixerInfo(
+        min_version=(4, 2),
+        condition="looks_like_settings_file",
+        node_types=("Assign", "ImportFrom"),
+        triggers=(
+            "DEFAULT_FILE_STORAGE",
+            "STATICFILES_STORAGE",
+        ),
+    ),
+    "signal_providing_args": FixerInfo(
+        min_version=(3, 1),
+        condition=None,
+        node_types=("Call",),
+        triggers=("Signal",),
+    ),
+    "simplify_select_prefetch_related": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=(
+            "prefetch_related",
+            "select_related",
+        ),
+    ),
+    "staticfiles_find_all": FixerInfo(
+        min_version=(5, 2),
+        condition=None,
+        node_types=("Call",),
+        triggers=("staticfiles",),
+    ),
+    "strftime_to_format_spec": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("FormattedValue",),
+        triggers=("strftime",),
+    ),
+    "stringagg": FixerInfo(
+        min_version=(6, 0),
+        condition=None,
+        node_types=("Call", "ImportFrom"),
+        triggers=("StringAgg",),
+    ),
+    "test_http_headers": FixerInfo(
+        min_version=(4, 2),
+        condition="looks_like_test_file",
+        node_types=("Call",),
+        triggers=("HTTP_",),
+    ),
+    "testcase_databases": FixerInfo(
+        min_version=(2, 2),
+        condition="looks_like_test_file",
+        node_types=("Assign",),
+        triggers=(
+            "allow_database_queries",
+            "multi_db",
+        ),
+    ),
+    "timezone_fixedoffset": FixerInfo(
+        min_version=(2, 2),
+        condition=None,
+        node_types=("Call", "ImportFrom"),
+        triggers=("FixedOffset",),
+    ),
+    "transaction_savepoint": FixerInfo(
+        min_version=(6, 1),
+        condition=None,
+        node_types=("Attribute", "ImportFrom", "Name"),
+        triggers=("savepoint",),
+    ),
+    "use_l10n": FixerInfo(
+        min_version=(4, 0),
+        condition="looks_like_settings_file",
+        node_types=("Assign",),
+        triggers=("USE_L10N",),
+    ),
+    "utils_encoding": FixerInfo(
+        min_version=(3, 0),
+        condition=None,
+        node_types=("Attribute", "ImportFrom", "Name"),
+        triggers=(
+            "force_text",
+            "smart_text",
+        ),
+    ),
+    "utils_http": FixerInfo(
+        min_version=(3, 0),
+        condition=None,
+        node_types=("ImportFrom", "Name"),
+        triggers=(
+            "is_safe_url",
+            "urlquote",
+            "urlquote_plus",
+            "urlunquote",
+            "urlunquote_plus",
+        ),
+    ),
+    "utils_text": FixerInfo(
+        min_version=(3, 0),
+        condition=None,
+        node_types=("ImportFrom", "Name"),
+        triggers=("unescape_entities",),
+    ),
+    "utils_timezone": FixerInfo(
+        min_version=(4, 1),
+        condition=None,
+        node_types=("Attribute", "Name"),
+        triggers=("utc",),
+    ),
+    "utils_timezone_simplifications": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("Call",),
+        triggers=(
+            "localdate",
+            "localtime",
+            "make_aware",
+        ),
+    ),
+    "utils_translation": FixerInfo(
+        min_version=(3, 0),
+        condition=None,
+        node_types=("Attribute", "ImportFrom", "Name"),
+        triggers=(
+            "ugettext",
+            "ugettext_lazy",
+            "ugettext_noop",
+            "ungettext",
+            "ungettext_lazy",
+        ),
+    ),
+    "versioned_branches": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("If",),
+        triggers=("VERSION",),
+    ),
+    "versioned_test_skip_decorators": FixerInfo(
+        min_version=(0, 0),
+        condition=None,
+        node_types=("AsyncFunctionDef", "ClassDef", "FunctionDef"),
+        triggers=("VERSION",),
+    ),
+}
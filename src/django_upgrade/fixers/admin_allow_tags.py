@@ -13,12 +13,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import erase_node
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import erase_node_edits
 
 fixer = Fixer(
     __name__,
     min_version=(2, 0),
+    triggers=("allow_tags",),
 )
 
 
@@ -26,7 +27,7 @@ fixer = Fixer(
 def visit_Assign(
     state: State,
     node: ast.Assign,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -39,4 +40,4 @@ def visit_Assign(
         and isinstance(node.value, ast.Constant)
         and node.value.value is True
     ):
-        yield ast_start_offset(node), partial(erase_node, node=node)
+        yield ast_start_offset(node), partial(erase_node_edits, node=node)
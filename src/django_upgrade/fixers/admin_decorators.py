@@ -15,10 +15,10 @@ from typing import Literal
 from tokenize_rt import Offset, Token, tokens_to_src
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     OP,
-    erase_node,
+    erase_node_edits,
     extract_indent,
     find_last_token,
     insert,
@@ -28,6 +28,13 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(3, 2),
+    triggers=(
+        "admin_order_field",
+        "allowed_permissions",
+        "boolean",
+        "empty_value_display",
+        "short_description",
+    ),
 )
 
 
@@ -35,7 +42,7 @@ fixer = Fixer(
 def visit_Module(
     state: State,
     node: ast.Module,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     yield from visit_Module_or_ClassDef(state, node, parents)
 
@@ -44,7 +51,7 @@ def visit_Module(
 def visit_ClassDef(
     state: State,
     node: ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     yield from visit_Module_or_ClassDef(state, node, parents)
 
@@ -81,7 +88,7 @@ class FunctionDetails:
 def visit_Module_or_ClassDef(
     state: State,
     node: ast.Module | ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     # Potential action and display functions to details of assigned attributes
     funcs: dict[str, FunctionDetails] = {}
@@ -160,7 +167,10 @@ def visit_Module_or_ClassDef(
                 ),
             )
             for name, assignnode in funcdetails.assignments.items():
-                yield ast_start_offset(assignnode), partial(erase_node, node=assignnode)
+                yield (
+                    ast_start_offset(assignnode),
+                    partial(erase_node_edits, node=assignnode),
+                )
                 yield (
                     ast_start_offset(assignnode.value),
                     partial(
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import find_and_replace_name, update_import_names
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import find_and_replace_name_edits, update_import_names_edits
 
 fixer = Fixer(
     __name__,
     min_version=(4, 0),
+    triggers=("lookup_needs_distinct",),
 )
 
 MODULE = "django.contrib.admin.utils"
@@ -30,7 +31,7 @@ RENAMES = {
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if node.module == MODULE and is_rewritable_import_from(node):
         name_map = {}
@@ -42,7 +43,7 @@ def visit_ImportFrom(
             yield (
                 ast_start_offset(node),
                 partial(
-                    update_import_names,
+                    update_import_names_edits,
                     node=node,
                     name_map=name_map,
                 ),
@@ -53,11 +54,11 @@ def visit_ImportFrom(
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (name := node.id) in RENAMES and name in state.from_imports[MODULE]:
         new_name = RENAMES[name]
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=name, new=new_name),
+            partial(find_and_replace_name_edits, name=name, new=new_name),
         )
@@ -14,12 +14,13 @@ from weakref import WeakKeyDictionary
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import OP, erase_node, extract_indent, insert, reverse_find
 
 fixer = Fixer(
     __name__,
     min_version=(1, 7),
+    triggers=("register",),
 )
 
 # Keep track of classes that could be decorated with `@admin.register()`
@@ -36,14 +37,10 @@ class AdminDetails:
         self.model_names_per_site: dict[str, set[str]] = {}
 
 
-decorable_admins: MutableMapping[State, dict[str, AdminDetails | None]] = (
-    WeakKeyDictionary()
-)
+decorable_admins = fixer.scratch(dict[str, AdminDetails | None])
 # Name of site to set of unregistered model names, or True if potentially all
 # models have been unregistered
-unregistered_site_models: MutableMapping[State, dict[str, set[str] | Literal[True]]] = (
-    WeakKeyDictionary()
-)
+unregistered_site_models = fixer.scratch(dict[str, set[str] | Literal[True]])
 
 
 def _is_django_admin_imported(state: State) -> bool:
@@ -57,10 +54,10 @@ def _is_django_admin_imported(state: State) -> bool:
 def visit_ClassDef(
     state: State,
     node: ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if _is_django_admin_imported(state) and not uses_full_super_in_init_or_new(node):
-        admin_detailses = decorable_admins.setdefault(state, {})
+        admin_detailses = decorable_admins.get(state)
         if node.name in admin_detailses:
             # Duplicate name, ignore
             admin_detailses[node.name] = None
@@ -125,7 +122,7 @@ class FullSuperVisitor(ast.NodeVisitor):
 def update_class_def(
     tokens: list[Token], i: int, *, name: str, state: State, decorated: bool
 ) -> None:
-    admin_details = decorable_admins.get(state, {})[name]
+    admin_details = decorable_admins.get(state)[name]
     if admin_details is None or not admin_details.model_names_per_site:
         return
 
@@ -146,7 +143,7 @@ def update_class_def(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         _is_django_admin_imported(state)
@@ -196,8 +193,8 @@ def visit_Call(
                 # cast() could be removed by using TypeGuard func above
                 model_names = {cast(ast.Name, elt).id for elt in first_arg.elts}
             admin_name = admin_arg.id
-            admin_details = decorable_admins.get(state, {}).get(admin_name, None)
-            unregistered_models = unregistered_site_models.get(state, {}).get(
+            admin_details = decorable_admins.get(state).get(admin_name, None)
+            unregistered_models = unregistered_site_models.get(state).get(
                 site_name, set()
             )
             if (
@@ -260,10 +257,7 @@ def visit_Call(
                         cast(ast.Name, elt).id for elt in first_arg.elts
                     }
 
-            state_details = unregistered_site_models.get(state, None)
-            if state_details is None:
-                state_details = {}
-                unregistered_site_models[state] = state_details
+            state_details = unregistered_site_models.get(state)
 
             if unregistered_names is True:
                 state_details[site_name] = True
@@ -278,7 +272,7 @@ def visit_Call(
 def remove_register(
     tokens: list[Token], i: int, *, name: str, state: State, node: ast.Expr
 ) -> None:
-    admin_details = decorable_admins.get(state, {})[name]
+    admin_details = decorable_admins.get(state)[name]
     if admin_details is None:
         return
 
@@ -15,21 +15,22 @@ from typing import Any
 from tokenize_rt import UNIMPORTANT_WS, Offset, Token, tokens_to_src
 
 from django_upgrade.ast import ast_start_offset, looks_like_test_client_call
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     OP,
     PHYSICAL_NEWLINE,
     consume,
     find_first_token,
     find_last_token,
-    replace,
+    replace_edits,
     reverse_consume,
 )
 
 fixer = Fixer(
     __name__,
     min_version=(4, 1),
-    condition=lambda state: state.looks_like_test_file,
+    condition="looks_like_test_file",
+    triggers=("assertFormError", "assertFormsetError"),
 )
 
 
@@ -37,7 +38,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Attribute)
@@ -81,7 +82,7 @@ def visit_Call(
             errors_arg = [k.value for k in node.keywords if k.arg == "errors"][0]
 
         if isinstance(errors_arg, ast.Constant) and errors_arg.value is None:
-            yield ast_start_offset(errors_arg), partial(replace, src="[]")
+            yield ast_start_offset(errors_arg), partial(replace_edits, src="[]")
 
 
 def arguments_match(node: ast.Call, func_name: str) -> bool:
@@ -177,7 +178,7 @@ class ResponseAssignmentVisitor(ast.NodeVisitor):
 
 
 def is_response_from_client(
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
     node: ast.Call,
     name: str,
 ) -> bool:
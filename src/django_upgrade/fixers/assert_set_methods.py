@@ -13,13 +13,14 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import find_and_replace_name
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import find_and_replace_name_edits
 
 fixer = Fixer(
     __name__,
     min_version=(4, 2),
-    condition=lambda state: state.looks_like_test_file,
+    condition="looks_like_test_file",
+    triggers=("assertFormsetError", "assertQuerysetEqual"),
 )
 
 MODULE = "django.test.testcase"
@@ -33,7 +34,7 @@ NAMES = {
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(func := node.func, ast.Attribute)
@@ -43,5 +44,5 @@ def visit_Call(
     ):
         yield (
             ast_start_offset(func),
-            partial(find_and_replace_name, name=name, new=NAMES[name]),
+            partial(find_and_replace_name_edits, name=name, new=NAMES[name]),
         )
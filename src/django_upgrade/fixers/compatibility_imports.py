@@ -3,18 +3,13 @@ from __future__ import annotations
 import ast
 from collections import defaultdict
 from collections.abc import Iterable, Mapping
-from functools import cache, partial
+from functools import partial
 
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import update_import_modules
-
-fixer = Fixer(
-    __name__,
-    min_version=(0, 0),
-)
+from django_upgrade.data import Fixer, Parents, Scratch, Settings, State, TokenFunc
+from django_upgrade.tokens import update_import_modules_edits
 
 REPLACEMENTS_EXACT = {
     (1, 7): {
@@ -131,25 +126,63 @@ REPLACEMENTS_EXCEPT_MIGRATIONS = {
     }
 }
 
+fixer = Fixer(
+    __name__,
+    min_version=(0, 0),
+    # The moved names, which appear in any import to rewrite.
+    triggers=tuple(
+        sorted(
+            {
+                name
+                for replacements in (
+                    *REPLACEMENTS_EXACT.values(),
+                    *REPLACEMENTS_EXCEPT_MIGRATIONS.values(),
+                )
+                for rewrites in replacements.values()
+                for name in rewrites
+            }
+        )
+    ),
+)
+
+
+# Replacements as a pair for non-migrations and migrations files, built once
+# per Settings rather than per file.
+_replacements: Scratch[
+    tuple[Mapping[str, dict[str, str]], Mapping[str, dict[str, str]]] | None
+] = fixer.scratch(lambda: None)
+
 
-@cache
 def _get_replacements(state: State) -> Mapping[str, dict[str, str]]:
+    settings_replacements = _replacements.get(state.settings)
+    if settings_replacements is None:
+        settings_replacements = (
+            _build_replacements(state.settings, migrations=False),
+            _build_replacements(state.settings, migrations=True),
+        )
+        _replacements.set(state.settings, settings_replacements)
+    return settings_replacements[state.looks_like_migrations_file]
+
+
+def _build_replacements(
+    settings: Settings, *, migrations: bool
+) -> Mapping[str, dict[str, str]]:
     replacements: defaultdict[str, dict[str, str]] = defaultdict(dict)
     for target_version, target_replacements in REPLACEMENTS_EXACT.items():
-        if target_version <= state.settings.target_version:
+        if target_version <= settings.target_version:
             for old_module, rewrite in target_replacements.items():
                 replacements[old_module].update(rewrite)
 
-    if not state.looks_like_migrations_file:
+    if not migrations:
         for (
             target_version,
             target_replacements,
         ) in REPLACEMENTS_EXCEPT_MIGRATIONS.items():
-            if target_version <= state.settings.target_version:
+            if target_version <= settings.target_version:
                 for old_module, rewrite in target_replacements.items():
                     replacements[old_module].update(rewrite)
 
-    for mod, rewrites in state.settings.compat_imports.items():
+    for mod, rewrites in settings.compat_imports.items():
         replacements.setdefault(mod, {}).update(rewrites)
 
     replacements.default_factory = None
@@ -160,7 +193,7 @@ def _get_replacements(state: State) -> Mapping[str, dict[str, str]]:
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if not is_rewritable_import_from(node) or node.module is None:
         return
@@ -173,7 +206,7 @@ def visit_ImportFrom(
         yield (
             ast_start_offset(node),
             partial(
-                update_import_modules,
+                update_import_modules_edits,
                 node=node,
                 module_rewrites=replacements[node.module],
             ),
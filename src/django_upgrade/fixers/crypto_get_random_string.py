@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import CODE, OP, find
 
 fixer = Fixer(
     __name__,
     min_version=(3, 1),
+    triggers=("get_random_string",),
 )
 
 MODULE = "django.utils.crypto"
@@ -28,7 +29,7 @@ NAME = "get_random_string"
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -7,7 +7,7 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_name_attr
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     CODE,
     NAME,
@@ -21,6 +21,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("strptime",),
 )
 
 
@@ -28,7 +29,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Attribute)
@@ -7,14 +7,13 @@ from __future__ import annotations
 
 import ast
 import re
-from collections.abc import Iterable, MutableMapping
+from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     STRING,
     extract_indent,
@@ -29,23 +28,24 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(2, 0),
+    triggers=("re_path", "url"),
 )
 
 # Track which names are used for translation functions in a given state.
-state_translation_names: MutableMapping[State, set[str]] = WeakKeyDictionary()
+state_translation_names = fixer.scratch(set[str])
 # Track if re_path has been used, and which names need adding.
 # When fixing import statements, these variables determine which names to
 # import/remove.
-state_re_path_used: MutableMapping[State, bool] = WeakKeyDictionary()
+state_re_path_used = fixer.scratch(bool)
 # Track which names have been added to the import statement for a given state.
-state_added_names: MutableMapping[State, set[str]] = WeakKeyDictionary()
+state_added_names = fixer.scratch(set[str])
 
 
 @fixer.register(ast.ImportFrom)
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == "django.conf.urls"
@@ -77,14 +77,14 @@ def visit_ImportFrom(
         for alias in node.names:
             if alias.name == "gettext_lazy":
                 local_name = alias.asname if alias.asname else alias.name
-                state_translation_names.setdefault(state, set()).add(local_name)
+                state_translation_names.get(state).add(local_name)
 
 
 def update_django_conf_import(
     tokens: list[Token], i: int, *, node: ast.ImportFrom, state: State
 ) -> None:
     re_path_imported = "re_path" in state.from_imports["django.urls"]
-    added_names = state_added_names.pop(state, set())
+    added_names = state_added_names.pop(state)
     removals = set()
 
     for alias in node.names:
@@ -109,14 +109,14 @@ def update_django_conf_import(
                 new_src=f"{indent}from django.urls import {joined_names}\n",
             )
         else:
-            state_added_names[state] = added_names
+            state_added_names.set(state, added_names)
 
 
 def update_django_urls_import(
     tokens: list[Token], i: int, *, node: ast.ImportFrom, state: State
 ) -> None:
-    re_path_used = state_re_path_used.get(state, False)
-    added_names = state_added_names.pop(state, set())
+    re_path_used = state_re_path_used.get(state)
+    added_names = state_added_names.pop(state)
     missing_names = added_names - state.from_imports["django.urls"]
 
     if (
@@ -145,7 +145,7 @@ def update_django_urls_import(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if isinstance(node.func, ast.Name):
         if (
@@ -170,7 +170,7 @@ def visit_Call(
             elif (
                 isinstance(node.args[0], ast.Call)
                 and isinstance(node.args[0].func, ast.Name)
-                and node.args[0].func.id in state_translation_names.get(state, set())
+                and node.args[0].func.id in state_translation_names.get(state)
                 and len(node.args[0].args) >= 1
                 and isinstance(node.args[0].args[0], ast.Constant)
                 and isinstance(node.args[0].args[0].value, str)
@@ -198,7 +198,7 @@ def visit_Call(
             node.func.id == "include"
             and "include" in state.from_imports["django.conf.urls"]
         ):
-            state_added_names.setdefault(state, set()).add("include")
+            state_added_names.get(state).add("include")
 
 
 def fix_url_call(
@@ -222,10 +222,10 @@ def fix_url_call(
             tokens[string_start_idx : string_end_idx + 1] = [Token(STRING, path)]
             new_name = "path"
     if new_name != node_name:
-        state_added_names.setdefault(state, set()).add(new_name)
+        state_added_names.get(state).add(new_name)
         replace(tokens, i, src=new_name)
     else:
-        state_re_path_used.setdefault(state, True)
+        state_re_path_used.set(state, True)
 
 
 REGEX_TO_CONVERTER = {
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import replace_argument_names
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import replace_argument_names_edits
 
 fixer = Fixer(
     __name__,
     min_version=(3, 2),
+    triggers=("EmailValidator",),
 )
 
 MODULE = "django.core.validators"
@@ -29,7 +30,7 @@ KWARGS = {"whitelist": "allowlist"}
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -48,7 +49,7 @@ def visit_Call(
         yield (
             ast_start_offset(node),
             partial(
-                replace_argument_names,
+                replace_argument_names_edits,
                 node=node,
                 arg_map=KWARGS,
             ),
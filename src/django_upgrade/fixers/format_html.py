@@ -14,12 +14,13 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import OP, alone_on_line, find, find_last_token, insert
 
 fixer = Fixer(
     __name__,
     min_version=(5, 0),
+    triggers=("format_html",),
 )
 
 
@@ -27,7 +28,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         "format_html" in state.from_imports["django.utils.html"]
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import replace
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import replace_edits
 
 fixer = Fixer(
     __name__,
     min_version=(3, 1),
+    triggers=("ModelMultipleChoiceField",),
 )
 
 
@@ -25,7 +26,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -51,4 +52,4 @@ def visit_Call(
             for key in error_message_node.value.keys
         )
     ):
-        yield ast_start_offset(list_node), partial(replace, src='"invalid_list"')
+        yield ast_start_offset(list_node), partial(replace_edits, src='"invalid_list"')
@@ -13,7 +13,7 @@ from functools import partial
 from tokenize_rt import UNIMPORTANT_WS, Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     DEDENT,
     INDENT,
@@ -29,7 +29,8 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(4, 2),
-    condition=lambda state: state.looks_like_models_file,
+    condition="looks_like_models_file",
+    triggers=("index_together",),
 )
 
 
@@ -37,7 +38,7 @@ fixer = Fixer(
 def visit_ClassDef(
     state: State,
     node: ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.name != "Meta"
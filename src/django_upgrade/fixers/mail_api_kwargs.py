@@ -12,12 +12,21 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import CODE, OP, find, parse_call_args
 
 fixer = Fixer(
     __name__,
     min_version=(6, 0),
+    triggers=(
+        "EmailMessage",
+        "EmailMultiAlternatives",
+        "get_connection",
+        "mail_admins",
+        "mail_managers",
+        "send_mail",
+        "send_mass_mail",
+    ),
 )
 
 
@@ -86,7 +95,7 @@ MESSAGE_MODULE_NAMES = frozenset({"EmailMessage", "EmailMultiAlternatives"})
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     # Check for direct import or module import and get function config
     if (
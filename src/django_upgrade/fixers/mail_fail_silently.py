@@ -12,7 +12,7 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     OP,
     find,
@@ -25,6 +25,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(6, 1),
+    triggers=("fail_silently",),
 )
 
 MAIL_MODULE = "django.core.mail"
@@ -53,7 +54,7 @@ EMAIL_MESSAGE_CLASSES = frozenset(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         # Mail send functions
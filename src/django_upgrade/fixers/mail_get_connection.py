@@ -7,14 +7,17 @@ https://docs.djangoproject.com/en/6.1/howto/mailers-migration/#replacing-get-con
 from __future__ import annotations
 
 import ast
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
-from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.ast import (
+    ast_start_offset,
+    get_module_summary,
+    is_rewritable_import_from,
+)
+from django_upgrade.data import Fixer, Parents, Scratch, State, TokenFunc
 from django_upgrade.tokens import (
     CODE,
     OP,
@@ -23,12 +26,13 @@ from django_upgrade.tokens import (
     find_last_token,
     parse_call_args,
     remove_call_arg,
-    update_import_names,
+    update_import_names_edits,
 )
 
 fixer = Fixer(
     __name__,
     min_version=(6, 1),
+    triggers=("get_connection",),
 )
 
 MAIL_MODULE = "django.core.mail"
@@ -51,7 +55,7 @@ MAIL_SEND_FUNCTIONS = frozenset(
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == MAIL_MODULE
@@ -63,7 +67,7 @@ def visit_ImportFrom(
     ):
         module = parents[0]
         assert isinstance(module, ast.Module)
-        has_args, standalone_no_arg = _direct_get_connection_usage(module)
+        has_args, standalone_no_arg = _direct_get_connection_usage(state, module)
         if has_args == 0:
             if standalone_no_arg > 0:
                 name_map: dict[str, str] = {GET_CONNECTION: MAILERS}
@@ -71,7 +75,7 @@ def visit_ImportFrom(
                 name_map = {GET_CONNECTION: ""}
             yield (
                 ast_start_offset(node),
-                partial(update_import_names, node=node, name_map=name_map),
+                partial(update_import_names_edits, node=node, name_map=name_map),
             )
 
 
@@ -79,7 +83,7 @@ def visit_ImportFrom(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     # Replace mail.get_connection() → mail.mailers.default
     if (
@@ -112,7 +116,7 @@ def visit_Call(
     ):
         module = parents[0]
         assert isinstance(module, ast.Module)
-        has_args, _ = _direct_get_connection_usage(module)
+        has_args, _ = _direct_get_connection_usage(state, module)
         if has_args == 0:
             yield (
                 ast_start_offset(node),
@@ -148,7 +152,7 @@ def visit_Call(
                 break
 
 
-def _is_inline_connection_kwarg(parents: tuple[ast.AST, ...]) -> bool:
+def _is_inline_connection_kwarg(parents: Sequence[ast.AST]) -> bool:
     """Return True if the node is a connection= kwarg in a mail send function call."""
     return (
         len(parents) >= 2
@@ -168,47 +172,37 @@ def _is_inline_connection_kwarg(parents: tuple[ast.AST, ...]) -> bool:
     )
 
 
-_direct_get_connection_usage_cache: WeakKeyDictionary[ast.Module, tuple[int, int]] = (
-    WeakKeyDictionary()
+# Counts from _direct_get_connection_usage(), found on first use
+_direct_get_connection_usage_counts: Scratch[tuple[int, int] | None] = fixer.scratch(
+    lambda: None
 )
 
 
 def _direct_get_connection_usage(
+    state: State,
     module: ast.Module,
 ) -> tuple[int, int]:
     """
-    Walk the module counting usages of get_connection() via direct import
+    Count usages of get_connection() via direct import
     (Name('get_connection') calls).
 
     Returns (has_args_count, standalone_no_arg_count).
     'standalone' means not used as an inline connection= kwarg in a mail function.
     """
-    try:
-        return _direct_get_connection_usage_cache[module]
-    except KeyError:
-        pass
+    result = _direct_get_connection_usage_counts.get(state)
+    if result is not None:
+        return result
 
     has_args = 0
     standalone_no_arg = 0
-
-    stack: list[tuple[ast.AST, tuple[ast.AST, ...]]] = [(module, ())]
-    while stack:
-        node, parents = stack.pop()
-        if (
-            isinstance(node, ast.Call)
-            and isinstance(node.func, ast.Name)
-            and node.func.id == GET_CONNECTION
-        ):
-            if len(node.args) > 0 or len(node.keywords) > 0:
-                has_args += 1
-            elif not _is_inline_connection_kwarg(parents):
-                standalone_no_arg += 1
-        subparents = parents + (node,)
-        for child in ast.iter_child_nodes(node):
-            stack.append((child, subparents))
+    for call_site in get_module_summary(state, module).calls.get(GET_CONNECTION, ()):
+        if len(call_site.node.args) > 0 or len(call_site.node.keywords) > 0:
+            has_args += 1
+        elif not _is_inline_connection_kwarg(Parents(call_site.chain)):
+            standalone_no_arg += 1
 
     result = has_args, standalone_no_arg
-    _direct_get_connection_usage_cache[module] = result
+    _direct_get_connection_usage_counts.set(state, result)
     return result
 
 
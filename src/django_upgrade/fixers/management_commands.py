@@ -12,13 +12,14 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import replace
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import replace_edits
 
 fixer = Fixer(
     __name__,
     min_version=(3, 2),
-    condition=lambda state: state.looks_like_command_file,
+    condition="looks_like_command_file",
+    triggers=("requires_system_checks",),
 )
 
 
@@ -26,7 +27,7 @@ fixer = Fixer(
 def visit_Assign(
     state: State,
     node: ast.Assign,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(parents[-1], ast.ClassDef)
@@ -40,4 +41,4 @@ def visit_Assign(
             new_src = '"__all__"'
         else:
             new_src = "[]"
-        yield ast_start_offset(node.value), partial(replace, src=new_src)
+        yield ast_start_offset(node.value), partial(replace_edits, src=new_src)
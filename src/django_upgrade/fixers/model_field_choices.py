@@ -15,13 +15,14 @@ from weakref import WeakKeyDictionary
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import OP, find_last_token, reverse_find
 
 fixer = Fixer(
     __name__,
     min_version=(5, 0),
-    condition=lambda state: state.looks_like_models_file,
+    condition="looks_like_models_file",
+    triggers=("choices",),
 )
 
 # Cache defined enumeration types by module
@@ -101,7 +102,7 @@ def _is_django_choices_type(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -10,12 +10,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_name_attr
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import replace
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import replace_edits
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("ForeignKey", "ManyToManyField", "OneToOneField"),
 )
 
 
@@ -23,7 +24,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         is_name_attr(
@@ -40,7 +41,7 @@ def visit_Call(
                     new_str = f"{module.rpartition('.models')[0]}.{related_model.id}"
                     yield (
                         ast_start_offset(related_model),
-                        partial(replace, src=f'"{new_str}"'),
+                        partial(replace_edits, src=f'"{new_str}"'),
                     )
         elif (
             isinstance((related_model := node.args[0]), ast.Constant)
@@ -55,4 +56,7 @@ def visit_Call(
                 .rpartition("/")[2]
             )
             new_str = f"{app_name}.{related_model.value}"
-            yield ast_start_offset(related_model), partial(replace, src=f'"{new_str}"')
+            yield (
+                ast_start_offset(related_model),
+                partial(replace_edits, src=f'"{new_str}"'),
+            )
@@ -8,76 +8,55 @@ from __future__ import annotations
 import ast
 from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
-from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.ast import (
+    ast_start_offset,
+    get_module_summary,
+    is_rewritable_import_from,
+)
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     CODE,
     OP,
     find,
     find_and_replace_name,
     parse_call_args,
-    update_import_names,
+    update_import_names_edits,
 )
 
 fixer = Fixer(
     __name__,
     min_version=(3, 1),
-    condition=lambda state: state.looks_like_models_file,
+    condition="looks_like_models_file",
+    triggers=("NullBooleanField",),
 )
 
 
-_nullbooleanfield_check_cache: WeakKeyDictionary[ast.Module, bool] = WeakKeyDictionary()
-
-
-def _all_nullbooleanfield_name_usages_are_calls(module: ast.AST) -> bool:
+def _all_nullbooleanfield_name_usages_are_calls(state: State, module: ast.AST) -> bool:
     assert isinstance(module, ast.Module)
-    try:
-        return _nullbooleanfield_check_cache[module]
-    except KeyError:
-        pass
-
-    call_func_nodes: set[ast.Name] = set()
-    for node in ast.walk(module):
-        # Calls are yielded before their children, including 'func'. So if we
-        # encounter a Name that wasn’t set in a previous Call node’s func attr,
-        # it’s used for a different purpose.
-        if (
-            isinstance(node, ast.Call)
-            and isinstance(node.func, ast.Name)
-            and node.func.id == "NullBooleanField"
-        ):
-            call_func_nodes.add(node.func)
-        elif (
-            isinstance(node, ast.Name)
-            and node.id == "NullBooleanField"
-            and node not in call_func_nodes
-        ):
-            _nullbooleanfield_check_cache[module] = False
-            return False
-
-    _nullbooleanfield_check_cache[module] = True
-    return True
+    summary = get_module_summary(state, module)
+    return summary.name_counts.get("NullBooleanField", 0) == len(
+        summary.calls.get("NullBooleanField", ())
+    )
 
 
 @fixer.register(ast.ImportFrom)
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         is_rewritable_import_from(node)
         and node.module == "django.db.models"
-        and _all_nullbooleanfield_name_usages_are_calls(parents[0])
+        and _all_nullbooleanfield_name_usages_are_calls(state, parents[0])
     ):
         yield (
             ast_start_offset(node),
             partial(
-                update_import_names,
+                update_import_names_edits,
                 node=node,
                 name_map={"NullBooleanField": "BooleanField"},
             ),
@@ -88,13 +67,13 @@ def visit_ImportFrom(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Name)
         and "NullBooleanField" in state.from_imports["django.db.models"]
         and node.func.id == "NullBooleanField"
-        and _all_nullbooleanfield_name_usages_are_calls(parents[0])
+        and _all_nullbooleanfield_name_usages_are_calls(state, parents[0])
     ) or (
         isinstance(node.func, ast.Attribute)
         and node.func.attr == "NullBooleanField"
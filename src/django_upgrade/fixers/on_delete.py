@@ -6,19 +6,19 @@ https://docs.djangoproject.com/en/stable/releases/1.9/#features-deprecated-in-1-
 from __future__ import annotations
 
 import ast
-from collections.abc import Iterable, MutableMapping
+from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import OP, extract_indent, find, insert, parse_call_args
 
 fixer = Fixer(
     __name__,
     min_version=(1, 9),
+    triggers=("ForeignKey", "OneToOneField"),
 )
 
 RELATION_FIELD_NAMES = frozenset({"ForeignKey", "OneToOneField"})
@@ -28,7 +28,7 @@ RELATION_FIELD_NAMES = frozenset({"ForeignKey", "OneToOneField"})
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == "django.db.models"
@@ -46,14 +46,13 @@ def visit_ImportFrom(
 
 
 # Track if we need to update `from django.db.models` import to add CASCADE.
-should_update_import: MutableMapping[State, bool] = WeakKeyDictionary()
+should_update_import = fixer.scratch(bool)
 
 
 def update_django_models_import(
     tokens: list[Token], i: int, *, node: ast.ImportFrom, state: State
 ) -> None:
-    if should_update_import.get(state, False):
-        should_update_import[state] = False
+    if should_update_import.pop(state):
         j, indent = extract_indent(tokens, i)
         insert(
             tokens,
@@ -66,7 +65,7 @@ def update_django_models_import(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -88,7 +87,7 @@ def visit_Call(
         and not any(isinstance(arg, ast.Starred) for arg in node.args)
         and all(kw.arg != "on_delete" for kw in node.keywords)
     ):
-        should_update_import[state] = not models_imported
+        should_update_import.set(state, not models_imported)
         yield (
             ast_start_offset(node),
             partial(
@@ -12,7 +12,7 @@ from typing import cast
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     OP,
     delete_argument,
@@ -28,6 +28,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("parametrize",),
 )
 
 
@@ -35,7 +36,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         state.looks_like_test_file
@@ -12,13 +12,14 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import CODE, OP, find
 
 fixer = Fixer(
     __name__,
     min_version=(3, 1),
-    condition=lambda state: state.looks_like_settings_file,
+    condition="looks_like_settings_file",
+    triggers=("PASSWORD_RESET_TIMEOUT_DAYS",),
 )
 
 OLD_NAME = "PASSWORD_RESET_TIMEOUT_DAYS"
@@ -29,7 +30,7 @@ NEW_NAME = "PASSWORD_RESET_TIMEOUT"
 def visit_Assign(
     state: State,
     node: ast.Assign,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(node.targets) == 1
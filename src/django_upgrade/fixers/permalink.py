@@ -6,14 +6,13 @@ https://docs.djangoproject.com/en/1.11/releases/1.11/#features-deprecated-in-1-1
 from __future__ import annotations
 
 import ast
-from collections.abc import Iterable, MutableMapping
+from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import UNIMPORTANT_WS, Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     CODE,
     INDENT,
@@ -33,18 +32,19 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(1, 11),
+    triggers=("permalink",),
 )
 
 # Set when a @models.permalink method is detected, so the django.db import
 # visitor knows to add `from django.urls import reverse`.
-_state_needs_reverse: MutableMapping[State, bool] = WeakKeyDictionary()
+_state_needs_reverse = fixer.scratch(bool)
 
 
 @fixer.register(ast.FunctionDef)
 def visit_FunctionDef(
     state: State,
     node: ast.FunctionDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(node.decorator_list) == 1
@@ -69,7 +69,7 @@ def visit_FunctionDef(
         and isinstance(ret_node.value, ast.Tuple)
         and 2 <= len(ret_node.value.elts) <= 3
     ):
-        _state_needs_reverse[state] = True
+        _state_needs_reverse.set(state, True)
         yield (
             ast_start_offset(decorator),
             partial(fix_permalink_decorator, node=decorator),
@@ -84,7 +84,7 @@ def visit_FunctionDef(
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == "django.db"
@@ -101,7 +101,7 @@ def visit_ImportFrom(
 def visit_ImportFrom_direct_permalink(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == "django.db.models"
@@ -117,7 +117,7 @@ def visit_ImportFrom_direct_permalink(
 def fix_models_import(
     tokens: list[Token], i: int, *, node: ast.ImportFrom, state: State
 ) -> None:
-    if not _state_needs_reverse.pop(state, False):
+    if not _state_needs_reverse.pop(state):
         return
     if "reverse" in state.from_imports["django.urls"]:
         return
@@ -129,7 +129,7 @@ def fix_models_import(
 def fix_permalink_direct_import(
     tokens: list[Token], i: int, *, node: ast.ImportFrom, state: State
 ) -> None:
-    if not _state_needs_reverse.pop(state, False):
+    if not _state_needs_reverse.pop(state):
         return
     j, indent = extract_indent(tokens, i)
     update_import_names(tokens, i, node=node, name_map={"permalink": ""})
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import find_and_replace_name, update_import_names
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import find_and_replace_name_edits, update_import_names_edits
 
 fixer = Fixer(
     __name__,
     min_version=(2, 2),
+    triggers=("FloatRangeField",),
 )
 
 MODULES = frozenset(
@@ -37,7 +38,7 @@ NAME_MAP = {
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module in MODULES
@@ -46,7 +47,7 @@ def visit_ImportFrom(
     ):
         yield (
             ast_start_offset(node),
-            partial(update_import_names, node=node, name_map=NAME_MAP),
+            partial(update_import_names_edits, node=node, name_map=NAME_MAP),
         )
 
 
@@ -54,12 +55,12 @@ def visit_ImportFrom(
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (name := node.id) in NAME_MAP and any(
         name in state.from_imports[m] for m in MODULES
     ):
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=name, new=NAME_MAP[name]),
+            partial(find_and_replace_name_edits, name=name, new=NAME_MAP[name]),
         )
@@ -6,12 +6,13 @@ from collections.abc import Iterable
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import OP, find, parse_call_args
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("redirect",),
 )
 
 
@@ -19,7 +20,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Name)
@@ -7,13 +7,14 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_name_attr
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.fixers.utils_timezone_simplifications import remove_attr_call
-from django_upgrade.tokens import find_and_replace_name
+from django_upgrade.tokens import find_and_replace_name_edits
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("localtime",),
 )
 
 
@@ -49,7 +50,7 @@ def _is_daily_or_more_timedelta(node: ast.expr, state: State) -> bool:
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     # Check for .date() call
     if (
@@ -81,6 +82,6 @@ def visit_Call(
     ):
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name="localtime", new="localdate"),
+            partial(find_and_replace_name_edits, name="localtime", new="localdate"),
         )
         yield ast_start_offset(node), partial(remove_attr_call)
@@ -9,27 +9,29 @@ import ast
 from collections.abc import Iterable
 from functools import partial
 from typing import cast
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import (
+    CallSite,
     ast_start_offset,
     get_module_names,
+    get_module_summary,
     is_rewritable_import_from,
 )
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, Scratch, State, TokenFunc
 from django_upgrade.tokens import (
     CODE,
     OP,
     find,
     find_and_replace_name,
-    update_import_names,
+    update_import_names_edits,
 )
 
 fixer = Fixer(
     __name__,
     min_version=(2, 0),
+    triggers=("render_to_response",),
 )
 
 MODULE = "django.shortcuts"
@@ -41,19 +43,19 @@ NEW_NAME = "render"
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == MODULE
         and any(alias.name == OLD_NAME and alias.asname is None for alias in node.names)
         and is_rewritable_import_from(node)
-        and NEW_NAME not in get_module_names(cast(ast.Module, parents[0]))
-        and _all_render_to_response_calls_rewritable(parents[0])
+        and NEW_NAME not in get_module_names(state, cast(ast.Module, parents[0]))
+        and _all_render_to_response_calls_rewritable(state, parents[0])
     ):
         yield (
             ast_start_offset(node),
             partial(
-                update_import_names,
+                update_import_names_edits,
                 node=node,
                 name_map={OLD_NAME: NEW_NAME},
             ),
@@ -64,14 +66,14 @@ def visit_ImportFrom(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Name)
         and node.func.id == OLD_NAME
         and OLD_NAME in state.from_imports[MODULE]
-        and NEW_NAME not in get_module_names(cast(ast.Module, parents[0]))
-        and _all_render_to_response_calls_rewritable(parents[0])
+        and NEW_NAME not in get_module_names(state, cast(ast.Module, parents[0]))
+        and _all_render_to_response_calls_rewritable(state, parents[0])
     ):
         yield (
             ast_start_offset(node),
@@ -79,58 +81,46 @@ def visit_Call(
         )
 
 
-_check_cache: WeakKeyDictionary[ast.Module, bool] = WeakKeyDictionary()
+# Result of _all_render_to_response_calls_rewritable(), found on first use
+_check_result: Scratch[bool | None] = fixer.scratch(lambda: None)
 
 
-def _all_render_to_response_calls_rewritable(module: ast.AST) -> bool:
+def _all_render_to_response_calls_rewritable(state: State, module: ast.AST) -> bool:
     assert isinstance(module, ast.Module)
-    try:
-        return _check_cache[module]
-    except KeyError:
-        pass
-
-    result = True
-
-    def _walk(
-        node: ast.AST,
-        innermost: ast.FunctionDef | ast.AsyncFunctionDef | None,
-    ) -> None:
-        nonlocal result
-        if not result:
-            return
-
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            innermost = node
-
-        if isinstance(node, ast.Name) and node.id == OLD_NAME:
-            result = False
-            return
-
-        if (
-            isinstance(node, ast.Call)
-            and isinstance(node.func, ast.Name)
-            and node.func.id == OLD_NAME
-            and (node.args or node.keywords)
-            and innermost is not None
-            and innermost.args.args
-            and innermost.args.args[0].arg == "request"
-            and not any(isinstance(a, ast.Starred) for a in node.args)
-            and not any(kw.arg is None for kw in node.keywords)
-        ):
-            for child in ast.iter_child_nodes(node):
-                if child is not node.func:
-                    _walk(child, innermost)
-            return
-
-        for child in ast.iter_child_nodes(node):
-            _walk(child, innermost)
-
-    _walk(module, None)
-
-    _check_cache[module] = result
+    result = _check_result.get(state)
+    if result is not None:
+        return result
+
+    summary = get_module_summary(state, module)
+    call_sites = summary.calls.get(OLD_NAME, [])
+    # Every use of the name must be as the function of a rewritable call.
+    result = summary.name_counts.get(OLD_NAME, 0) == len(call_sites) and all(
+        _is_rewritable_call(call_site) for call_site in call_sites
+    )
+    _check_result.set(state, result)
     return result
 
 
+def _is_rewritable_call(call_site: CallSite) -> bool:
+    node = call_site.node
+    innermost = next(
+        (
+            parent
+            for parent in reversed(Parents(call_site.chain))
+            if isinstance(parent, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ),
+        None,
+    )
+    return bool(
+        (node.args or node.keywords)
+        and innermost is not None
+        and innermost.args.args
+        and innermost.args.args[0].arg == "request"
+        and not any(isinstance(a, ast.Starred) for a in node.args)
+        and not any(kw.arg is None for kw in node.keywords)
+    )
+
+
 def add_request_argument(tokens: list[Token], i: int) -> None:
     j = find(tokens, i, name=OP, src="(")
     tokens.insert(j + 1, Token(name=CODE, src="request, "))
@@ -7,13 +7,14 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.field_order_const import MODEL_FIELD_ARG_ORDER
-from django_upgrade.tokens import reorder_call_kwargs
+from django_upgrade.tokens import reorder_call_kwargs_edits
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("Field",),
 )
 
 
@@ -26,7 +27,7 @@ def model_arg_sort_func(x: str | None) -> int:
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         state.looks_like_models_file
@@ -40,6 +41,8 @@ def visit_Call(
             or (isinstance(node.func, ast.Name) and node.func.id.endswith("Field"))
         )
         and any(kw.arg in MODEL_FIELD_ARG_ORDER for kw in node.keywords)
+        # Don't move keywords around **kwargs unpacking
+        and all(kw.arg is not None for kw in node.keywords)
     ):
         initial_kwargs = [kw.arg for kw in node.keywords]
         ordered_kwargs = sorted(initial_kwargs, key=model_arg_sort_func)
@@ -48,7 +51,7 @@ def visit_Call(
             yield (
                 ast_start_offset(node),
                 partial(
-                    reorder_call_kwargs,
+                    reorder_call_kwargs_edits,
                     node=node,
                     ordered_kwargs_idx=[
                         initial_kwargs.index(kw) for kw in ordered_kwargs
@@ -9,7 +9,7 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_name_attr, is_single_target_assign
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     PHYSICAL_NEWLINE,
     consume,
@@ -20,6 +20,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("Model", "models"),
 )
 
 
@@ -140,7 +141,7 @@ def get_element_type_with_lineno(
 def visit_ClassDef(
     state: State,
     node: ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(parents[-1], ast.Module)
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import NAME, STRING, find, replace, str_repr_matching
 
 fixer = Fixer(
     __name__,
     min_version=(2, 2),
+    triggers=("META",),
 )
 
 SPECIAL_HEADERS = frozenset({"CONTENT_LENGTH", "CONTENT_TYPE"})
@@ -27,7 +28,7 @@ SPECIAL_HEADERS = frozenset({"CONTENT_LENGTH", "CONTENT_TYPE"})
 def visit_Subscript(
     state: State,
     node: ast.Subscript,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         is_request_or_self_request_meta(node.value)
@@ -46,7 +47,7 @@ def visit_Subscript(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Attribute)
@@ -67,7 +68,7 @@ def visit_Call(
 def visit_Compare(
     state: State,
     node: ast.Compare,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(node.ops) == 1
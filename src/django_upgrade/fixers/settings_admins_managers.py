@@ -12,13 +12,14 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import find_first_token, find_last_token
 
 fixer = Fixer(
     __name__,
     min_version=(6, 0),
-    condition=lambda state: state.looks_like_settings_file,
+    condition="looks_like_settings_file",
+    triggers=("ADMINS", "MANAGERS"),
 )
 
 
@@ -26,7 +27,7 @@ fixer = Fixer(
 def visit_Assign(
     state: State,
     node: ast.Assign,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(node.targets) == 1
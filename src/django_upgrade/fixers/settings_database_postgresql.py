@@ -12,13 +12,14 @@ from collections.abc import Iterable
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import replace, str_repr_matching
 
 fixer = Fixer(
     __name__,
     min_version=(1, 9),
-    condition=lambda state: state.looks_like_settings_file,
+    condition="looks_like_settings_file",
+    triggers=("DATABASES",),
 )
 
 
@@ -26,7 +27,7 @@ fixer = Fixer(
 def visit_Dict(
     state: State,
     node: ast.Dict,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(parents) >= 2
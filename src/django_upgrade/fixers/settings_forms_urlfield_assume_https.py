@@ -12,13 +12,14 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import erase_node
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import erase_node_edits
 
 fixer = Fixer(
     __name__,
     min_version=(6, 0),
-    condition=lambda state: state.looks_like_settings_file,
+    condition="looks_like_settings_file",
+    triggers=("FORMS_URLFIELD_ASSUME_HTTPS",),
 )
 
 
@@ -26,7 +27,7 @@ fixer = Fixer(
 def visit_Assign(
     state: State,
     node: ast.Assign,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(node.targets) == 1
@@ -43,4 +44,4 @@ def visit_Assign(
             )
         )
     ):
-        yield ast_start_offset(node), partial(erase_node, node=node)
+        yield ast_start_offset(node), partial(erase_node_edits, node=node)
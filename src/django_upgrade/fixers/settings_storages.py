@@ -6,20 +6,20 @@ https://docs.djangoproject.com/en/4.2/releases/4.2/#custom-file-storages
 from __future__ import annotations
 
 import ast
-from collections.abc import Iterable, MutableMapping
+from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import STRING, erase_node, find, insert
 
 fixer = Fixer(
     __name__,
     min_version=(4, 2),
-    condition=lambda state: state.looks_like_settings_file,
+    condition="looks_like_settings_file",
+    triggers=("DEFAULT_FILE_STORAGE", "STATICFILES_STORAGE"),
 )
 
 # Keep track of seen assignments
@@ -52,21 +52,21 @@ class SettingsDetails:
         self.settings_star_import = False
 
 
-settings_details: MutableMapping[State, SettingsDetails] = WeakKeyDictionary()
+settings_details = fixer.scratch(SettingsDetails)
 
 
 @fixer.register(ast.ImportFrom)
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.names[0].name == "*"
         and node.module is not None
         and "settings" in node.module
     ):
-        details = settings_details.setdefault(state, SettingsDetails())
+        details = settings_details.get(state)
         details.settings_star_import = True
 
     return ()
@@ -76,7 +76,7 @@ def visit_ImportFrom(
 def visit_Assign(
     state: State,
     node: ast.Assign,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         len(node.targets) == 1
@@ -86,7 +86,7 @@ def visit_Assign(
             in ("DEFAULT_FILE_STORAGE", "STATICFILES_STORAGE", "STORAGES")
         )
     ):
-        details = settings_details.setdefault(state, SettingsDetails())
+        details = settings_details.get(state)
         is_rewritable = (
             name != "STORAGES"
             and isinstance(parents[-1], ast.Module)
@@ -12,7 +12,7 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     CODE,
     OP,
@@ -25,6 +25,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(3, 1),
+    triggers=("Signal",),
 )
 
 MODULE = "django.dispatch"
@@ -35,7 +36,7 @@ NAME = "Signal"
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Name)
@@ -7,12 +7,13 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import OP, parse_call_args, remove_arg, reverse_find
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("prefetch_related", "select_related"),
 )
 
 NestedDict = dict[str, "NestedDict"]
@@ -22,7 +23,7 @@ NestedDict = dict[str, "NestedDict"]
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Attribute)
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import replace
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import replace_edits
 
 fixer = Fixer(
     __name__,
     min_version=(5, 2),
+    triggers=("staticfiles",),
 )
 
 
@@ -25,7 +26,7 @@ fixer = Fixer(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -47,4 +48,4 @@ def visit_Call(
         and "find_all" not in kwarg_names
     ):
         all_kwarg = [k for k in node.keywords if k.arg == "all"][0]
-        yield ast_start_offset(all_kwarg), partial(replace, src="find_all")
+        yield ast_start_offset(all_kwarg), partial(replace_edits, src="find_all")
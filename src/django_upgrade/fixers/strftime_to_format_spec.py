@@ -8,12 +8,13 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import CODE, NAME, OP, STRING, find, parse_call_args
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("strftime",),
 )
 
 
@@ -21,7 +22,7 @@ fixer = Fixer(
 def visit_FormattedValue(
     state: State,
     node: ast.FormattedValue,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.value, ast.Call)
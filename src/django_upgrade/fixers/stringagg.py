@@ -10,28 +10,29 @@ from __future__ import annotations
 import ast
 from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, Scratch, State, TokenFunc
 from django_upgrade.tokens import update_import_modules
 
 fixer = Fixer(
     __name__,
     min_version=(6, 0),
+    triggers=("StringAgg",),
 )
 
 
-do_rewrite: WeakKeyDictionary[ast.Module, bool] = WeakKeyDictionary()
+# Whether all StringAgg calls can be rewritten, unknown until one is found
+do_rewrite: Scratch[bool | None] = fixer.scratch(lambda: None)
 
 
 @fixer.register(ast.ImportFrom)
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
@@ -43,13 +44,12 @@ def visit_ImportFrom(
             alias.name == "StringAgg" and alias.asname is None for alias in node.names
         )
     ):
-        module = parents[0]
-        assert isinstance(module, ast.Module)
-        do_rewrite.setdefault(module, True)
+        if do_rewrite.get(state) is None:
+            do_rewrite.set(state, True)
 
         yield (
             ast_start_offset(node),
-            partial(rewrite_import_from, node=node, module=module),
+            partial(rewrite_import_from, node=node, state=state),
         )
 
 
@@ -57,7 +57,7 @@ def visit_ImportFrom(
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.func, ast.Name)
@@ -68,10 +68,7 @@ def visit_Call(
             in state.from_imports["django.contrib.postgres.aggregates.general"]
         )
     ):
-        module = parents[0]
-        assert isinstance(module, ast.Module)
-
-        if do_rewrite.get(module) is not True:
+        if do_rewrite.get(state) is not True:
             return
 
         delimiter = None
@@ -85,7 +82,7 @@ def visit_Call(
 
         if delimiter is None:
             # Cannot rewrite
-            do_rewrite[module] = False
+            do_rewrite.set(state, False)
             return
 
         if isinstance(delimiter, ast.Constant) and isinstance(delimiter.value, str):
@@ -94,7 +91,7 @@ def visit_Call(
             elif "models" in state.from_imports["django.db"]:
                 wrap = "models.Value"
             else:
-                do_rewrite[module] = False
+                do_rewrite.set(state, False)
                 return
 
             yield (
@@ -113,13 +110,13 @@ def visit_Call(
             # All good.
             pass
         else:
-            do_rewrite[module] = False
+            do_rewrite.set(state, False)
 
 
 def rewrite_import_from(
-    tokens: list[Token], i: int, *, node: ast.ImportFrom, module: ast.Module
+    tokens: list[Token], i: int, *, node: ast.ImportFrom, state: State
 ) -> None:
-    if do_rewrite.get(module) is not True:
+    if do_rewrite.get(state) is not True:
         return
 
     update_import_modules(
@@ -15,7 +15,7 @@ from typing import cast
 from tokenize_rt import UNIMPORTANT_WS, Offset, Token
 
 from django_upgrade.ast import ast_start_offset, looks_like_test_client_call
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     COMMENT,
     OP,
@@ -30,7 +30,8 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(4, 2),
-    condition=lambda state: state.looks_like_test_file,
+    condition="looks_like_test_file",
+    triggers=("HTTP_",),
 )
 
 HEADERS_KWARG = "headers"
@@ -41,7 +42,7 @@ HTTP_PREFIX = "HTTP_"
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (
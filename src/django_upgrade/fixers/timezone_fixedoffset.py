@@ -12,7 +12,7 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     OP,
     extract_indent,
@@ -27,6 +27,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(2, 2),
+    triggers=("FixedOffset",),
 )
 
 MODULE = "django.utils.timezone"
@@ -37,7 +38,7 @@ OLD_NAME = "FixedOffset"
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == MODULE
@@ -57,7 +58,7 @@ def fix_import_from(tokens: list[Token], i: int, *, node: ast.ImportFrom) -> Non
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         OLD_NAME in state.from_imports[MODULE]
@@ -12,12 +12,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import find_and_replace_name, update_import_names
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import find_and_replace_name_edits, update_import_names_edits
 
 fixer = Fixer(
     __name__,
     min_version=(3, 0),
+    triggers=("force_text", "smart_text"),
 )
 
 MODULE = "django.utils.encoding"
@@ -31,12 +32,12 @@ NAMES = {
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if node.module == MODULE and is_rewritable_import_from(node):
         yield (
             ast_start_offset(node),
-            partial(update_import_names, node=node, name_map=NAMES),
+            partial(update_import_names_edits, node=node, name_map=NAMES),
         )
 
 
@@ -44,12 +45,12 @@ def visit_ImportFrom(
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (name := node.id) in NAMES and name in state.from_imports[MODULE]:
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=name, new=NAMES[name]),
+            partial(find_and_replace_name_edits, name=name, new=NAMES[name]),
         )
 
 
@@ -57,7 +58,7 @@ def visit_Name(
 def visit_Attribute(
     state: State,
     node: ast.Attribute,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (name := node.attr) in NAMES
@@ -67,5 +68,5 @@ def visit_Attribute(
     ):
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=name, new=NAMES[name]),
+            partial(find_and_replace_name_edits, name=name, new=NAMES[name]),
         )
@@ -12,10 +12,10 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     extract_indent,
-    find_and_replace_name,
+    find_and_replace_name_edits,
     insert,
     update_import_names,
 )
@@ -23,6 +23,13 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(3, 0),
+    triggers=(
+        "is_safe_url",
+        "urlquote",
+        "urlquote_plus",
+        "urlunquote",
+        "urlunquote_plus",
+    ),
 )
 
 MODULE = "django.utils.http"
@@ -41,7 +48,7 @@ URLLIB_NAMES = {
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if node.module == MODULE and is_rewritable_import_from(node):
         name_map = {}
@@ -96,7 +103,7 @@ def fix_import(
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (name := node.id) in state.from_imports[MODULE]:
         new_name: str | None
@@ -110,5 +117,5 @@ def visit_Name(
         if new_name is not None:
             yield (
                 ast_start_offset(node),
-                partial(find_and_replace_name, name=name, new=new_name),
+                partial(find_and_replace_name_edits, name=name, new=new_name),
             )
@@ -12,10 +12,10 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     extract_indent,
-    find_and_replace_name,
+    find_and_replace_name_edits,
     insert,
     update_import_names,
 )
@@ -23,6 +23,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(3, 0),
+    triggers=("unescape_entities",),
 )
 
 MODULE = "django.utils.text"
@@ -36,7 +37,7 @@ NAME_MAP = {
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.level == 0
@@ -58,10 +59,10 @@ def fix_import(tokens: list[Token], i: int, *, node: ast.ImportFrom) -> None:
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if node.id == OLD_NAME and OLD_NAME in state.from_imports[MODULE]:
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=OLD_NAME, new="html.escape"),
+            partial(find_and_replace_name_edits, name=OLD_NAME, new="html.escape"),
         )
@@ -6,9 +6,8 @@ https://docs.djangoproject.com/en/4.1/releases/4.1/#id2
 from __future__ import annotations
 
 import ast
-from collections.abc import Iterable, MutableMapping
+from collections.abc import Iterable
 from functools import partial
-from weakref import WeakKeyDictionary
 
 from tokenize_rt import Offset, Token
 
@@ -17,18 +16,19 @@ from django_upgrade.ast import (
     get_module_names,
     is_rewritable_import_from,
 )
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, Scratch, State, TokenFunc
 from django_upgrade.tokens import (
     extract_indent,
     find_first_token,
     insert,
-    replace,
+    replace_edits,
     update_import_names,
 )
 
 fixer = Fixer(
     __name__,
     min_version=(4, 1),
+    triggers=("utc",),
 )
 
 
@@ -36,7 +36,7 @@ fixer = Fixer(
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.id == "utc"
@@ -48,14 +48,14 @@ def visit_Name(
     ):
         yield from maybe_rewrite_imports(details, erase=True)
         new_src = f"{details.datetime_module}.timezone.utc"
-        yield ast_start_offset(node), partial(replace, src=new_src)
+        yield ast_start_offset(node), partial(replace_edits, src=new_src)
 
 
 @fixer.register(ast.Attribute)
 def visit_Attribute(
     state: State,
     node: ast.Attribute,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.attr == "utc"
@@ -67,7 +67,7 @@ def visit_Attribute(
     ):
         yield from maybe_rewrite_imports(details, erase=False)
         new_src = f"{details.datetime_module}.timezone"
-        yield ast_start_offset(node), partial(replace, src=new_src)
+        yield ast_start_offset(node), partial(replace_edits, src=new_src)
 
 
 class ImportDetails:
@@ -89,15 +89,15 @@ class ImportDetails:
         self.add_import_scheduled = False
 
 
-import_details: MutableMapping[State, ImportDetails] = WeakKeyDictionary()
+# Details found from the module on first use
+import_details: Scratch[ImportDetails | None] = fixer.scratch(lambda: None)
 
 
 def get_import_details(state: State, module: ast.AST) -> ImportDetails:
     assert isinstance(module, ast.Module)
-    try:
-        return import_details[state]
-    except KeyError:
-        pass
+    details = import_details.get(state)
+    if details is not None:
+        return details
 
     details = ImportDetails()
 
@@ -139,12 +139,12 @@ def get_import_details(state: State, module: ast.AST) -> ImportDetails:
     if (
         details.datetime_module is None
         and details.first_import_node is not None
-        and "dt" not in get_module_names(module)
+        and "dt" not in get_module_names(state, module)
     ):
         details.datetime_module = "dt"
         details.needs_datetime_import = True
 
-    import_details[state] = details
+    import_details.set(state, details)
     return details
 
 
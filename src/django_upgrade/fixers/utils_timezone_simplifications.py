@@ -7,11 +7,11 @@ from functools import partial
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_name_attr
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import (
     OP,
     find,
-    find_and_replace_name,
+    find_and_replace_name_edits,
     parse_call_args,
     remove_arg,
 )
@@ -19,6 +19,7 @@ from django_upgrade.tokens import (
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("localdate", "localtime", "make_aware"),
 )
 
 
@@ -47,7 +48,7 @@ def has_default_timezone(node: ast.Call, state: State) -> bool:
 def visit_Call(
     state: State,
     node: ast.Call,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if is_name_attr(
         node=node.func,
@@ -84,7 +85,7 @@ def visit_Call(
         ):
             yield (
                 ast_start_offset(node),
-                partial(find_and_replace_name, name="localtime", new="localdate"),
+                partial(find_and_replace_name_edits, name="localtime", new="localdate"),
             )
             yield ast_start_offset(node), partial(remove_attr_call)
 
@@ -114,7 +115,9 @@ def visit_Call(
             yield ast_start_offset(node), partial(remove_datetime_default)
             yield (
                 ast_start_offset(node),
-                partial(find_and_replace_name, name="make_aware", new="localtime"),
+                partial(
+                    find_and_replace_name_edits, name="make_aware", new="localtime"
+                ),
             )
 
 
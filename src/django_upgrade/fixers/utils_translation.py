@@ -12,12 +12,19 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_rewritable_import_from
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import find_and_replace_name, update_import_names
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import find_and_replace_name_edits, update_import_names_edits
 
 fixer = Fixer(
     __name__,
     min_version=(3, 0),
+    triggers=(
+        "ugettext",
+        "ugettext_lazy",
+        "ugettext_noop",
+        "ungettext",
+        "ungettext_lazy",
+    ),
 )
 
 MODULE = "django.utils.translation"
@@ -34,7 +41,7 @@ NAME_MAP = {
 def visit_ImportFrom(
     state: State,
     node: ast.ImportFrom,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         node.module == MODULE
@@ -43,7 +50,7 @@ def visit_ImportFrom(
     ):
         yield (
             ast_start_offset(node),
-            partial(update_import_names, node=node, name_map=NAME_MAP),
+            partial(update_import_names_edits, node=node, name_map=NAME_MAP),
         )
 
 
@@ -51,12 +58,12 @@ def visit_ImportFrom(
 def visit_Name(
     state: State,
     node: ast.Name,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (name := node.id) in NAME_MAP and name in state.from_imports[MODULE]:
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=name, new=NAME_MAP[name]),
+            partial(find_and_replace_name_edits, name=name, new=NAME_MAP[name]),
         )
 
 
@@ -64,7 +71,7 @@ def visit_Name(
 def visit_Attribute(
     state: State,
     node: ast.Attribute,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         (name := node.attr) in NAME_MAP
@@ -74,5 +81,5 @@ def visit_Attribute(
     ):
         yield (
             ast_start_offset(node),
-            partial(find_and_replace_name, name=name, new=NAME_MAP[name]),
+            partial(find_and_replace_name_edits, name=name, new=NAME_MAP[name]),
         )
@@ -16,12 +16,13 @@ from typing import Literal
 from tokenize_rt import Offset, Token
 
 from django_upgrade.ast import ast_start_offset, is_passing_comparison
-from django_upgrade.data import Fixer, State, TokenFunc
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
 from django_upgrade.tokens import Block
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("VERSION",),
 )
 
 
@@ -29,7 +30,7 @@ fixer = Fixer(
 def visit_If(
     state: State,
     node: ast.If,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     if (
         isinstance(node.test, ast.Compare)
@@ -30,12 +30,13 @@ from functools import partial
 from tokenize_rt import Offset
 
 from django_upgrade.ast import ast_start_offset, is_passing_comparison
-from django_upgrade.data import Fixer, State, TokenFunc
-from django_upgrade.tokens import erase_decorator, erase_def
+from django_upgrade.data import Fixer, Parents, State, TokenFunc
+from django_upgrade.tokens import erase_decorator_edits, erase_def_edits
 
 fixer = Fixer(
     __name__,
     min_version=(0, 0),
+    triggers=("VERSION",),
 )
 
 
@@ -43,7 +44,7 @@ fixer = Fixer(
 def visit_AsyncFunctionDef(
     state: State,
     node: ast.AsyncFunctionDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     yield from _handle_decorator(state, node, parents)
 
@@ -52,7 +53,7 @@ def visit_AsyncFunctionDef(
 def visit_FunctionDef(
     state: State,
     node: ast.FunctionDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     yield from _handle_decorator(state, node, parents)
 
@@ -61,7 +62,7 @@ def visit_FunctionDef(
 def visit_ClassDef(
     state: State,
     node: ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     yield from _handle_decorator(state, node, parents)
 
@@ -69,7 +70,7 @@ def visit_ClassDef(
 def _handle_decorator(
     state: State,
     node: ast.AsyncFunctionDef | ast.FunctionDef | ast.ClassDef,
-    parents: tuple[ast.AST, ...],
+    parents: Parents,
 ) -> Iterable[tuple[Offset, TokenFunc]]:
     for decorator in node.decorator_list:
         if (
@@ -127,11 +128,11 @@ def _handle_decorator(
             if always_skipped:
                 yield (
                     ast_start_offset(node.decorator_list[0]),
-                    partial(erase_def, node=node),
+                    partial(erase_def_edits, node=node),
                 )
                 break
             else:
                 yield (
                     ast_start_offset(decorator),
-                    partial(erase_decorator, node=decorator),
+                    partial(erase_decorator_edits, node=decorator),
                 )
@@ -1,23 +1,39 @@
 from __future__ import annotations
 
 import argparse
+import ast
+import io
+import json
+import os
 import re
 import sys
-from collections.abc import Sequence
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import AbstractContextManager, redirect_stderr, redirect_stdout
+from functools import partial
 from importlib import metadata
+from itertools import accumulate, chain, islice
+from operator import attrgetter, itemgetter
 from typing import Any, cast
 
-from tokenize_rt import (
-    UNIMPORTANT_WS,
-    Token,
-    reversed_enumerate,
-    src_to_tokens,
-    tokens_to_src,
-)
+from tokenize_rt import UNIMPORTANT_WS, Offset, Token, src_to_tokens, tokens_to_src
 
 from django_upgrade.ast import ast_parse
-from django_upgrade.data import FIXERS, Settings, visit
-from django_upgrade.tokens import DEDENT
+from django_upgrade.cache import Cache, default_cache_dir
+from django_upgrade.data import Settings, TokenFunc, visit
+from django_upgrade.diff import unified_diff
+from django_upgrade.files import git_changed_filenames, iter_filenames, read_filenames
+from django_upgrade.fixer_manifest import FIXER_MANIFEST
+from django_upgrade.stats import FileStats, Stats, null_timer
+from django_upgrade.tokens import (
+    DEDENT,
+    Edit,
+    TokenList,
+    apply_edits,
+    is_edit_planner,
+)
 
 SUPPORTED_TARGET_VERSIONS = {
     (1, 7),
@@ -46,33 +62,183 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="django-upgrade")
     parser.suggest_on_error = True
     parser.add_argument(
-        "filenames", nargs="+", help="Filenames to fix, or '-' for stdin."
-    )
-    parser.add_argument(
-        "--target-version",
-        default="auto",
-        choices=[
-            "auto",
-            *[f"{major}.{minor}" for major, minor in SUPPORTED_TARGET_VERSIONS],
-        ],
-        help="The version of Django to target.",
+        "filenames",
+        nargs="*",
+        help="Filenames or directories to fix, or '-' for stdin.",
     )
+    add_settings_arguments(parser)
     parser.add_argument(
         "--check",
         action="store_true",
         help="Only output files to change, do not change files.",
     )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Output a unified diff of changes, do not change files.",
+    )
     parser.add_argument(
         "--exit-zero-even-if-changed",
         action="store_true",
         help="Exit with a zero return code even if files have changed.",
     )
+    parser.add_argument(
+        "--since",
+        metavar="REF",
+        help="Also fix Python files added or modified since the given git ref.",
+    )
+    parser.add_argument(
+        "--files-from",
+        metavar="PATH",
+        help="Also fix the files listed in the given file, one per line, or '-' for stdin.",
+    )
+    parser.add_argument(
+        "-0",
+        "--null",
+        action="store_true",
+        help="Filenames from --files-from are separated by NUL characters.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="Gitignore-style pattern for paths to skip within directories.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=jobs_type,
+        default=None,
+        help="Number of files to process in parallel, defaults to the CPU count.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don’t read or write the cache of unchanged files.",
+    )
+    parser.add_argument(
+        "--until-stable",
+        action="store_true",
+        help="Re-run fixers on changed files until they stop changing.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Output time spent in each phase and fixer.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        help="Write a profile of time spent in each phase and fixer, in speedscope format.",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="PATH",
+        help="Write statistics for each file and fixer to the given path, as JSON.",
+    )
+    parser.add_argument(
+        "--stdin-batch",
+        action="store_true",
+        help="Fix newline-delimited JSON records from stdin, writing results to stdout.",
+    )
+    version = metadata.version("django-upgrade")
     parser.add_argument(
         "--version",
         action="version",
-        version=metadata.version("django-upgrade"),
+        version=version,
         help="Show the version number and exit.",
     )
+    parser.add_argument(
+        "--list-fixers", nargs=0, action=ListFixersAction, help="List all fixer names."
+    )
+
+    args = parser.parse_args(argv)
+    max_rounds = UNTIL_STABLE_MAX_ROUNDS if args.until_stable else 1
+    if args.stdin_batch:
+        if args.filenames or args.since is not None or args.files_from is not None:
+            parser.error(
+                "--stdin-batch cannot be combined with filenames, --since,"
+                + " or --files-from"
+            )
+        return fix_stdin_batch(get_settings(args), max_rounds=max_rounds)
+    if not args.filenames and args.since is None and args.files_from is None:
+        parser.error("the following arguments are required: filenames")
+    if args.files_from == "-" and "-" in args.filenames:
+        parser.error("cannot read both filenames and a file from stdin")
+
+    settings = get_settings(args)
+
+    cache = None
+    if not args.no_cache:
+        cache = Cache(default_cache_dir(), settings, version)
+
+    filenames: Iterable[str] = iter_filenames(args.filenames, exclude=args.exclude)
+    if args.files_from is not None:
+        filenames = chain(
+            filenames,
+            iter_filenames(
+                read_filenames(args.files_from, null=args.null),
+                exclude=args.exclude,
+            ),
+        )
+    if args.since is not None:
+        filenames = chain(
+            filenames, git_changed_filenames(args.since, exclude=args.exclude)
+        )
+
+    stats = None
+    if args.profile or args.profile_output is not None or args.report is not None:
+        stats = Stats()
+
+    fix = partial(
+        fix_file,
+        settings=settings,
+        exit_zero_even_if_changed=args.exit_zero_even_if_changed,
+        check=args.check,
+        cache=cache,
+        max_rounds=max_rounds,
+        diff=args.diff,
+        stats=stats,
+    )
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs > 1:
+        # Only start workers if there are enough files to repay their startup
+        first = list(islice(filenames, PARALLEL_MIN_FILES))
+        filenames = chain(first, filenames)
+        if len(first) < PARALLEL_MIN_FILES:
+            jobs = 1
+
+    if jobs > 1:
+        ret = fix_files_parallel(filenames, fix, jobs=jobs, stats=stats)
+    else:
+        ret = fix_files(filenames, fix)
+
+    if cache is not None:
+        cache.evict()
+
+    if stats is not None:
+        if args.profile:
+            stats.print_table(sys.stderr)
+        if args.profile_output is not None:
+            with open(args.profile_output, "w") as f:
+                stats.write_speedscope(f)
+        if args.report is not None:
+            with open(args.report, "w") as f:
+                json.dump(stats.as_json(), f, indent=2)
+
+    return ret
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--target-version",
+        default="auto",
+        choices=[
+            "auto",
+            *[f"{major}.{minor}" for major, minor in SUPPORTED_TARGET_VERSIONS],
+        ],
+        help="The version of Django to target.",
+    )
     parser.add_argument(
         "--only",
         action="append",
@@ -85,34 +251,30 @@ def main(argv: Sequence[str] | None = None) -> int:
         type=fixer_type,
         help="Skip the selected fixers.",
     )
-    parser.add_argument(
-        "--list-fixers", nargs=0, action=ListFixersAction, help="List all fixer names."
-    )
 
-    args = parser.parse_args(argv)
 
+def get_settings(args: argparse.Namespace) -> Settings:
     config = load_pyproject()
-    settings = Settings(
+    return Settings(
         target_version=get_target_version(args.target_version, config),
         only_fixers=set(args.only) if args.only else None,
         skip_fixers=set(args.skip) if args.skip else None,
         compat_imports=get_compat_imports(config),
     )
 
-    ret = 0
-    for filename in args.filenames:
-        ret |= fix_file(
-            filename,
-            settings,
-            exit_zero_even_if_changed=args.exit_zero_even_if_changed,
-            check=args.check,
-        )
 
-    return ret
+def jobs_type(string: str) -> int:
+    try:
+        jobs = int(string)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"Invalid job count: {string!r}")
+    return jobs
 
 
 def fixer_type(string: str) -> str:
-    if string not in FIXERS:
+    if string not in FIXER_MANIFEST:
         raise argparse.ArgumentTypeError(f"Unknown fixer: {string!r}")
     return string
 
@@ -125,7 +287,7 @@ class ListFixersAction(argparse.Action):
         values: str | Sequence[Any] | None,
         option_string: str | None = None,
     ) -> None:
-        for name in sorted(FIXERS):
+        for name in sorted(FIXER_MANIFEST):
             print(name)
         parser.exit()
 
@@ -238,68 +400,578 @@ def fix_file(
     settings: Settings,
     exit_zero_even_if_changed: bool,
     check: bool,
+    cache: Cache | None = None,
+    max_rounds: int = 1,
+    diff: bool = False,
+    stats: Stats | None = None,
 ) -> int:
-    if filename == "-":
-        contents_bytes = sys.stdin.buffer.read()
-    else:
-        with open(filename, "rb") as fb:
-            contents_bytes = fb.read()
-
-    try:
-        contents_text_orig = contents_text = contents_bytes.decode()
-    except UnicodeDecodeError:
-        print(f"{filename} is non-utf-8 (not supported)", file=sys.stderr)
-        return 1
-
-    contents_text = apply_fixers(contents_text, settings, filename)
+    timer: Callable[[str], AbstractContextManager[None]] = null_timer
+    file_stats = None
+    if stats is not None:
+        file_stats = FileStats(filename)
+        stats.files.append(file_stats)
+        timer = file_stats.timer
+
+    stat_key = contents_key = None
+    with timer("read"):
+        if filename == "-":
+            contents_bytes = sys.stdin.buffer.read()
+        else:
+            if cache is not None:
+                stat_key = cache.stat_key(filename, os.stat(filename))
+                if stat_key is not None and stat_key in cache:
+                    return 0
+
+            with open(filename, "rb") as fb:
+                contents_bytes = fb.read()
+
+            if cache is not None:
+                contents_key = cache.contents_key(filename, contents_bytes)
+                if contents_key in cache:
+                    if stat_key is not None:
+                        cache.add(stat_key)
+                    return 0
+
+        if file_stats is not None:
+            file_stats.size = len(contents_bytes)
+
+        # Check for fixers to run before decoding, but check the contents are
+        # UTF-8 regardless, to report non-UTF-8 files consistently. Pure-ASCII
+        # files are valid UTF-8 without decoding them.
+        could_change = settings.could_change_filename(filename)
+        if could_change:
+            could_change = settings.could_change_bytes(contents_bytes)
+
+        if not contents_bytes.isascii():
+            try:
+                contents_bytes.decode()
+            except UnicodeDecodeError:
+                print(f"{filename} is non-utf-8 (not supported)", file=sys.stderr)
+                return 1
+
+    # Text of the fixed contents, if changed
+    contents_text = None
+    # Whether the file parsed, so can be cached. Files that don’t might
+    # parse on newer Python versions, which share the cache.
+    parsed = True
+    if could_change:
+        if cache is not None and contents_key is not None:
+            contents_text = cache.get_fixed(contents_key)
+        if contents_text is None:
+            try:
+                contents_text = _apply_fixers(
+                    contents_bytes,
+                    settings,
+                    filename,
+                    max_rounds=max_rounds,
+                    file_stats=file_stats,
+                )
+            except SyntaxError:
+                parsed = False
+            if (
+                contents_text is not None
+                and cache is not None
+                and contents_key is not None
+            ):
+                cache.add_fixed(contents_key, contents_text)
 
     returncode = 0
-    if contents_text != contents_text_orig:
-        if check:
-            display_name = "stdin" if filename == "-" else filename
-            print(f"Would rewrite {display_name}", file=sys.stderr)
-            returncode = 1
-        else:
-            if filename == "-":
-                print(contents_text, end="")
-            else:
-                print(f"Rewriting {filename}", file=sys.stderr)
-                with open(filename, "w", encoding="UTF-8", newline="") as f:
-                    f.write(contents_text)
+    with timer("write"):
+        if contents_text is not None:
+            if diff:
+                display_name = "stdin" if filename == "-" else filename
+                sys.stdout.write(
+                    unified_diff(contents_bytes.decode(), contents_text, display_name)
+                )
                 if not exit_zero_even_if_changed:
                     returncode = 1
-    else:
-        if filename == "-" and not check:
-            print(contents_text, end="")
+            elif check:
+                display_name = "stdin" if filename == "-" else filename
+                print(f"Would rewrite {display_name}", file=sys.stderr)
+                returncode = 1
+            else:
+                if filename == "-":
+                    print(contents_text, end="")
+                else:
+                    print(f"Rewriting {filename}", file=sys.stderr)
+                    with open(filename, "w", encoding="UTF-8", newline="") as f:
+                        f.write(contents_text)
+                    if not exit_zero_even_if_changed:
+                        returncode = 1
+        else:
+            if filename == "-" and not check and not diff:
+                print(contents_bytes.decode(), end="")
+            if cache is not None and parsed:
+                if stat_key is not None:
+                    cache.add(stat_key)
+                if contents_key is not None:
+                    cache.add(contents_key)
 
     return returncode
 
 
-def apply_fixers(contents_text: str, settings: Settings, filename: str) -> str:
+def fix_stdin_batch(settings: Settings, max_rounds: int = 1) -> int:
+    """
+    Fix records from stdin, one JSON object per line with "filename" and
+    "contents" keys. Writes a JSON object per record to stdout as soon as it
+    is fixed, with "filename", "changed", and "contents" keys.
+    """
+    for lineno, line in enumerate(sys.stdin.buffer, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            filename = record["filename"]
+            contents_text = record["contents"]
+            if not isinstance(filename, str) or not isinstance(contents_text, str):
+                raise TypeError("filename and contents must be strings")
+        except (ValueError, KeyError, TypeError) as exc:
+            raise SystemExit(
+                f"django-upgrade: invalid --stdin-batch record on line {lineno}:"
+                + f" {type(exc).__name__}: {exc}"
+            )
+
+        new_contents_text = apply_fixers(
+            contents_text, settings, filename, max_rounds=max_rounds
+        )
+        result = {
+            "filename": filename,
+            "changed": new_contents_text != contents_text,
+            "contents": new_contents_text,
+        }
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+    return 0
+
+
+# Number of files submitted to the worker pool at once, per worker.
+PARALLEL_BATCH_FACTOR = 8
+# Fewer files are fixed serially, faster than workers could start up.
+PARALLEL_MIN_FILES = 16
+
+
+def fix_files(filenames: Iterable[str], fix: Callable[[str], int]) -> int:
+    ret = 0
+    for filename in filenames:
+        ret |= fix(filename)
+    return ret
+
+
+# Return code, stdout, stderr, and any statistics for one file.
+WorkerResult = tuple[int, str, str, list["FileStats"]]
+
+
+def fix_files_parallel(
+    filenames: Iterable[str],
+    fix: partial[int],
+    *,
+    jobs: int,
+    stats: Stats | None = None,
+) -> int:
+    """
+    Fix files across a pool of worker processes, using fix, a partial of
+    fix_file().
+
+    Files are submitted in batches, each ordered largest first, so that big
+    files don’t end up as the long tail of a run. Ordering is per batch,
+    since filenames are read lazily, letting workers start before
+    directories are fully walked. Output and return codes are replayed in
+    input order, so they match a serial run. Workers’ statistics are merged
+    into stats, which should also be passed to fix.
+    """
+    if sys.platform == "win32":  # pragma: no cover
+        # ProcessPoolExecutor limit on Windows
+        jobs = min(jobs, 61)
+
+    # Give workers empty statistics, rather than copies of those gathered
+    # here, so they only send back their own.
+    worker_fix = fix
+    worker_stats = None
+    if stats is not None:
+        worker_stats = Stats()
+        worker_fix = partial(fix, stats=worker_stats)
+
+    batch_size = jobs * PARALLEL_BATCH_FACTOR
+    filename_iter = iter(filenames)
+    pending: deque[tuple[str, Future[WorkerResult] | None]] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(worker_fix, worker_stats),
+    ) as executor:
+
+        def submit_batch() -> bool:
+            batch = list(islice(filename_iter, batch_size))
+            futures: list[Future[WorkerResult] | None] = [None] * len(batch)
+            for index in sorted(
+                range(len(batch)),
+                key=lambda index: _file_size(batch[index]),
+                reverse=True,
+            ):
+                # stdin can only be read by this process
+                if batch[index] != "-":
+                    futures[index] = executor.submit(_fix_file_in_worker, batch[index])
+            pending.extend(zip(batch, futures))
+            return bool(batch)
+
+        more = submit_batch()
+        ret = 0
+        while pending:
+            if more and len(pending) <= batch_size:
+                more = submit_batch()
+
+            filename, future = pending.popleft()
+            if future is None:
+                ret |= fix(filename)
+            else:
+                returncode, out, err, file_stats = future.result()
+                sys.stdout.write(out)
+                sys.stderr.write(err)
+                ret |= returncode
+                if stats is not None:
+                    stats.files.extend(file_stats)
+
+    return ret
+
+
+def _file_size(filename: str) -> int:
+    try:
+        return os.stat(filename).st_size
+    except OSError:
+        # Let fix_file() report the error
+        return 0
+
+
+_worker_fix: Callable[[str], int]
+_worker_stats: Stats | None
+
+
+def _init_worker(fix: Callable[[str], int], stats: Stats | None = None) -> None:
+    global _worker_fix, _worker_stats
+    _worker_fix = fix
+    # Pickled along with fix, so it's the same object as any Stats in fix’s
+    # arguments.
+    _worker_stats = stats
+
+
+def _fix_file_in_worker(filename: str) -> WorkerResult:
+    out = io.StringIO()
+    err = io.StringIO()
+    with redirect_stdout(out), redirect_stderr(err):
+        returncode = _worker_fix(filename)
+    file_stats: list[FileStats] = []
+    if _worker_stats is not None:
+        file_stats, _worker_stats.files = _worker_stats.files, []
+    return returncode, out.getvalue(), err.getvalue(), file_stats
+
+
+# Cap on rounds of fixing for --until-stable, in case fixers never settle.
+UNTIL_STABLE_MAX_ROUNDS = 10
+
+
+def apply_fixers(
+    contents_text: str,
+    settings: Settings,
+    filename: str,
+    *,
+    max_rounds: int = 1,
+    file_stats: FileStats | None = None,
+) -> str:
+    """
+    Apply fixers to contents_text. With max_rounds > 1, re-run them on the
+    result until it stops changing, since one rewrite can enable another.
+    """
+    if not (
+        settings.could_change_filename(filename)
+        and settings.could_change(contents_text)
+    ):
+        return contents_text
+
     try:
-        ast_obj = ast_parse(contents_text)
+        new_contents_text = _apply_fixers(
+            contents_text,
+            settings,
+            filename,
+            max_rounds=max_rounds,
+            file_stats=file_stats,
+        )
     except SyntaxError:
         return contents_text
+    return contents_text if new_contents_text is None else new_contents_text
+
+
+def _apply_fixers(
+    contents: str | bytes,
+    settings: Settings,
+    filename: str,
+    *,
+    max_rounds: int,
+    file_stats: FileStats | None,
+) -> str | None:
+    """
+    Apply fixers to contents, as text or UTF-8 bytes, without checking if
+    they could change it. Return the new text, or None if unchanged. Raise
+    SyntaxError if the original contents don’t parse.
+    """
+    contents_text = None
+    for _ in range(max_rounds):
+        try:
+            new_contents_text = _apply_fixers_once(
+                contents, settings, filename, file_stats
+            )
+        except SyntaxError:
+            if contents_text is None:
+                raise
+            # Keep the earlier rounds’ changes.
+            break
+        if new_contents_text is None:
+            break
+        contents = contents_text = new_contents_text
+    return contents_text
+
+
+def _apply_fixers_once(
+    contents: str | bytes,
+    settings: Settings,
+    filename: str,
+    file_stats: FileStats | None = None,
+) -> str | None:
+    """
+    Apply fixers to contents, as text or UTF-8 bytes, decoding them only if
+    a fixer has something to rewrite. Return the new text, or None if
+    unchanged.
+    """
+    timer = null_timer if file_stats is None else file_stats.timer
 
-    callbacks = visit(ast_obj, settings, filename)
+    with timer("parse"):
+        ast_obj = ast_parse(contents)
+
+    with timer("visit"):
+        callbacks = visit(ast_obj, settings, filename, file_stats)
 
     if not callbacks:
-        return contents_text
+        return None
 
-    tokens = src_to_tokens(contents_text)
+    if isinstance(contents, str):
+        contents_text = contents
+    else:
+        contents_text = contents.decode()
+
+    regions = find_regions(ast_obj, callbacks)
+    if regions is None or (
+        "\r" in contents_text
+        and contents_text.count("\r") != contents_text.count("\r\n")
+    ):
+        # Lone carriage returns end lines for the tokenizer but not for
+        # str.split(), so fall back to the whole file.
+        regions = [(1, None, callbacks)]
+
+    # Character offset of the start of each line, by index from 0
+    line_offsets = list(
+        accumulate((len(line) + 1 for line in contents_text.split("\n")), initial=0)
+    )
+    # Fix regions from the end backwards, like callbacks within them, since
+    # some fixers’ callbacks share state.
+    parts = []
+    last_start = len(contents_text)
+    num_tokens = 0
+    changed = False
+    for first_line, last_line, region_callbacks in reversed(regions):
+        start = line_offsets[first_line - 1]
+        end = len(contents_text) if last_line is None else line_offsets[last_line]
+        parts.append(contents_text[end:last_start])
+
+        with timer("tokenize"):
+            tokens = TokenList(
+                _rebase_tokens(src_to_tokens(contents_text[start:end]), first_line)
+            )
+        num_tokens += len(tokens)
 
-    fixup_dedent_tokens(tokens)
+        with timer("fixup_dedent"):
+            fixup_dedent_tokens(tokens)
 
-    for i, token in reversed_enumerate(tokens):
-        if not token.src:
-            continue
-        # though this is a defaultdict, by using `.get()` this function's
-        # self time is almost 50% faster
-        for callback in callbacks.get(token.offset, ()):
-            callback(tokens, i)
+        with timer("callbacks"):
+            apply_callbacks(tokens, region_callbacks)
+
+        with timer("tokens_to_src"):
+            region_text = tokens_to_src(tokens)
+        changed = changed or region_text != contents_text[start:end]
+        parts.append(region_text)
+        last_start = start
+
+    if file_stats is not None:
+        file_stats.tokens = num_tokens
+    if not changed:
+        return None
+    parts.append(contents_text[:last_start])
+    return "".join(reversed(parts))
 
-    # no types for tokenize-rt
-    return tokens_to_src(tokens)  # type: ignore [no-any-return]
+
+Region = tuple[int, "int | None", dict[Offset, list[TokenFunc]]]
+
+
+def find_regions(
+    module: ast.Module, callbacks: dict[Offset, list[TokenFunc]]
+) -> list[Region] | None:
+    """
+    Group callbacks into regions of lines to tokenize, rather than the whole
+    file, as (first line, last line or None for the end, callbacks).
+
+    Regions are made of runs of top-level statements sharing lines. A run's
+    lines extend over the comments and blank lines around it, which
+    callbacks may erase, so runs that are next to each other merge. Each
+    callback needs the runs from its offset to any AST nodes passed to it.
+    Return None if a callback lies outside all statements.
+    """
+    # First and last lines of each run of statements
+    firsts: list[int] = []
+    lasts: list[int] = []
+    for stmt in module.body:
+        if isinstance(stmt, (ast.AsyncFunctionDef, ast.ClassDef, ast.FunctionDef)):
+            stmt_first = min([stmt.lineno, *(d.lineno for d in stmt.decorator_list)])
+        else:
+            stmt_first = stmt.lineno
+        stmt_last = cast(int, stmt.end_lineno)
+        if lasts and stmt_first <= lasts[-1]:
+            lasts[-1] = max(lasts[-1], stmt_last)
+        else:
+            firsts.append(stmt_first)
+            lasts.append(stmt_last)
+
+    # (first run, last run, offset) needed by each offset’s callbacks
+    spans = []
+    for offset, offset_callbacks in callbacks.items():
+        first = last = offset.line
+        for callback in offset_callbacks:
+            for node in _callback_nodes(callback):
+                first = min(first, node.lineno)
+                last = max(last, cast(int, node.end_lineno))
+        first_run = bisect_right(firsts, first) - 1
+        last_run = bisect_right(firsts, last) - 1
+        if first_run < 0 or first > lasts[first_run] or last > lasts[last_run]:
+            return None
+        spans.append((first_run, last_run, offset))
+    spans.sort(key=itemgetter(0))
+
+    # Merge overlapping and neighbouring spans, as [first run, last run,
+    # callbacks]
+    merged: list[list[Any]] = []
+    for first_run, last_run, offset in spans:
+        if merged and first_run <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last_run)
+        else:
+            merged.append([first_run, last_run, {}])
+        merged[-1][2][offset] = callbacks[offset]
+
+    return [
+        (
+            lasts[first_run - 1] + 1 if first_run else 1,
+            firsts[last_run + 1] - 1 if last_run + 1 < len(firsts) else None,
+            region_callbacks,
+        )
+        for first_run, last_run, region_callbacks in merged
+    ]
+
+
+def _callback_nodes(callback: Any) -> Iterator[ast.expr | ast.stmt]:
+    """
+    Yield the AST nodes passed to a callback, which is usually a partial,
+    possibly wrapped in others for statistics. Wrappers that aren’t partials
+    give the callback they wrap as __wrapped__.
+    """
+    if isinstance(callback, partial):
+        for value in chain(callback.args, callback.keywords.values()):
+            if isinstance(value, (list, tuple)):
+                for item in value:
+                    if isinstance(item, (ast.expr, ast.stmt)):
+                        yield item
+            elif isinstance(value, (ast.expr, ast.stmt)):
+                yield value
+            else:
+                yield from _callback_nodes(value)
+    elif (wrapped := getattr(callback, "__wrapped__", None)) is not None:
+        yield from _callback_nodes(wrapped)
+
+
+def _rebase_tokens(tokens: list[Token], first_line: int) -> list[Token]:
+    """
+    Shift the line numbers of tokens from a region of a file, to match the
+    whole file.
+    """
+    if first_line == 1:
+        return tokens
+    delta = first_line - 1
+    # Unpacking beats Token._replace() by a factor of three.
+    return [
+        Token(name, src, line if line is None else line + delta, utf8_byte_offset)
+        for name, src, line, utf8_byte_offset in tokens
+    ]
+
+
+def apply_callbacks(
+    tokens: list[Token], callbacks: dict[Offset, list[TokenFunc]]
+) -> None:
+    """
+    Run the token callbacks from the end of the file backwards, so each sees
+    the changes from those after it. Edits from callbacks registered with
+    @plans_edits are batched and applied in one pass. Pending edits are
+    applied early before a callback that changes the tokens itself, or when a
+    callback plans edits reaching into them, in which case it is re-run.
+    """
+    pending: list[Edit] = []
+    # Index of the first token that pending edits change
+    pending_start = len(tokens)
+    for i, offset_callbacks in resolve_callbacks(tokens, callbacks):
+        for callback in offset_callbacks:
+            if not is_edit_planner(callback):
+                if pending:
+                    apply_edits(tokens, pending)
+                    pending = []
+                    pending_start = len(tokens)
+                callback(tokens, i)
+                continue
+
+            edits = callback(tokens, i) or []
+            if pending and any(
+                edit.end > pending_start or edit.start == pending_start
+                for edit in edits
+            ):
+                apply_edits(tokens, pending)
+                pending = []
+                pending_start = len(tokens)
+                edits = callback(tokens, i) or []
+            for edit in edits:
+                pending.append(edit)
+                pending_start = min(pending_start, edit.start)
+    apply_edits(tokens, pending)
+
+
+_token_offset = attrgetter("line", "utf8_byte_offset")
+
+
+def resolve_callbacks(
+    tokens: list[Token], callbacks: dict[Offset, list[TokenFunc]]
+) -> list[tuple[int, list[TokenFunc]]]:
+    """
+    Find the index of the token at each callback offset, by bisection, so
+    the work scales with the number of callbacks rather than tokens. Return
+    them in descending order of index, for applying from the end backwards
+    so earlier indexes stay valid. Offsets without a token are dropped.
+    """
+    resolved = []
+    for offset, offset_callbacks in callbacks.items():
+        i = bisect_left(tokens, offset, key=_token_offset)
+        # Skip empty tokens, and whitespace that fixup_dedent_tokens() moved
+        # after a DEDENT, which is the only place tokens are out of order.
+        while i < len(tokens) and (token_offset := _token_offset(tokens[i])) <= offset:
+            if token_offset == offset and tokens[i].src:
+                resolved.append((i, offset_callbacks))
+                break
+            i += 1
+    resolved.sort(key=itemgetter(0), reverse=True)
+    return resolved
 
 
 def fixup_dedent_tokens(tokens: list[Token]) -> None:
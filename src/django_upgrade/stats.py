@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import partial
+from operator import is_not
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, TextIO
+
+from django_upgrade.tokens import TokenList, is_edit_planner, plans_edits
+
+if TYPE_CHECKING:
+    import ast
+
+    from tokenize_rt import Offset, Token
+
+    from django_upgrade.data import ASTFunc, Parents, State, TokenFunc
+    from django_upgrade.tokens import Edit
+
+# Phases of fixing a file, in order.
+PHASES = (
+    "read",
+    "parse",
+    "visit",
+    "tokenize",
+    "fixup_dedent",
+    "callbacks",
+    "tokens_to_src",
+    "write",
+)
+
+# Number of slowest files listed by Stats.print_table().
+SLOWEST_FILES = 10
+
+_NULL_TIMER = nullcontext()
+
+
+def null_timer(phase: str) -> AbstractContextManager[None]:
+    """
+    Stand-in for FileStats.timer() when not collecting statistics.
+    """
+    return _NULL_TIMER
+
+
+class FixerStats:
+    """
+    Statistics for one fixer on one or more files. Candidates are the token
+    callbacks that the fixer’s AST functions yield, and rewrites are the
+    candidates that changed the tokens.
+    """
+
+    __slots__ = ("candidates", "rewrites", "visit_time", "callback_time")
+
+    def __init__(self) -> None:
+        self.candidates = 0
+        self.rewrites = 0
+        self.visit_time = 0.0
+        self.callback_time = 0.0
+
+    def merge(self, other: FixerStats) -> None:
+        self.candidates += other.candidates
+        self.rewrites += other.rewrites
+        self.visit_time += other.visit_time
+        self.callback_time += other.callback_time
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "candidates": self.candidates,
+            "rewrites": self.rewrites,
+            "noop_ratio": (
+                (self.candidates - self.rewrites) / self.candidates
+                if self.candidates
+                else None
+            ),
+            "visit_time": self.visit_time,
+            "callback_time": self.callback_time,
+            "time": self.visit_time + self.callback_time,
+        }
+
+
+class FileStats:
+    """
+    Statistics for fixing one file, collected by fix_file() and
+    apply_fixers().
+    """
+
+    __slots__ = ("filename", "size", "tokens", "phases", "fixers")
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        # Size in bytes, if read
+        self.size: int | None = None
+        # Number of tokens, if tokenized
+        self.tokens: int | None = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.fixers: dict[str, FixerStats] = {}
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.phases.values())
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "bytes": self.size,
+            "tokens": self.tokens,
+            "durations": self.phases,
+            "time": self.total_time,
+            "callbacks": sum(
+                fixer_stats.candidates for fixer_stats in self.fixers.values()
+            ),
+            "rewrites": sum(
+                fixer_stats.rewrites for fixer_stats in self.fixers.values()
+            ),
+            "fixers": {
+                name: fixer_stats.as_json()
+                for name, fixer_stats in sorted(self.fixers.items())
+            },
+        }
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] += perf_counter() - start
+
+    def wrap_ast_func(self, fixer_name: str, func: ASTFunc[Any]) -> ASTFunc[Any]:
+        """
+        Wrap a fixer’s AST function to time it, and to wrap the token
+        callbacks it yields.
+        """
+        fixer_stats = self.fixers.setdefault(fixer_name, FixerStats())
+
+        def timed_ast_func(
+            state: State, node: ast.AST, parents: Parents
+        ) -> Iterable[tuple[Offset, TokenFunc]]:
+            start = perf_counter()
+            results = list(func(state, node, parents))
+            fixer_stats.visit_time += perf_counter() - start
+            fixer_stats.candidates += len(results)
+            return [
+                (offset, _wrap_token_func(fixer_stats, token_func))
+                for offset, token_func in results
+            ]
+
+        return timed_ast_func
+
+
+def _wrap_token_func(fixer_stats: FixerStats, func: TokenFunc) -> TokenFunc:
+    if is_edit_planner(func):
+        return partial(_timed_edit_planner, _PlannedCandidate(fixer_stats, func))
+    return partial(_timed_token_func, fixer_stats, func)
+
+
+def _timed_token_func(
+    fixer_stats: FixerStats, func: TokenFunc, tokens: list[Token], i: int
+) -> None:
+    if isinstance(tokens, TokenList):
+        changes = tokens.changes
+        start = perf_counter()
+        func(tokens, i)
+        fixer_stats.callback_time += perf_counter() - start
+        changed = tokens.changes != changes
+    else:
+        before = tokens.copy()
+        start = perf_counter()
+        func(tokens, i)
+        fixer_stats.callback_time += perf_counter() - start
+        changed = len(tokens) != len(before) or any(map(is_not, tokens, before))
+    if changed:
+        fixer_stats.rewrites += 1
+
+
+class _PlannedCandidate:
+    """
+    A token callback registered with @plans_edits, and whether its latest
+    plan had edits. apply_callbacks() re-runs a planner when it discards its
+    first plan, so only the latest plan counts as a rewrite.
+    """
+
+    __slots__ = ("fixer_stats", "func", "rewrote")
+
+    def __init__(self, fixer_stats: FixerStats, func: TokenFunc) -> None:
+        self.fixer_stats = fixer_stats
+        self.func = func
+        self.rewrote = False
+
+    @property
+    def __wrapped__(self) -> TokenFunc:
+        # For find_regions() to find the nodes the callback is given.
+        return self.func
+
+
+@plans_edits
+def _timed_edit_planner(
+    candidate: _PlannedCandidate, tokens: list[Token], i: int
+) -> list[Edit]:
+    fixer_stats = candidate.fixer_stats
+    start = perf_counter()
+    edits = candidate.func(tokens, i) or []
+    fixer_stats.callback_time += perf_counter() - start
+    rewrote = bool(edits)
+    fixer_stats.rewrites += rewrote - candidate.rewrote
+    candidate.rewrote = rewrote
+    return edits
+
+
+class Stats:
+    """
+    Statistics for a run, made of the FileStats for each file.
+    """
+
+    __slots__ = ("files",)
+
+    def __init__(self) -> None:
+        self.files: list[FileStats] = []
+
+    def phase_totals(self) -> dict[str, float]:
+        totals = dict.fromkeys(PHASES, 0.0)
+        for file_stats in self.files:
+            for phase, duration in file_stats.phases.items():
+                totals[phase] += duration
+        return totals
+
+    def fixer_totals(self) -> dict[str, FixerStats]:
+        totals: dict[str, FixerStats] = {}
+        for file_stats in self.files:
+            for name, fixer_stats in file_stats.fixers.items():
+                totals.setdefault(name, FixerStats()).merge(fixer_stats)
+        return totals
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "durations": self.phase_totals(),
+            "fixers": {
+                name: fixer_stats.as_json()
+                for name, fixer_stats in sorted(self.fixer_totals().items())
+            },
+            "files": [file_stats.as_json() for file_stats in self.files],
+        }
+
+    def print_table(self, file: TextIO) -> None:
+        phase_totals = self.phase_totals()
+        print(f"{'Phase':<24} {'Time (s)':>10}", file=file)
+        for phase, duration in phase_totals.items():
+            print(f"{phase:<24} {duration:>10.4f}", file=file)
+        print(f"{'total':<24} {sum(phase_totals.values()):>10.4f}", file=file)
+
+        print(file=file)
+        print(
+            f"{'Fixer':<40} {'Visit (s)':>10} {'Callbacks (s)':>14}"
+            + f" {'Candidates':>10} {'Rewrites':>10}",
+            file=file,
+        )
+        fixer_totals = sorted(
+            self.fixer_totals().items(),
+            key=lambda item: item[1].visit_time + item[1].callback_time,
+            reverse=True,
+        )
+        for name, fixer_stats in fixer_totals:
+            print(
+                f"{name:<40} {fixer_stats.visit_time:>10.4f}"
+                + f" {fixer_stats.callback_time:>14.4f}"
+                + f" {fixer_stats.candidates:>10} {fixer_stats.rewrites:>10}",
+                file=file,
+            )
+
+        print(file=file)
+        print(f"{'Slowest files':<40} {'Time (s)':>10}", file=file)
+        slowest = sorted(
+            self.files, key=lambda file_stats: file_stats.total_time, reverse=True
+        )[:SLOWEST_FILES]
+        for file_stats in slowest:
+            print(
+                f"{file_stats.filename:<40} {file_stats.total_time:>10.4f}", file=file
+            )
+
+    def write_speedscope(self, file: TextIO) -> None:
+        """
+        Write a profile in speedscope’s format, with a stack of phase and
+        fixer for each timing. See https://www.speedscope.app/.
+        """
+        frames: list[dict[str, str]] = []
+        frame_indexes: dict[str, int] = {}
+
+        def frame(name: str) -> int:
+            if name not in frame_indexes:
+                frame_indexes[name] = len(frames)
+                frames.append({"name": name})
+            return frame_indexes[name]
+
+        samples: list[list[int]] = []
+        weights: list[float] = []
+        for file_stats in self.files:
+            file_frame = frame(file_stats.filename)
+            phases = dict(file_stats.phases)
+            for name, fixer_stats in file_stats.fixers.items():
+                for phase, duration in (
+                    ("visit", fixer_stats.visit_time),
+                    ("callbacks", fixer_stats.callback_time),
+                ):
+                    phases[phase] -= duration
+                    samples.append([file_frame, frame(phase), frame(name)])
+                    weights.append(duration)
+            for phase, duration in phases.items():
+                samples.append([file_frame, frame(phase)])
+                weights.append(max(duration, 0.0))
+
+        json.dump(
+            {
+                "$schema": "https://www.speedscope.app/file-format-schema.json",
+                "shared": {"frames": frames},
+                "profiles": [
+                    {
+                        "type": "sampled",
+                        "name": "django-upgrade",
+                        "unit": "seconds",
+                        "startValue": 0,
+                        "endValue": sum(weights),
+                        "samples": samples,
+                        "weights": weights,
+                    }
+                ],
+            },
+            file,
+        )
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import ast
+import operator
 import re
+from bisect import bisect_left
 from collections import defaultdict
-from collections.abc import Sequence
-from typing import cast
+from collections.abc import Callable, Iterable, Sequence
+from operator import itemgetter
+from typing import Any, NamedTuple, SupportsIndex, TypeVar, cast
 
 from tokenize_rt import NON_CODING_TOKENS, UNIMPORTANT_WS, Token, tokens_to_src
 
@@ -19,6 +22,125 @@ OP = "OP"
 PHYSICAL_NEWLINE = "NL"
 STRING = "STRING"
 
+
+class TokenList(list[Token]):
+    """
+    A list of tokens that indexes the first token on each line, so the
+    helpers below can jump to a line rather than scanning to it. The index
+    is extended as lookups need it. Changes that move tokens cut it back to
+    the tokens before them, which keeps it useful for callbacks, since they
+    run from the end of the file backwards.
+
+    It also counts changes, so callers can tell whether a callback changed
+    the tokens without comparing them.
+    """
+
+    __slots__ = ("_line_starts", "_indexed", "changes")
+
+    def __init__(self, tokens: Iterable[Token] = ()) -> None:
+        super().__init__(tokens)
+        # _line_starts[line] is the index of the first token on or after
+        # line, scanning from the start, over the first _indexed tokens.
+        self._line_starts = [0]
+        self._indexed = 0
+        self.changes = 0
+
+    def line_start(self, line: int) -> int:
+        """
+        Return the index of the first token with a line number of at least
+        line, or the length of the list if there is none.
+        """
+        line_starts = self._line_starts
+        if line >= len(line_starts):
+            max_line = len(line_starts) - 1
+            i = self._indexed
+            n = len(self)
+            while i < n and max_line < line:
+                token_line = self[i].line
+                if token_line is not None and token_line > max_line:
+                    line_starts.extend([i] * (token_line - max_line))
+                    max_line = token_line
+                i += 1
+            self._indexed = i
+            if line > max_line:
+                return n
+        return line_starts[line]
+
+    def _moved_from(self, index: int) -> None:
+        """
+        Cut the index back to the tokens before index, after a change that
+        moves tokens from there on.
+        """
+        self.changes += 1
+        index = max(index, 0)
+        line_starts = self._line_starts
+        del line_starts[max(bisect_left(line_starts, index), 1) :]
+        self._indexed = min(self._indexed, index)
+
+    def _position(self, index: SupportsIndex | slice) -> int:
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                return 0
+            return index.indices(len(self))[0]
+        position = operator.index(index)
+        if position < 0:
+            position += len(self)
+        return position
+
+    # Mutating methods cut back the index, except when replacing a token with
+    # one at the same or no line, as replace() does, since lookups skip
+    # tokens without a line.
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice) or value.line not in (None, self[index].line):
+            self._moved_from(self._position(index))
+        else:
+            self.changes += 1
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: SupportsIndex | slice) -> None:
+        self._moved_from(self._position(index))
+        super().__delitem__(index)
+
+    # Adding tokens at the end moves none.
+
+    def __iadd__(self, tokens: Iterable[Token]) -> TokenList:  # type: ignore [misc]
+        self.changes += 1
+        return super().__iadd__(tokens)
+
+    def append(self, token: Token) -> None:
+        self.changes += 1
+        super().append(token)
+
+    def extend(self, tokens: Iterable[Token]) -> None:
+        self.changes += 1
+        super().extend(tokens)
+
+    def insert(self, index: SupportsIndex, token: Token) -> None:
+        self._moved_from(self._position(index))
+        super().insert(index, token)
+
+    def pop(self, index: SupportsIndex = -1) -> Token:
+        self._moved_from(self._position(index))
+        return super().pop(index)
+
+    def remove(self, token: Token) -> None:
+        self._moved_from(0)
+        super().remove(token)
+
+    def clear(self) -> None:
+        self._moved_from(0)
+        super().clear()
+
+    def reverse(self) -> None:
+        self._moved_from(0)
+        super().reverse()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self._moved_from(0)
+        super().sort(*args, **kwargs)
+
+
 # Basic functions
 
 
@@ -81,8 +203,7 @@ def find_first_token(
     """
     Find the first token corresponding to the given ast node.
     """
-    while tokens[i].line is None or tokens[i].line < node.lineno:
-        i += 1
+    i = find_first_token_at_line(tokens, i, line=node.lineno)
     while (
         tokens[i].utf8_byte_offset is None
         or tokens[i].utf8_byte_offset < node.col_offset
@@ -97,8 +218,7 @@ def find_last_token(
     """
     Find the last token corresponding to the given ast node.
     """
-    while tokens[i].line is None or tokens[i].line < node.end_lineno:
-        i += 1
+    i = find_first_token_at_line(tokens, i, line=cast(int, node.end_lineno))
     while (
         tokens[i].utf8_byte_offset is None
         or tokens[i].utf8_byte_offset < node.end_col_offset
@@ -116,6 +236,8 @@ def find_first_token_at_line(
     """
     Find the first token corresponding to the given line number.
     """
+    if isinstance(tokens, TokenList):
+        i = max(i, tokens.line_start(line))
     while tokens[i].line is None or tokens[i].line < line:
         i += 1
     return i
@@ -232,6 +354,15 @@ def find_call_arg(
 
 
 def remove_call_arg(tokens: list[Token], start_idx: int, end_idx: int) -> None:
+    apply_edits(tokens, remove_call_arg_edits(tokens, start_idx, end_idx))
+
+
+def remove_call_arg_edits(
+    tokens: list[Token], start_idx: int, end_idx: int
+) -> list[Edit]:
+    """
+    Like remove_call_arg(), but return the edits rather than making them.
+    """
     start_idx = reverse_consume(tokens, start_idx, name=UNIMPORTANT_WS)
     start_idx = reverse_consume(tokens, start_idx, name=INDENT)
 
@@ -251,7 +382,7 @@ def remove_call_arg(tokens: list[Token], start_idx: int, end_idx: int) -> None:
                 while tokens[end_idx].name in (INDENT, UNIMPORTANT_WS):
                     end_idx += 1
 
-    del tokens[start_idx:end_idx]
+    return [Edit(start_idx, end_idx, [])]
 
 
 def find_block_start(tokens: list[Token], i: int) -> int:
@@ -411,6 +542,69 @@ def find_end(tokens: list[Token], i: int) -> int:  # pragma: no cover
 # Rewriting functions
 
 
+class Edit(NamedTuple):
+    """
+    A planned change, replacing tokens[start:end] with new_tokens. Insertions
+    have start == end, and deletions have no new_tokens.
+    """
+
+    start: int
+    end: int
+    new_tokens: list[Token]
+
+
+_edit_bounds = itemgetter(0, 1)
+
+
+def apply_edits(tokens: list[Token], edits: Sequence[Edit]) -> None:
+    """
+    Apply edits planned against tokens, in one pass over the list, rather
+    than one splice per edit. Insertions go before other edits at the same
+    index, in plan order. Edits must not overlap.
+    """
+    if not edits:
+        return
+    if len(edits) == 1:
+        start, end, new_tokens = edits[0]
+        tokens[start:end] = new_tokens
+        return
+
+    edits = sorted(edits, key=_edit_bounds)
+    # Rebuild from the first edit on, leaving earlier tokens in place.
+    first_start = last_end = edits[0][0]
+    new: list[Token] = []
+    for start, end, new_tokens in edits:
+        if start < last_end:
+            raise AssertionError(f"Overlapping token edits at index {start}")
+        new += tokens[last_end:start]
+        new += new_tokens
+        last_end = end
+    new += tokens[last_end:]
+    tokens[first_start:] = new
+
+
+# Token callbacks that return a list of Edits, rather than changing the
+# tokens themselves, registered with @plans_edits.
+_EDIT_PLANNERS: set[Callable[..., list[Edit]]] = set()
+
+EditPlannerT = TypeVar("EditPlannerT", bound=Callable[..., list[Edit]])
+
+
+def plans_edits(func: EditPlannerT) -> EditPlannerT:
+    """
+    Register a token callback as returning a list of Edits, rather than
+    changing the tokens itself, so fix runs can batch its edits with those
+    from other callbacks.
+    """
+    _EDIT_PLANNERS.add(func)
+    return func
+
+
+def is_edit_planner(callback: Callable[..., Any]) -> bool:
+    # Callbacks are usually partials of a registered function.
+    return getattr(callback, "func", callback) in _EDIT_PLANNERS
+
+
 def insert(tokens: list[Token], i: int, *, new_src: str) -> None:
     """
     Insert a generated token with the given new source.
@@ -426,6 +620,14 @@ def replace(tokens: list[Token], i: int, *, src: str) -> None:
     tokens[i] = tokens[i]._replace(name=CODE, src=src)
 
 
+@plans_edits
+def replace_edits(tokens: list[Token], i: int, *, src: str) -> list[Edit]:
+    """
+    Like replace(), but return the edits rather than making them.
+    """
+    return [Edit(i, i + 1, [tokens[i]._replace(name=CODE, src=src)])]
+
+
 def find_node(
     tokens: list[Token], i: int, *, node: ast.expr | ast.keyword | ast.stmt
 ) -> tuple[int, int]:
@@ -449,8 +651,18 @@ def erase_node(
     """
     Erase all tokens corresponding to the given node.
     """
+    apply_edits(tokens, erase_node_edits(tokens, i, node=node))
+
+
+@plans_edits
+def erase_node_edits(
+    tokens: list[Token], i: int, *, node: ast.expr | ast.keyword | ast.stmt
+) -> list[Edit]:
+    """
+    Like erase_node(), but return the edits rather than making them.
+    """
     i, j = find_node(tokens, i, node=node)
-    del tokens[i : j + 1]
+    return [Edit(i, j + 1, [])]
 
 
 def erase_decorator(tokens: list[Token], i: int, *, node: ast.Call) -> None:
@@ -458,11 +670,19 @@ def erase_decorator(tokens: list[Token], i: int, *, node: ast.Call) -> None:
     Specialized version of erase_node for removing decorators, since they don't
     include the @ in their bounds.
     """
+    apply_edits(tokens, erase_decorator_edits(tokens, i, node=node))
+
+
+@plans_edits
+def erase_decorator_edits(tokens: list[Token], i: int, *, node: ast.Call) -> list[Edit]:
+    """
+    Like erase_decorator(), but return the edits rather than making them.
+    """
     i, j = find_node(tokens, i, node=node)
     i = reverse_find(tokens, i, name=OP, src="@")
     i = reverse_consume(tokens, i, name=INDENT)
     i = reverse_consume(tokens, i, name=UNIMPORTANT_WS)
-    del tokens[i : j + 1]
+    return [Edit(i, j + 1, [])]
 
 
 def erase_def(
@@ -475,12 +695,25 @@ def erase_def(
     Erase a decorated function or class definition entirely, including all
     decorators.
     """
+    apply_edits(tokens, erase_def_edits(tokens, i, node=node))
+
+
+@plans_edits
+def erase_def_edits(
+    tokens: list[Token],
+    i: int,
+    *,
+    node: ast.AsyncFunctionDef | ast.FunctionDef | ast.ClassDef,
+) -> list[Edit]:
+    """
+    Like erase_def(), but return the edits rather than making them.
+    """
     _, j = find_node(tokens, i, node=node)
     i = reverse_find(tokens, i, name=OP, src="@")
     i = reverse_consume(tokens, i, name=INDENT)
     i = reverse_consume(tokens, i, name=UNIMPORTANT_WS)
     i = reverse_consume(tokens, i, name=PHYSICAL_NEWLINE)
-    del tokens[i : j + 1]
+    return [Edit(i, j + 1, [])]
 
 
 def find_and_replace_name(tokens: list[Token], i: int, *, name: str, new: str) -> None:
@@ -488,6 +721,18 @@ def find_and_replace_name(tokens: list[Token], i: int, *, name: str, new: str) -
     tokens[j] = tokens[j]._replace(name=CODE, src=new)
 
 
+@plans_edits
+def find_and_replace_name_edits(
+    tokens: list[Token], i: int, *, name: str, new: str
+) -> list[Edit]:
+    """
+    Like find_and_replace_name(), but return the edits rather than making
+    them.
+    """
+    j = find(tokens, i, name=NAME, src=name)
+    return [Edit(j, j + 1, [tokens[j]._replace(name=CODE, src=new)])]
+
+
 def replace_argument_names(
     tokens: list[Token],
     i: int,
@@ -499,18 +744,39 @@ def replace_argument_names(
     Update an ast.Call node’s keyword argument names, where arg_map maps old to
     new names.
     """
+    apply_edits(
+        tokens, replace_argument_names_edits(tokens, i, node=node, arg_map=arg_map)
+    )
+
+
+@plans_edits
+def replace_argument_names_edits(
+    tokens: list[Token],
+    i: int,
+    *,
+    node: ast.Call,
+    arg_map: dict[str, str],
+) -> list[Edit]:
+    """
+    Like replace_argument_names(), but return the edits rather than making
+    them.
+    """
     j = find(tokens, i, name=OP, src="(")
     func_args, _ = parse_call_args(tokens, j)
 
-    for keyword in reversed(node.keywords):
+    edits = []
+    for keyword in node.keywords:
         if keyword.arg in arg_map:
             start_idx, end_idx = find_call_arg(tokens, func_args, keyword)
             for k in range(start_idx, end_idx):
                 if tokens[k].src == keyword.arg:
-                    tokens[k] = tokens[k]._replace(src=arg_map[keyword.arg])
+                    edits.append(
+                        Edit(k, k + 1, [tokens[k]._replace(src=arg_map[keyword.arg])])
+                    )
                     break
             else:  # pragma: no cover
                 raise AssertionError(f"{keyword.arg} argument not found")
+    return edits
 
 
 def remove_arg(
@@ -571,6 +837,25 @@ def reorder_call_kwargs(
     to do to retain comments. Don't call this function if the call
     has 0 or 1 arguments, there is nothing to reorder.
     """
+    apply_edits(
+        tokens,
+        reorder_call_kwargs_edits(
+            tokens, i, node=node, ordered_kwargs_idx=ordered_kwargs_idx
+        ),
+    )
+
+
+@plans_edits
+def reorder_call_kwargs_edits(
+    tokens: list[Token],
+    i: int,
+    *,
+    node: ast.Call,
+    ordered_kwargs_idx: list[int],
+) -> list[Edit]:
+    """
+    Like reorder_call_kwargs(), but return the edits rather than making them.
+    """
     open_idx = find(tokens, i, name=OP, src="(")
     start_idx = open_idx + 1
     func_args, close_idx = parse_call_args(tokens, open_idx)
@@ -589,8 +874,17 @@ def reorder_call_kwargs(
         # This case is easier because we cannot have comments in the argument range.
         start_idx = find(tokens, start_idx, name=NAME)
         arg_strs = [arg_str(tokens, *arg) for arg in func_kwargs]
-        tokens[start_idx : close_idx - 1] = [
-            Token(CODE, src=", ".join(arg_strs[idx] for idx in ordered_kwargs_idx))
+        return [
+            Edit(
+                start_idx,
+                close_idx - 1,
+                [
+                    Token(
+                        CODE,
+                        src=", ".join(arg_strs[idx] for idx in ordered_kwargs_idx),
+                    )
+                ],
+            )
         ]
 
     elif (tokens[func_args[-1][0]].line - tokens[func_args[0][1]].line) == 0 and (
@@ -623,8 +917,17 @@ def reorder_call_kwargs(
 
         # 2.3 Add ordered arguments.
         arg_strs = [arg_str(tokens, *arg) for arg in func_kwargs]
-        tokens[start_idx:tail_start_idx] = [
-            Token(CODE, src=", ".join(arg_strs[idx] for idx in ordered_kwargs_idx))
+        return [
+            Edit(
+                start_idx,
+                tail_start_idx,
+                [
+                    Token(
+                        CODE,
+                        src=", ".join(arg_strs[idx] for idx in ordered_kwargs_idx),
+                    )
+                ],
+            )
         ]
 
     else:
@@ -692,9 +995,15 @@ def reorder_call_kwargs(
                 arg_strs.append(arg_str(tokens, start, end))
 
         # 3.5 Add ordered arguments.
-        tokens[start_idx:tail_start_idx] = [
-            Token(CODE, src=f"{indent}{arg_strs[idx]},{comment_strs[idx]}\n")
-            for idx in ordered_kwargs_idx
+        return [
+            Edit(
+                start_idx,
+                tail_start_idx,
+                [
+                    Token(CODE, src=f"{indent}{arg_strs[idx]},{comment_strs[idx]}\n")
+                    for idx in ordered_kwargs_idx
+                ],
+            )
         ]
 
 
@@ -730,6 +1039,22 @@ def update_import_names(
     Replace an ast.ImportFrom node’s imported names, where name_map maps old to
     new names. If a new name entry is the empty string, remove the import.
     """
+    apply_edits(
+        tokens, update_import_names_edits(tokens, i, node=node, name_map=name_map)
+    )
+
+
+@plans_edits
+def update_import_names_edits(
+    tokens: list[Token],
+    i: int,
+    *,
+    node: ast.ImportFrom,
+    name_map: dict[str, str],
+) -> list[Edit]:
+    """
+    Like update_import_names(), but return the edits rather than making them.
+    """
     j = find(tokens, i, name=NAME, src="from")
     j = find(tokens, j, name=NAME, src="import")
 
@@ -737,7 +1062,7 @@ def update_import_names(
         alias.name for alias in node.names if alias.asname is None
     }
 
-    replacements: list[tuple[int, int, list[Token]]] = []  # start, end, new tokens
+    edits: list[Edit] = []
     remove_all = True
     for alias_idx, alias in enumerate(node.names):
         if alias.name not in name_map:
@@ -760,7 +1085,9 @@ def update_import_names(
                 end_idx = find(tokens, end_idx, name=NAME, src=alias.asname)
 
             if len(node.names) > 1:
-                if alias_idx == 0:
+                # While erasing a run of names from the start, take the comma
+                # after each, since the one before belongs to an earlier edit.
+                if remove_all and alias_idx != len(node.names) - 1:
                     end_idx = find(tokens, end_idx, name=OP, src=",")
                 else:
                     start_idx = reverse_find(tokens, start_idx, name=OP, src=",")
@@ -772,26 +1099,24 @@ def update_import_names(
                 start_idx -= 1
                 end_idx += 1
 
-            replacements.append((start_idx, end_idx, []))
+            edits.append(Edit(start_idx, end_idx + 1, []))
             j = end_idx
         else:
             # Replace
             remove_all = False
             start_idx = find(tokens, j, name=NAME, src=alias.name)
-            replacements.append(
-                (
-                    start_idx,
+            edits.append(
+                Edit(
                     start_idx,
+                    start_idx + 1,
                     [tokens[start_idx]._replace(name="CODE", src=new_name)],
                 )
             )
             j = start_idx
 
     if remove_all:
-        erase_node(tokens, i, node=node)
-    else:
-        for start_idx, end_idx, replacement in reversed(replacements):
-            tokens[start_idx : end_idx + 1] = replacement
+        return erase_node_edits(tokens, i, node=node)
+    return edits
 
 
 def update_import_modules(
@@ -806,6 +1131,26 @@ def update_import_modules(
     elsewhere. rewrites should map import names to the new modules they should
     be imported from.
     """
+    apply_edits(
+        tokens,
+        update_import_modules_edits(
+            tokens, i, node=node, module_rewrites=module_rewrites
+        ),
+    )
+
+
+@plans_edits
+def update_import_modules_edits(
+    tokens: list[Token],
+    i: int,
+    *,
+    node: ast.ImportFrom,
+    module_rewrites: dict[str, str],
+) -> list[Edit]:
+    """
+    Like update_import_modules(), but return the edits rather than making
+    them.
+    """
     imports_to_add = defaultdict(list)
     name_map = {}
     for alias in node.names:
@@ -816,10 +1161,14 @@ def update_import_modules(
             imports_to_add[module_rewrites[name]].append(new_name)
 
     j, indent = extract_indent(tokens, i)
-    update_import_names(tokens, i, node=node, name_map=name_map)
-    for module, names in reversed(imports_to_add.items()):
-        joined_names = ", ".join(sorted(names))
-        insert(tokens, j, new_src=f"{indent}from {module} import {joined_names}\n")
+    new_imports = [
+        Token(CODE, f"{indent}from {module} import {', '.join(sorted(names))}\n")
+        for module, names in imports_to_add.items()
+    ]
+    return [
+        Edit(j, j, new_imports),
+        *update_import_names_edits(tokens, i, node=node, name_map=name_map),
+    ]
 
 
 def delete_argument(
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from itertools import count
+
+import pytest
+
+_cache_dir_counter = count()
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    """
+    Isolate each test’s django-upgrade cache. The directory is not created,
+    to keep this cheap for the many tests that don’t use it.
+    """
+    path = tmp_path_factory.getbasetemp() / "cache" / str(next(_cache_dir_counter))
+    monkeypatch.setenv("DJANGO_UPGRADE_CACHE_DIR", str(path))
+    return path
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import ast
+import weakref
+from collections import defaultdict
+
 import pytest
 
-from django_upgrade.data import Settings
+from django_upgrade.data import Parents, Settings, State
+from django_upgrade.fixers.compatibility_imports import _replacements, visit_ImportFrom
 from django_upgrade.main import get_compat_imports, load_pyproject
 from tests.fixers.tools import check_noop, check_transformed
 
@@ -643,3 +648,30 @@ class TestCustomCompatImports:
             """,
             settings,
         )
+
+
+def test_replacements_per_settings():
+    # Many files share their Settings’ replacements, without being kept alive.
+    settings = Settings(target_version=(3, 1))
+    module = ast.parse("from django.contrib.postgres.fields.jsonb import JSONField\n")
+    node = module.body[0]
+    assert isinstance(node, ast.ImportFrom)
+    state_refs = []
+    for i in range(100_000):
+        migrations = i % 2 == 1
+        if migrations:
+            filename = f"app{i}/migrations/0001_initial.py"
+        else:
+            filename = f"app{i}/models.py"
+        state = State(settings, filename, defaultdict(set))
+        results = list(visit_ImportFrom(state, node, Parents(None)))
+        assert len(results) == (0 if migrations else 1)
+        if i < 2:
+            state_refs.append(weakref.ref(state))
+        if i == 0:
+            replacements = _replacements.get(settings)
+    del state
+
+    assert [ref() for ref in state_refs] == [None, None]
+    assert replacements is not None
+    assert _replacements.get(settings) is replacements
@@ -32,6 +32,19 @@ def test_noop_single_kwarg():
     )
 
 
+def test_noop_double_star_kwargs():
+    check_noop(
+        """\
+        from django.db import models
+
+        class Comment(models.Model):
+            field = models.BooleanField(**kwargs, null=True)
+        """,
+        settings,
+        filename="models.py",
+    )
+
+
 def test_noop_single_kwarg_with_args():
     check_noop(
         """\
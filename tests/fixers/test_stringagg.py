@@ -78,6 +78,18 @@ def test_mixed_safe_and_unsafe_delimiters():
     )
 
 
+def test_unsafe_delimiter_before_second_import():
+    check_noop(
+        """\
+        from django.contrib.postgres.aggregates import StringAgg
+
+        StringAgg("name", delimiter=get_delimiter())
+
+        from django.contrib.postgres.aggregates.general import StringAgg
+        """,
+    )
+
+
 def test_import_aliased():
     check_noop(
         """\
@@ -1,15 +1,49 @@
 from __future__ import annotations
 
 import ast
+import gc
+import subprocess
+import sys
+import weakref
+from collections import defaultdict
 
 import pytest
 
-from django_upgrade.ast import get_module_names
+from django_upgrade.ast import ast_parse, get_module_names, get_module_summary
+from django_upgrade.data import Parents, Settings, State
+
+settings = Settings(target_version=(4, 0))
+
+
+def make_state() -> State:
+    return State(
+        settings=settings, filename="example.py", from_imports=defaultdict(set)
+    )
+
+
+def test_ast_parse_bytes() -> None:
+    module = ast_parse("x = 'café'\n".encode())
+
+    assert ast.dump(module) == ast.dump(ast.parse("x = 'café'\n"))
+
+
+def test_ast_parse_ignores_warnings() -> None:
+    # Run in a subprocess, since pytest resets warning filters per test.
+    subprocess.run(
+        [
+            sys.executable,
+            "-W",
+            "error",
+            "-c",
+            "from django_upgrade.ast import ast_parse; ast_parse(r'x = \"\\d\"')",
+        ],
+        check=True,
+    )
 
 
 class TestGetModuleNames:
     def names(self, src: str) -> frozenset[str]:
-        return get_module_names(ast.parse(src))
+        return get_module_names(make_state(), ast.parse(src))
 
     @pytest.mark.parametrize(
         "src",
@@ -74,5 +108,44 @@ class TestGetModuleNames:
         ) == frozenset({"Exception", "x"})
 
     def test_caching(self) -> None:
+        state = make_state()
         module = ast.parse("x = 1")
-        assert get_module_names(module) is get_module_names(module)
+        assert get_module_names(state, module) is get_module_names(state, module)
+
+
+def test_get_module_summary() -> None:
+    module = ast.parse("def f(request):\n    g(x, g)\n")
+    func = module.body[0]
+    assert isinstance(func, ast.FunctionDef)
+    expr = func.body[0]
+    assert isinstance(expr, ast.Expr)
+
+    state = make_state()
+    summary = get_module_summary(state, module)
+
+    assert summary.names == frozenset({"f", "request", "g", "x"})
+    assert summary.name_counts == {"g": 2, "x": 1}
+    [call_site] = summary.calls["g"]
+    assert call_site.node is expr.value
+    assert list(Parents(call_site.chain)) == [module, func, expr]
+    assert get_module_summary(state, module) is summary
+
+
+def test_get_module_summary_per_state() -> None:
+    module = ast.parse("f()")
+    state = make_state()
+    summary = get_module_summary(state, module)
+
+    assert get_module_summary(make_state(), module) is not summary
+
+
+def test_get_module_summary_freed_with_state() -> None:
+    state = make_state()
+    module = ast.parse("f()")
+    get_module_summary(state, module)
+    module_ref = weakref.ref(module)
+    del module
+    del state
+    gc.collect()
+
+    assert module_ref() is None
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import ast
+
+from benchmarks import run
+from benchmarks.generate_project import SIZES, iter_project_files
+from django_upgrade.data import FIXERS, Settings, import_all_fixers
+from django_upgrade.main import SUPPORTED_TARGET_VERSIONS, apply_fixers
+from django_upgrade.stats import FileStats
+
+
+def test_generated_project_valid():
+    for path, contents in iter_project_files(SIZES["small"]):
+        ast.parse(contents, filename=path)
+
+
+def test_generated_project_rewritten_by_every_fixer():
+    """
+    If this fails for a new fixer, add code for it to
+    benchmarks/generate_project.py.
+    """
+    import_all_fixers()
+    settings = Settings(target_version=max(SUPPORTED_TARGET_VERSIONS))
+    rewrites = dict.fromkeys(FIXERS, 0)
+    for path, contents in iter_project_files(SIZES["small"]):
+        file_stats = FileStats(path)
+        apply_fixers(contents, settings, path, file_stats=file_stats)
+        for name, fixer_stats in file_stats.fixers.items():
+            rewrites[name] += fixer_stats.rewrites
+
+    assert [name for name, count in rewrites.items() if count == 0] == []
+
+
+def test_run(tmp_path, capsys):
+    json_path = tmp_path / "results.json"
+
+    returncode = run.main(
+        ["run", "--size", "small", "--repeat", "1", "--json", str(json_path)]
+    )
+
+    assert returncode == 0
+    out, err = capsys.readouterr()
+    assert out.startswith("1 runs over 33 files, ")
+    assert "working tree" in out
+    assert json_path.exists()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from django_upgrade.cache import EVICT_INTERVAL, Cache, LRUCache, default_cache_dir
+from django_upgrade.data import Settings
+
+settings = Settings(target_version=(4, 2))
+
+
+def make_cache(directory: Path) -> Cache:
+    return Cache(str(directory), settings, "1.0.0")
+
+
+def make_old_file(tmp_path: Path, contents: str = "x = 1\n") -> Path:
+    path = tmp_path / "example.py"
+    path.write_text(contents)
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return path
+
+
+def count_entries(directory: Path) -> int:
+    return sum(
+        len(os.listdir(entry.path)) for entry in os.scandir(directory) if entry.is_dir()
+    )
+
+
+def test_default_cache_dir_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("DJANGO_UPGRADE_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == str(tmp_path)
+
+
+def test_default_cache_dir_xdg(monkeypatch, tmp_path):
+    monkeypatch.delenv("DJANGO_UPGRADE_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == os.path.join(str(tmp_path), "django-upgrade")
+
+
+def test_default_cache_dir_home(monkeypatch):
+    monkeypatch.delenv("DJANGO_UPGRADE_CACHE_DIR")
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    assert default_cache_dir() == os.path.join(
+        os.path.expanduser("~/.cache"), "django-upgrade"
+    )
+
+
+def test_add_contains(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.contents_key("example.py", b"x = 1\n")
+
+    assert key not in cache
+    cache.add(key)
+    assert key in cache
+    cache.add(key)
+    assert key in cache
+
+
+def test_add_unwritable(tmp_path):
+    (tmp_path / "file").write_text("")
+    cache = make_cache(tmp_path / "file")
+    key = cache.contents_key("example.py", b"x = 1\n")
+
+    cache.add(key)
+
+    assert key not in cache
+
+
+def test_keys_vary_by_settings_and_version(tmp_path):
+    keys = {
+        cache.contents_key("example.py", b"x = 1\n")
+        for cache in (
+            make_cache(tmp_path),
+            Cache(str(tmp_path), settings, "2.0.0"),
+            Cache(str(tmp_path), Settings(target_version=(5, 0)), "1.0.0"),
+            Cache(
+                str(tmp_path),
+                Settings(target_version=(4, 2), only_fixers={"request_headers"}),
+                "1.0.0",
+            ),
+            Cache(
+                str(tmp_path),
+                Settings(
+                    target_version=(4, 2),
+                    compat_imports={"example": {"name": "other"}},
+                ),
+                "1.0.0",
+            ),
+        )
+    }
+    assert len(keys) == 5
+
+
+def test_keys_vary_by_python(monkeypatch, tmp_path):
+    key = make_cache(tmp_path).contents_key("example.py", b"x = 1\n")
+    monkeypatch.setattr(sys.implementation, "cache_tag", "cpython-399")
+
+    assert make_cache(tmp_path).contents_key("example.py", b"x = 1\n") != key
+
+
+def test_contents_key_varies_by_filename(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.contents_key("example.py", b"x = 1\n") != cache.contents_key(
+        "settings.py", b"x = 1\n"
+    )
+
+
+def test_stat_key(tmp_path):
+    cache = make_cache(tmp_path)
+    path = make_old_file(tmp_path)
+
+    key = cache.stat_key(str(path), os.stat(path))
+
+    assert key is not None
+    path.write_text("x = 2\n")
+    assert cache.stat_key(str(path), os.stat(path)) is None
+
+
+def test_evict(tmp_path):
+    cache = make_cache(tmp_path)
+    keys = [cache.contents_key("example.py", str(i).encode()) for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.add(key)
+        mtime = time.time() - 100 + i
+        os.utime(cache._path(key), (mtime, mtime))
+
+    cache.evict(max_entries=3)
+
+    assert [key in cache for key in keys] == [False, False, True, True, True]
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path)
+    keys = [cache.contents_key("example.py", str(i).encode()) for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.add(key)
+        mtime = time.time() - 100 + i
+        os.utime(cache._path(key), (mtime, mtime))
+
+    assert keys[0] in cache
+    cache.evict(max_entries=3)
+
+    assert [key in cache for key in keys] == [True, False, False, True, True]
+
+
+def test_evict_interval(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.contents_key("example.py", b"")
+    cache.add(key)
+    cache.evict(max_entries=1)
+
+    cache.add(cache.contents_key("example.py", b"x"))
+    cache.evict(max_entries=1)
+    assert count_entries(tmp_path) == 2
+
+    old = time.time() - EVICT_INTERVAL - 1
+    os.utime(tmp_path / "last-evict", (old, old))
+    cache.evict(max_entries=1)
+    assert count_entries(tmp_path) == 1
+
+
+def test_evict_missing_directory(tmp_path):
+    cache = make_cache(tmp_path / "missing")
+
+    cache.evict()
+
+    assert not (tmp_path / "missing").exists()
+
+
+def test_lru_cache(tmp_path):
+    cache = LRUCache(str(tmp_path), settings, "1.0.0", maxsize=2)
+    keys = [cache.contents_key("example.py", str(i).encode()) for i in range(3)]
+    for key in keys:
+        cache.add(key)
+    cache.add(keys[2])
+
+    assert list(cache.recent) == keys[1:]
+    assert keys[0] in cache
+    assert list(cache.recent) == [keys[2], keys[0]]
+    assert keys[2] in cache
+    assert list(cache.recent) == [keys[0], keys[2]]
+    assert cache.contents_key("example.py", b"missing") not in cache
+
+
+def test_lru_cache_fixed(tmp_path):
+    cache = LRUCache(str(tmp_path), settings, "1.0.0", fixed_maxsize=2)
+    keys = [cache.contents_key("example.py", str(i).encode()) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.add_fixed(key, f"fixed {i}")
+
+    assert cache.get_fixed(keys[0]) == "fixed 0"
+    cache.add_fixed(keys[2], "fixed 2")
+
+    assert list(cache.fixed) == [keys[0], keys[2]]
+    assert cache.get_fixed(keys[1]) is None
+    assert count_entries(tmp_path) == 0
+
+
+def test_cache_fixed_not_kept(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.contents_key("example.py", b"x = 1\n")
+
+    cache.add_fixed(key, "x = 2\n")
+
+    assert cache.get_fixed(key) is None
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import io
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+import pytest
+
+from django_upgrade import main as main_module
+from django_upgrade.daemon import (
+    DaemonServer,
+    client_main,
+    close_server,
+    daemon_main,
+    default_socket_path,
+    make_server,
+)
+from django_upgrade.data import Settings
+from tests.compat import chdir
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Requires Unix sockets"
+)
+
+settings = Settings(target_version=(4, 0))
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = make_server(str(tmp_path / "d.sock"), settings, use_cache=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    close_server(server)
+
+
+def client(server: DaemonServer, *args: str) -> int:
+    return client_main(["--socket", str(server.server_address), *args])
+
+
+def test_default_socket_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    with chdir(tmp_path):
+        path = default_socket_path()
+    with chdir(tmp_path.parent):
+        other_path = default_socket_path()
+
+    assert os.path.dirname(path) == str(tmp_path)
+    assert path.endswith(".sock")
+    assert path != other_path
+
+
+def test_default_socket_path_private_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    path = default_socket_path()
+
+    directory = tmp_path / f"django-upgrade-{os.getuid()}"
+    assert os.path.dirname(path) == str(directory)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+    assert default_socket_path() == path
+
+
+def test_default_socket_path_private_dir_shared(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    directory = tmp_path / f"django-upgrade-{os.getuid()}"
+    directory.mkdir(mode=0o777)
+    directory.chmod(0o777)
+
+    with pytest.raises(SystemExit) as excinfo:
+        default_socket_path()
+
+    assert "must be a directory owned by the current user" in str(excinfo.value)
+
+
+def test_default_socket_path_private_dir_symlink(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    (tmp_path / "target").mkdir(mode=0o700)
+    (tmp_path / f"django-upgrade-{os.getuid()}").symlink_to(tmp_path / "target")
+
+    with pytest.raises(SystemExit) as excinfo:
+        default_socket_path()
+
+    assert "must be a directory owned by the current user" in str(excinfo.value)
+
+
+def test_default_socket_path_private_dir_uncreatable(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "missing"))
+
+    with pytest.raises(SystemExit) as excinfo:
+        default_socket_path()
+
+    assert "could not create" in str(excinfo.value)
+
+
+def test_client_rewrite(server, tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    returncode = client(server, str(path))
+
+    assert returncode == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == f"Rewriting {path}\n"
+    assert path.read_text() == "from django.core.paginator import Paginator\n"
+
+
+def test_client_unchanged_cached(server, tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("x = 1\n")
+
+    assert client(server, str(path)) == 0
+    assert client(server, str(path)) == 0
+
+    assert server.cache is not None
+    assert len(server.cache.recent) == 1
+    assert capsys.readouterr() == ("", "")
+
+
+def test_client_check(server, tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    returncode = client(server, "--check", str(path))
+
+    assert returncode == 1
+    out, err = capsys.readouterr()
+    assert err == f"Would rewrite {path}\n"
+    assert path.read_text() == "from django.core.paginator import QuerySetPaginator\n"
+
+
+def test_client_check_fixed_cached(server, tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    assert client(server, "--check", str(path)) == 1
+
+    with mock.patch.object(main_module, "_apply_fixers", side_effect=AssertionError):
+        assert client(server, "--check", str(path)) == 1
+
+    assert capsys.readouterr() == ("", f"Would rewrite {path}\n" * 2)
+    assert path.read_text() == "from django.core.paginator import QuerySetPaginator\n"
+
+
+def test_client_relative_filename(server, tmp_path, capsys):
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "settings.py").write_text("USE_L10N = True\n")
+
+    with chdir(tmp_path):
+        returncode = client(server, "--exit-zero-even-if-changed", "app")
+
+    assert returncode == 0
+    out, err = capsys.readouterr()
+    assert err == f"Rewriting {os.path.join('app', 'settings.py')}\n"
+    assert (tmp_path / "app" / "settings.py").read_text() == ""
+
+
+def test_client_stdin(server, capsys):
+    stdin = io.TextIOWrapper(
+        io.BytesIO(b"from django.core.paginator import QuerySetPaginator\n")
+    )
+    with mock.patch.object(sys, "stdin", stdin):
+        returncode = client(server, "-")
+
+    assert returncode == 0
+    out, err = capsys.readouterr()
+    assert out == "from django.core.paginator import Paginator\n"
+    assert err == ""
+
+
+def test_client_stdin_non_utf8(server, capsys):
+    stdin = io.TextIOWrapper(io.BytesIO("# café\n".encode("cp1252")))
+    with mock.patch.object(sys, "stdin", stdin):
+        returncode = client(server, "-")
+
+    assert returncode == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == "- is non-utf-8 (not supported)\n"
+
+
+def test_client_daemon_error(server, tmp_path):
+    with pytest.raises(SystemExit) as excinfo:
+        client(server, str(tmp_path / "missing.py"))
+
+    assert str(excinfo.value).startswith(
+        "django-upgrade: daemon error: FileNotFoundError: "
+    )
+
+
+def test_client_no_daemon(tmp_path):
+    with pytest.raises(SystemExit) as excinfo:
+        client_main(["--socket", str(tmp_path / "d.sock"), "example.py"])
+
+    assert str(excinfo.value).startswith(
+        "django-upgrade: could not connect to daemon at "
+    )
+
+
+def test_client_connection_closed(tmp_path):
+    path = str(tmp_path / "d.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(path)
+        listener.listen()
+
+        def accept_and_close():
+            conn, _ = listener.accept()
+            conn.recv(4096)
+            conn.close()
+
+        thread = threading.Thread(target=accept_and_close)
+        thread.start()
+        with pytest.raises(SystemExit) as excinfo:
+            client_main(["--socket", path, "example.py"])
+        thread.join()
+
+    assert str(excinfo.value) == "django-upgrade: daemon closed the connection"
+
+
+def test_client_imports_only_stdlib():
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, django_upgrade.daemon; "
+            "print(sorted(m for m in sys.modules if m.startswith('django_upgrade')))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert proc.stdout == "['django_upgrade', 'django_upgrade.daemon']\n"
+
+
+def test_main_daemon(tmp_path, capsys):
+    path = str(tmp_path / "d.sock")
+    (tmp_path / "d.sock").write_text("stale")
+
+    with mock.patch.object(
+        DaemonServer, "serve_forever", side_effect=KeyboardInterrupt
+    ):
+        returncode = daemon_main(["--socket", path, "--no-cache"])
+
+    assert returncode == 0
+    out, err = capsys.readouterr()
+    assert err == f"Listening on {path}\n"
+    assert not os.path.exists(path)
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import ast
+import pickle
 import re
+import subprocess
+import sys
+import weakref
 from collections import defaultdict
 from pathlib import Path
+from typing import Any
+from unittest import mock
 
 import pytest
 
-from django_upgrade.data import FIXERS, Settings, State
+from django_upgrade.data import (
+    FIXERS,
+    DispatchTable,
+    ParentChain,
+    Parents,
+    Scratch,
+    Settings,
+    State,
+    compile_triggers,
+    get_ast_funcs,
+    import_all_fixers,
+    load_fixer,
+    visit,
+)
+from django_upgrade.fixer_manifest import FIXER_MANIFEST
+from django_upgrade.main import apply_fixers
 
 settings = Settings(target_version=(4, 0))
 
@@ -256,10 +278,349 @@ def test_all_fixers_are_documented() -> None:
     readme = (Path(__name__).parent.parent / "docs/fixers.rst").read_text()
     docs = {m[1] for m in re.finditer(r"\*\*Name:\*\* ``(.+)``", readme, re.MULTILINE)}
 
-    names = set(FIXERS)
+    names = set(FIXER_MANIFEST)
 
     invalid = docs - names
     assert not invalid
 
     undocumented = names - docs
     assert not undocumented
+
+
+def test_fixer_manifest_up_to_date() -> None:
+    """
+    If this fails, run scripts/generate_fixer_manifest.py.
+    """
+    import_all_fixers()
+
+    assert sorted(FIXER_MANIFEST) == sorted(FIXERS)
+    for name, info in FIXER_MANIFEST.items():
+        fixer = FIXERS[name]
+        assert info.min_version == fixer.min_version, name
+        assert info.condition == fixer.condition, name
+        assert info.triggers == fixer.triggers, name
+        assert info.node_types == tuple(
+            sorted(type_.__name__ for type_, _ in fixer.ast_funcs.items())
+        ), name
+        if info.condition is not None:
+            assert isinstance(getattr(make_state("example.py"), info.condition), bool)
+
+
+def test_load_fixer() -> None:
+    fixer = load_fixer("utils_timezone")
+
+    assert fixer.name == "utils_timezone"
+    assert FIXERS["utils_timezone"] is fixer
+
+
+def test_scratch() -> None:
+    scratch = Scratch(set[str])
+    state = State(settings, "example.py", defaultdict(set))
+
+    value = scratch.get(state)
+
+    assert value == set()
+    assert scratch.get(state) is value
+    assert scratch.get(State(settings, "other.py", defaultdict(set))) is not value
+
+
+def test_scratch_set_and_pop() -> None:
+    scratch = Scratch(bool)
+    state = State(settings, "example.py", defaultdict(set))
+
+    scratch.set(state, True)
+
+    assert scratch.get(state) is True
+    assert scratch.pop(state) is True
+    assert scratch.get(state) is False
+
+
+def test_scratch_declared_after_use() -> None:
+    state = State(settings, "example.py", defaultdict(set))
+    first = Scratch(set[str])
+    first.get(state).add("x")
+
+    second = Scratch(set[str])
+
+    assert second.get(state) == set()
+    assert first.get(state) == {"x"}
+
+
+def test_scratch_settings() -> None:
+    scratch = Scratch(set[str])
+    settings = Settings(target_version=(4, 0))
+
+    value = scratch.get(settings)
+
+    assert scratch.get(settings) is value
+    assert scratch.get(Settings(target_version=(4, 0))) is not value
+    assert scratch.get(State(settings, "example.py", defaultdict(set))) is not value
+
+
+def test_scratch_settings_pickled() -> None:
+    scratch = Scratch(list[str])
+    settings = Settings(target_version=(4, 0))
+    apply_fixers(
+        "from django.utils.encoding import force_text\n", settings, "example.py"
+    )
+    scratch.get(settings).append("value")
+
+    unpickled = pickle.loads(pickle.dumps(settings))
+
+    assert unpickled.scratch == []
+    assert unpickled.dispatch_tables == {}
+    assert scratch.get(unpickled) == []
+    assert unpickled.target_version == (4, 0)
+    assert unpickled.active_fixers == settings.active_fixers
+
+
+def test_scratch_freed_with_state() -> None:
+    scratch = Scratch(set[str])
+    state = State(settings, "example.py", defaultdict(set))
+    value_ref = weakref.ref(scratch.get(state))
+
+    del state
+
+    assert value_ref() is None
+
+
+def test_get_ast_funcs_condition() -> None:
+    only_settings = Settings(target_version=(4, 0), only_fixers={"use_l10n"})
+
+    assert get_ast_funcs(make_state("example.py"), only_settings) == {}
+    assert get_ast_funcs(
+        State(
+            settings=only_settings,
+            filename="settings.py",
+            from_imports=defaultdict(set),
+        ),
+        only_settings,
+    )
+
+
+def make_parents(*nodes: ast.AST) -> Parents:
+    chain: ParentChain = None
+    for depth, node in enumerate(nodes, start=1):
+        chain = (node, chain, depth, nodes[0])
+    return Parents(chain)
+
+
+def test_parents() -> None:
+    module = ast.parse("class C:\n    def f(self):\n        x\n")
+    class_def = module.body[0]
+    assert isinstance(class_def, ast.ClassDef)
+    function_def = class_def.body[0]
+    assert isinstance(function_def, ast.FunctionDef)
+    nodes = (module, class_def, function_def, function_def.body[0])
+    parents = make_parents(*nodes)
+
+    assert len(parents) == 4
+    assert [parents[i] for i in range(4)] == list(nodes)
+    assert [parents[i] for i in range(-1, -5, -1)] == list(reversed(nodes))
+    assert parents[1:] == nodes[1:]
+    assert parents[::-2] == nodes[::-2]
+    assert list(parents) == list(nodes)
+    assert list(reversed(parents)) == list(reversed(nodes))
+    assert nodes[2] in parents
+    assert parents.index(nodes[3]) == 3
+
+
+@pytest.mark.parametrize("index", [4, -5])
+def test_parents_index_error(index: int) -> None:
+    module = ast.parse("f(x)")
+    expr = module.body[0]
+    assert isinstance(expr, ast.Expr)
+    call = expr.value
+    assert isinstance(call, ast.Call)
+    parents = make_parents(module, expr, call, call.args[0])
+
+    with pytest.raises(IndexError):
+        parents[index]
+
+
+def test_parents_empty() -> None:
+    parents = Parents(None)
+
+    assert len(parents) == 0
+    assert list(parents) == []
+    assert parents[:] == ()
+    with pytest.raises(IndexError):
+        parents[-1]
+
+
+def test_visit_parents() -> None:
+    tree = ast.parse("class A:\n    def f(self):\n        return 1\n")
+    seen = []
+
+    def ast_func(state: State, node: ast.Return, parents: Parents) -> list[Any]:
+        seen.append(tuple(parents))
+        return []
+
+    fixer_settings = Settings(target_version=(4, 0))
+    state = State(
+        settings=fixer_settings,
+        filename="example.py",
+        from_imports=defaultdict(set),
+    )
+    fixer_settings.dispatch_tables[state.classification] = {ast.Return: (ast_func,)}
+    visit(tree, fixer_settings, "example.py")
+
+    class_def = tree.body[0]
+    assert isinstance(class_def, ast.ClassDef)
+    assert seen == [(tree, class_def, class_def.body[0])]
+
+
+def test_settings_conditions() -> None:
+    only_settings = Settings(
+        target_version=(4, 0),
+        only_fixers={"use_l10n", "index_together", "admin_allow_tags"},
+    )
+
+    # index_together requires Django 4.2
+    assert only_settings.active_fixers == ("admin_allow_tags", "use_l10n")
+    assert only_settings.conditions == ("looks_like_settings_file",)
+
+
+def test_classification() -> None:
+    only_settings = Settings(
+        target_version=(4, 2), only_fixers={"use_l10n", "index_together"}
+    )
+    assert only_settings.conditions == (
+        "looks_like_models_file",
+        "looks_like_settings_file",
+    )
+
+    def classification(filename: str) -> int:
+        return State(
+            settings=only_settings,
+            filename=filename,
+            from_imports=defaultdict(set),
+        ).classification
+
+    assert classification("example.py") == 0
+    assert classification("models.py") == 0b01
+    assert classification("settings.py") == 0b10
+    assert classification("settings/models.py") == 0b11
+
+
+def test_get_ast_funcs_shared_per_classification() -> None:
+    only_settings = Settings(target_version=(4, 0), only_fixers={"use_l10n"})
+
+    def ast_funcs(filename: str) -> DispatchTable:
+        state = State(
+            settings=only_settings,
+            filename=filename,
+            from_imports=defaultdict(set),
+        )
+        return get_ast_funcs(state, only_settings)
+
+    assert ast_funcs("settings.py") is ast_funcs("project/settings.py")
+    assert ast_funcs("example.py") is not ast_funcs("settings.py")
+    assert set(only_settings.dispatch_tables) == {0, 1}
+
+
+def test_get_ast_funcs_read_only() -> None:
+    state = make_state("settings.py")
+    table = get_ast_funcs(state, state.settings)
+
+    with pytest.raises(TypeError):
+        table[ast.Name] = ()  # type: ignore [index]
+
+
+def test_could_change_filename() -> None:
+    only_settings = Settings(
+        target_version=(4, 0), only_fixers={"use_l10n", "settings_storages"}
+    )
+
+    assert not only_settings.any_unconditional
+    assert only_settings.could_change_filename("settings.py")
+    assert not only_settings.could_change_filename("example.py")
+
+
+def test_could_change_filename_unconditional() -> None:
+    only_settings = Settings(
+        target_version=(4, 0), only_fixers={"use_l10n", "queryset_paginator"}
+    )
+
+    assert only_settings.any_unconditional
+    assert only_settings.could_change_filename("example.py")
+
+
+def test_compile_triggers() -> None:
+    only_settings = Settings(target_version=(4, 0), only_fixers={"use_l10n"})
+
+    trigger_re = compile_triggers(only_settings)
+
+    assert trigger_re is not None
+    assert trigger_re.pattern == "USE_L10N"
+    assert only_settings.could_change("USE_L10N = True\n")
+    assert not only_settings.could_change("x = 1\n")
+    assert only_settings.could_change_bytes(b"USE_L10N = True\n")
+    assert not only_settings.could_change_bytes(b"x = 1\n")
+
+
+def test_compile_triggers_excludes_newer_fixers() -> None:
+    only_settings = Settings(target_version=(3, 2), only_fixers={"use_l10n"})
+
+    assert not only_settings.could_change("USE_L10N = True\n")
+
+
+def test_compile_triggers_compat_imports() -> None:
+    only_settings = Settings(
+        target_version=(4, 0),
+        only_fixers={"compatibility_imports"},
+        compat_imports={"example.old": {"some_name": "example.new"}},
+    )
+
+    assert only_settings.could_change("from example.old import some_name\n")
+
+
+def test_compile_triggers_no_triggers() -> None:
+    with mock.patch.dict(
+        FIXER_MANIFEST,
+        {"use_l10n": FIXER_MANIFEST["use_l10n"]._replace(triggers=None)},
+    ):
+        only_settings = Settings(target_version=(4, 0), only_fixers={"use_l10n"})
+
+    assert only_settings.trigger_re is None
+    assert only_settings.trigger_bytes_re is None
+    assert only_settings.could_change("x = 1\n")
+    assert only_settings.could_change_bytes(b"x = 1\n")
+
+
+def python_imports(*args: str) -> list[str]:
+    """
+    Run a django-upgrade command in a new interpreter, and return the
+    modules it imported, as reported by -X importtime.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "django_upgrade", *args],
+        capture_output=True,
+        text=True,
+    )
+    return [
+        line.rpartition("|")[2].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+
+
+@pytest.mark.parametrize("args", [("--version",), ("--list-fixers",)])
+def test_startup_imports_no_fixers(args: tuple[str, ...]) -> None:
+    modules = python_imports(*args)
+
+    assert "django_upgrade.main" in modules
+    assert [m for m in modules if m.startswith("django_upgrade.fixers.")] == []
+
+
+def test_startup_imports_only_enabled_fixers(tmp_path: Path) -> None:
+    path = tmp_path / "example.py"
+    path.write_text("x = utc\n")
+
+    modules = python_imports(
+        "--target-version", "5.0", "--only", "utils_timezone", "--no-cache", str(path)
+    )
+
+    assert [m for m in modules if m.startswith("django_upgrade.fixers.")] == [
+        "django_upgrade.fixers.utils_timezone"
+    ]
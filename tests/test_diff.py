@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import difflib
+import random
+
+import pytest
+
+from django_upgrade.diff import split_lines, unified_diff
+
+
+def difflib_diff(old: str, new: str) -> str:
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            "a/example.py",
+            "b/example.py",
+        )
+    )
+
+
+def test_unified_diff_unchanged():
+    assert unified_diff("x = 1\n", "x = 1\n", "example.py") == (
+        "--- a/example.py\n+++ b/example.py\n"
+    )
+
+
+def test_unified_diff_single_line():
+    old = "".join(f"x{i} = {i}\n" for i in range(20))
+    new = old.replace("x10 = 10", "x10 = 11")
+
+    assert unified_diff(old, new, "example.py") == (
+        "--- a/example.py\n"
+        + "+++ b/example.py\n"
+        + "@@ -8,7 +8,7 @@\n"
+        + " x7 = 7\n"
+        + " x8 = 8\n"
+        + " x9 = 9\n"
+        + "-x10 = 10\n"
+        + "+x10 = 11\n"
+        + " x11 = 11\n"
+        + " x12 = 12\n"
+        + " x13 = 13\n"
+    )
+
+
+def test_unified_diff_no_newline_at_end():
+    assert unified_diff("x = 1\ny = 2", "x = 1\ny = 3", "example.py") == (
+        "--- a/example.py\n"
+        + "+++ b/example.py\n"
+        + "@@ -1,2 +1,2 @@\n"
+        + " x = 1\n"
+        + "-y = 2\n"
+        + "\\ No newline at end of file\n"
+        + "+y = 3\n"
+        + "\\ No newline at end of file\n"
+    )
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_unified_diff_matches_difflib(seed):
+    rand = random.Random(seed)
+    # Unique lines, so there's only one best alignment
+    old_lines = [f"line{i}\n" for i in range(rand.randrange(30))]
+    new_lines = list(old_lines)
+    for i in range(rand.randrange(1, 4)):
+        index = rand.randrange(len(new_lines) + 1)
+        action = rand.randrange(3)
+        if action == 0 or index == len(new_lines):
+            new_lines.insert(index, f"new{i}\n")
+        elif action == 1:
+            del new_lines[index]
+        else:
+            new_lines[index] = f"changed{i}\n"
+    old = "".join(old_lines)
+    new = "".join(new_lines)
+
+    assert unified_diff(old, new, "example.py") == (
+        "--- a/example.py\n+++ b/example.py\n" if old == new else ""
+    ) + difflib_diff(old, new)
+
+
+def test_split_lines():
+    assert split_lines("") == []
+    assert split_lines("a\r\nb\x0cc\n") == ["a\r\n", "b\x0cc\n"]
+    assert split_lines("a\nb") == ["a\n", "b"]
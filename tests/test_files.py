@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import io
+import os
+import subprocess
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from django_upgrade import files
+from django_upgrade.files import (
+    IgnoreRule,
+    git_changed_filenames,
+    is_ignored,
+    iter_filenames,
+    read_filenames,
+    walk_directory,
+)
+from tests.compat import chdir
+
+
+def make_files(root: Path, *paths: str) -> None:
+    for path in paths:
+        full_path = root / path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text("")
+
+
+def walk(root: Path, exclude: Sequence[str] = ()) -> list[str]:
+    with chdir(root):
+        return [path.replace(os.sep, "/") for path in iter_filenames(["."], exclude)]
+
+
+def test_iter_filenames_passthrough(tmp_path):
+    assert list(iter_filenames(["-", "missing.py", "example.txt"])) == [
+        "-",
+        "missing.py",
+        "example.txt",
+    ]
+
+
+def test_iter_filenames_lazy(tmp_path):
+    make_files(tmp_path, "a.py")
+    filenames = iter_filenames([str(tmp_path), str(tmp_path / "b")])
+
+    assert next(filenames) == str(tmp_path / "a.py")
+    # Created after the first file was yielded.
+    (tmp_path / "b").mkdir()
+    make_files(tmp_path, "b/c.py")
+    assert list(filenames) == [str(tmp_path / "b" / "c.py")]
+
+
+def test_read_filenames(tmp_path):
+    path = tmp_path / "files.txt"
+    path.write_bytes(b"a.py\r\n\nb c.py\nd.py")
+
+    assert list(read_filenames(str(path))) == ["a.py", "b c.py", "d.py"]
+
+
+def test_read_filenames_null(tmp_path):
+    path = tmp_path / "files.txt"
+    path.write_bytes(b"a.py\0b\nc.py\0\0")
+
+    assert list(read_filenames(str(path), null=True)) == ["a.py", "b\nc.py"]
+
+
+def test_read_filenames_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(files, "READ_SIZE", 3)
+    path = tmp_path / "files.txt"
+    path.write_bytes(b"a.py\r\nbb.py\nccc.py\r\n")
+
+    assert list(read_filenames(str(path))) == ["a.py", "bb.py", "ccc.py"]
+
+
+def test_read_filenames_stdin():
+    stdin = io.TextIOWrapper(io.BytesIO(b"a.py\0b.py"))
+    with mock.patch.object(sys, "stdin", stdin):
+        assert list(read_filenames("-", null=True)) == ["a.py", "b.py"]
+
+
+def test_read_filenames_streaming():
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb") as reader, os.fdopen(write_fd, "wb") as writer:
+        stdin = mock.Mock(buffer=reader)
+        with mock.patch.object(sys, "stdin", stdin):
+            filenames = read_filenames("-")
+            writer.write(b"a.py\nb.py\nc")
+            writer.flush()
+            # Available before the writer finishes
+            assert next(filenames) == "a.py"
+            assert next(filenames) == "b.py"
+            writer.write(b".py\n")
+            writer.close()
+            assert list(filenames) == ["c.py"]
+
+
+def test_read_filenames_missing(tmp_path):
+    path = tmp_path / "missing.txt"
+
+    with pytest.raises(SystemExit) as excinfo:
+        list(read_filenames(str(path)))
+
+    assert str(excinfo.value).startswith(
+        f"django-upgrade: could not read --files-from {str(path)!r}: "
+    )
+
+
+def test_walk_sorted_python_files(tmp_path):
+    make_files(
+        tmp_path,
+        "b.py",
+        "a.py",
+        "README.rst",
+        "app/models.py",
+        "app/sub/admin.py",
+        "app/views.pyi",
+        "z.py",
+    )
+
+    assert walk(tmp_path) == [
+        "./a.py",
+        "./app/models.py",
+        "./app/sub/admin.py",
+        "./b.py",
+        "./z.py",
+    ]
+
+
+def test_walk_skip_dirs(tmp_path):
+    make_files(
+        tmp_path,
+        ".git/hooks/pre-commit.py",
+        ".tox/py314/lib/example.py",
+        "app/__pycache__/example.py",
+        "app/models.py",
+        "frontend/node_modules/example.py",
+    )
+
+    assert walk(tmp_path) == ["./app/models.py"]
+
+
+def test_walk_skip_virtualenv(tmp_path):
+    make_files(tmp_path, "env/pyvenv.cfg", "env/lib/example.py", "app.py")
+
+    assert walk(tmp_path) == ["./app.py"]
+
+
+def test_walk_missing_directory(tmp_path):
+    assert list(iter_filenames([str(tmp_path)])) == []
+    assert list(iter_filenames([str(tmp_path / "missing")])) == [
+        str(tmp_path / "missing")
+    ]
+
+
+def test_walk_directory_unreadable(tmp_path):
+    assert list(walk_directory(str(tmp_path / "missing"), [])) == []
+
+
+def test_walk_gitignore(tmp_path):
+    make_files(
+        tmp_path,
+        "app/models.py",
+        "app/generated_pb2.py",
+        "build/example.py",
+        "docs/build/conf.py",
+        "keep_pb2.py",
+    )
+    (tmp_path / ".gitignore").write_text(
+        "# generated code\n\n*_pb2.py\n!keep_pb2.py\n/build/\n"
+    )
+
+    assert walk(tmp_path) == [
+        "./app/models.py",
+        "./docs/build/conf.py",
+        "./keep_pb2.py",
+    ]
+
+
+def test_walk_gitignore_nested(tmp_path):
+    make_files(tmp_path, "app/models.py", "app/legacy.py", "legacy.py")
+    (tmp_path / "app" / ".gitignore").write_text("legacy.py\n")
+
+    assert walk(tmp_path) == ["./app/models.py", "./legacy.py"]
+
+
+def test_walk_gitignore_parent_in_repo(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("legacy.py\n")
+    make_files(tmp_path, "src/app/models.py", "src/app/legacy.py")
+
+    assert walk(tmp_path / "src") == ["./app/models.py"]
+
+
+def test_walk_gitignore_parent_outside_repo(tmp_path):
+    (tmp_path / ".gitignore").write_text("legacy.py\n")
+    make_files(tmp_path, "src/app/models.py", "src/app/legacy.py")
+
+    assert walk(tmp_path / "src") == ["./app/legacy.py", "./app/models.py"]
+
+
+def test_walk_exclude(tmp_path):
+    make_files(
+        tmp_path,
+        "app/models.py",
+        "app/migrations/0001_initial.py",
+        "legacy/views.py",
+        "other/legacy/views.py",
+    )
+
+    assert walk(tmp_path, exclude=["migrations/", "/legacy"]) == [
+        "./app/models.py",
+        "./other/legacy/views.py",
+    ]
+
+
+@pytest.mark.parametrize(
+    "pattern,path,is_dir,expected",
+    [
+        ("*.py", "a/b.py", False, True),
+        ("*.py", "a/b.pyi", False, False),
+        ("a/*.py", "a/b.py", False, True),
+        ("a/*.py", "c/a/b.py", False, False),
+        ("a/**/b.py", "a/b.py", False, True),
+        ("a/**/b.py", "a/x/y/b.py", False, True),
+        ("a/**", "a/x/y/b.py", False, True),
+        ("b?.py", "b1.py", False, True),
+        ("b?.py", "b/.py", False, False),
+        ("[ab].py", "a.py", False, True),
+        ("[!ab].py", "a.py", False, False),
+        ("[!ab].py", "c.py", False, True),
+        ("\\#a.py", "#a.py", False, True),
+        ("build/", "build", True, True),
+        ("build/", "build", False, False),
+    ],
+)
+def test_ignore_rule(pattern, path, is_dir, expected):
+    rule = IgnoreRule.from_pattern(pattern, base="")
+    assert rule.matches(path, is_dir) is expected
+
+
+def test_ignore_rule_base():
+    rule = IgnoreRule.from_pattern("b.py", base="/repo/a/")
+    assert rule.matches("/repo/a/b.py", False)
+    assert not rule.matches("/repo/b.py", False)
+
+
+def test_is_ignored_last_match_wins():
+    rules = [
+        IgnoreRule.from_pattern("*.py", base=""),
+        IgnoreRule.from_pattern("!keep.py", base=""),
+        IgnoreRule.from_pattern("keep.py", base=""),
+    ]
+    assert is_ignored("keep.py", False, rules)
+    assert is_ignored("other.py", False, rules)
+    assert not is_ignored("other.txt", False, rules)
+
+
+def git(cwd: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    git(tmp_path, "init", "--quiet")
+    make_files(tmp_path, "app/models.py", "app/views.py", "app/old.py", "README.rst")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "--quiet", "-m", "Initial")
+    git(tmp_path, "branch", "base")
+    return tmp_path
+
+
+def test_git_changed_filenames(git_repo):
+    (git_repo / "app" / "views.py").write_text("x = 1\n")
+    (git_repo / "app" / "README.rst").write_text("Hi\n")
+    make_files(git_repo, "app/migrations/0001_initial.py", "app/new.py")
+    (git_repo / "app" / "old.py").unlink()
+    git(git_repo, "add", "app")
+    git(git_repo, "commit", "--quiet", "-m", "Change")
+    (git_repo / "app" / "models.py").write_text("x = 1\n")
+
+    with chdir(git_repo):
+        result = git_changed_filenames("base", exclude=["migrations/"])
+
+    assert [name.replace(os.sep, "/") for name in result] == [
+        "app/models.py",
+        "app/new.py",
+        "app/views.py",
+    ]
+
+
+def test_git_changed_filenames_subdirectory(git_repo):
+    (git_repo / "app" / "models.py").write_text("x = 1\n")
+
+    with chdir(git_repo / "app"):
+        result = git_changed_filenames("base")
+
+    assert result == ["models.py"]
+
+
+def test_git_changed_filenames_bad_ref(git_repo):
+    with chdir(git_repo), pytest.raises(SystemExit) as excinfo:
+        git_changed_filenames("nonexistent")
+
+    assert str(excinfo.value).startswith(
+        "django-upgrade: could not find changes since 'nonexistent': "
+    )
+
+
+def test_git_changed_filenames_no_git(git_repo):
+    with (
+        mock.patch.object(subprocess, "run", side_effect=FileNotFoundError),
+        pytest.raises(SystemExit) as excinfo,
+    ):
+        git_changed_filenames("base")
+
+    assert str(excinfo.value) == "django-upgrade: git is required to use --since"
@@ -1,23 +1,51 @@
 from __future__ import annotations
 
+import ast
 import io
+import json
+import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from textwrap import dedent
 from unittest import mock
 
 import pytest
-from tokenize_rt import UNIMPORTANT_WS, src_to_tokens
+from tokenize_rt import UNIMPORTANT_WS, Offset, Token, src_to_tokens, tokens_to_src
 
 from django_upgrade import __main__  # noqa: F401
+from django_upgrade import main as main_module
+from django_upgrade.cache import Cache
+from django_upgrade.data import Settings, TokenFunc
 from django_upgrade.main import (
+    Region,
+    _file_size,
+    _fix_file_in_worker,
+    _init_worker,
+    apply_callbacks,
+    apply_fixers,
+    find_regions,
+    fix_file,
+    fix_files_parallel,
     fixup_dedent_tokens,
     get_target_version,
     load_pyproject,
     main,
+    resolve_callbacks,
+)
+from django_upgrade.stats import FileStats, FixerStats, Stats, _wrap_token_func
+from django_upgrade.tokens import (
+    CODE,
+    DEDENT,
+    LOGICAL_NEWLINE,
+    Edit,
+    find,
+    insert,
+    plans_edits,
+    replace_edits,
 )
-from django_upgrade.tokens import DEDENT
 from tests.compat import chdir
 
 
@@ -41,6 +69,16 @@ def test_main_help():
     assert excinfo.value.code == 0
 
 
+def test_main_sys_argv(capsys):
+    with (
+        mock.patch.object(sys, "argv", ["django-upgrade", "--version"]),
+        pytest.raises(SystemExit) as excinfo,
+    ):
+        main()
+
+    assert excinfo.value.code == 0
+
+
 def test_main_help_subprocess():
     proc = subprocess.run(
         [sys.executable, "-m", "django_upgrade", "--help"],
@@ -83,6 +121,37 @@ def test_main_non_utf8_bytes(tmp_path, capsys):
     assert err == f"{path} is non-utf-8 (not supported)\n"
 
 
+def test_main_non_ascii(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text(
+        "# café\nfrom django.core.paginator import QuerySetPaginator\n",
+        encoding="utf-8",
+    )
+
+    result = main(["--diff", str(path)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == (
+        f"--- a/{path}\n"
+        + f"+++ b/{path}\n"
+        + "@@ -1,2 +1,2 @@\n"
+        + " # café\n"
+        + "-from django.core.paginator import QuerySetPaginator\n"
+        + "+from django.core.paginator import Paginator\n"
+    )
+
+
+def test_main_non_ascii_no_changes(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.db import models\n# café\n", encoding="utf-8")
+
+    result = main([str(path), "--no-cache"])
+
+    assert result == 0
+    assert capsys.readouterr() == ("", "")
+
+
 def test_main_file(tmp_path, capsys):
     path = tmp_path / "example.py"
     path.write_text("from django.core.paginator import QuerySetPaginator\n")
@@ -95,6 +164,59 @@ def test_main_file(tmp_path, capsys):
     assert path.read_text() == "from django.core.paginator import Paginator\n"
 
 
+def test_main_file_no_triggers(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("x = 1\n")
+
+    with mock.patch.object(main_module, "_apply_fixers") as mock_apply_fixers:
+        result = main([str(path), "--no-cache"])
+
+    assert result == 0
+    assert mock_apply_fixers.call_count == 0
+    assert capsys.readouterr() == ("", "")
+    assert path.read_text() == "x = 1\n"
+
+
+def test_main_file_no_fixers_for_filename(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("USE_L10N = True\n")
+
+    with mock.patch.object(main_module, "_apply_fixers") as mock_apply_fixers:
+        result = main([str(path), "--only", "use_l10n", "--no-cache"])
+
+    assert result == 0
+    assert mock_apply_fixers.call_count == 0
+    assert path.read_text() == "USE_L10N = True\n"
+
+
+def test_main_stdin_no_triggers(capsys):
+    stdin = io.TextIOWrapper(io.BytesIO(b"x = 1\n"), "UTF-8")
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["-"])
+
+    assert result == 0
+    assert capsys.readouterr() == ("x = 1\n", "")
+
+
+def test_apply_fixers_no_triggers():
+    with mock.patch.object(main_module, "_apply_fixers_once") as mock_once:
+        result = apply_fixers("x = 1\n", Settings(target_version=(4, 0)), "a.py")
+
+    assert result == "x = 1\n"
+    assert mock_once.call_count == 0
+
+
+def test_apply_fixers_no_fixers_for_filename():
+    settings = Settings(target_version=(4, 0), only_fixers={"use_l10n"})
+
+    with mock.patch.object(main_module, "_apply_fixers_once") as mock_once:
+        result = apply_fixers("USE_L10N = True\n", settings, "example.py")
+
+    assert result == "USE_L10N = True\n"
+    assert mock_once.call_count == 0
+
+
 def test_main_check(tmp_path, capsys):
     initial_contents = "from django.core.paginator import QuerySetPaginator\n"
     path = tmp_path / "example.py"
@@ -123,6 +245,202 @@ def test_main_check_stdin(capsys):
     assert err == "Would rewrite stdin\n"
 
 
+def test_main_diff(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    result = main(["--diff", str(path)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == (
+        f"--- a/{path}\n"
+        + f"+++ b/{path}\n"
+        + "@@ -1 +1 @@\n"
+        + "-from django.core.paginator import QuerySetPaginator\n"
+        + "+from django.core.paginator import Paginator\n"
+    )
+    assert err == ""
+    assert path.read_text() == "from django.core.paginator import QuerySetPaginator\n"
+
+
+def test_main_diff_exit_zero_even_if_changed(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    result = main(["--diff", "--exit-zero-even-if-changed", str(path)])
+
+    assert result == 0
+    out, err = capsys.readouterr()
+    assert out.startswith(f"--- a/{path}\n")
+
+
+def test_main_diff_stdin(capsys):
+    stdin = io.TextIOWrapper(
+        io.BytesIO(
+            b"from django.core.paginator import QuerySetPaginator\n" + b"x = 1\n"
+        ),
+        "UTF-8",
+    )
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["--diff", "-"])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == (
+        "--- a/stdin\n"
+        + "+++ b/stdin\n"
+        + "@@ -1,2 +1,2 @@\n"
+        + "-from django.core.paginator import QuerySetPaginator\n"
+        + "+from django.core.paginator import Paginator\n"
+        + " x = 1\n"
+    )
+
+
+def test_main_diff_stdin_no_changes(capsys):
+    stdin = io.TextIOWrapper(io.BytesIO(b"x = 1\n"), "UTF-8")
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["--diff", "-"])
+
+    assert result == 0
+    assert capsys.readouterr() == ("", "")
+
+
+def test_main_profile(tmp_path, capsys):
+    paths = [tmp_path / f"example{i}.py" for i in range(3)]
+    paths[0].write_text("from django.core.paginator import QuerySetPaginator\n")
+    paths[1].write_text("x = 1\n")
+    paths[2].write_text("x = (\n")
+    output = tmp_path / "profile.json"
+
+    result = main(
+        [
+            "--profile",
+            "--profile-output",
+            str(output),
+            "--jobs",
+            "1",
+            *(str(p) for p in paths),
+        ]
+    )
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err.startswith(f"Rewriting {paths[0]}\nPhase ")
+    assert re.search(r"^queryset_paginator +[0-9.]+ +[0-9.]+ +1 +1$", err, re.M)
+    assert re.search(r"^Slowest files", err, re.M)
+    for path in paths:
+        assert str(path) in err
+
+    profile = json.loads(output.read_text())
+    frame_names = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert {"parse", "callbacks", "queryset_paginator", str(paths[0])} <= frame_names
+    assert len(profile["profiles"][0]["samples"]) == len(
+        profile["profiles"][0]["weights"]
+    )
+
+
+def test_main_profile_output_only(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("x = 1\n")
+    output = tmp_path / "profile.json"
+
+    result = main(["--profile-output", str(output), str(path)])
+
+    assert result == 0
+    assert capsys.readouterr() == ("", "")
+    assert json.loads(output.read_text())["profiles"][0]["name"] == "django-upgrade"
+
+
+@pytest.fixture
+def parallel_few_files():
+    # Start workers for the few files these tests use.
+    with mock.patch.object(main_module, "PARALLEL_MIN_FILES", 2):
+        yield
+
+
+def test_main_report(tmp_path, capsys, parallel_few_files):
+    paths = [tmp_path / f"example{i}.py" for i in range(3)]
+    paths[0].write_text("from django.core.paginator import QuerySetPaginator\n")
+    paths[1].write_text("x = 1\n")
+    paths[2].write_text("from django.core.paginator import QuerySetPaginator\n")
+    report_path = tmp_path / "report.json"
+
+    result = main(
+        ["--report", str(report_path), "--jobs", "2", *(str(p) for p in paths)]
+    )
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert "Phase" not in err
+    report = json.loads(report_path.read_text())
+    assert set(report["durations"]) == {
+        "read",
+        "parse",
+        "visit",
+        "tokenize",
+        "fixup_dedent",
+        "callbacks",
+        "tokens_to_src",
+        "write",
+    }
+    fixer_report = report["fixers"]["queryset_paginator"]
+    assert fixer_report["candidates"] == 2
+    assert fixer_report["rewrites"] == 2
+    assert fixer_report["noop_ratio"] == 0.0
+    assert fixer_report["time"] >= 0
+    files = report["files"]
+    assert [file["filename"] for file in files] == [str(p) for p in paths]
+    assert files[0]["bytes"] == 52
+    assert files[0]["tokens"] == 13
+    assert files[0]["callbacks"] == 1
+    assert files[0]["rewrites"] == 1
+    assert files[1]["tokens"] is None
+    assert files[1]["callbacks"] == 0
+
+
+def test_main_report_overlapping_planners(tmp_path, capsys):
+    # Erasing the decorator overlaps the pending rename within it, so the
+    # decorator's planner runs twice.
+    path = tmp_path / "tests.py"
+    path.write_text(
+        "import unittest\n"
+        + "import django\n"
+        + "from django.utils.translation import ugettext\n"
+        + "\n"
+        + "class ExampleTests(unittest.TestCase):\n"
+        + '    @unittest.skipIf(django.VERSION < (4, 1), ugettext("Old"))\n'
+        + "    def test_example(self):\n"
+        + "        pass\n"
+    )
+    report_path = tmp_path / "report.json"
+
+    result = main(["--target-version", "4.1", "--report", str(report_path), str(path)])
+
+    assert result == 1
+    report = json.loads(report_path.read_text())
+    fixer_report = report["fixers"]["versioned_test_skip_decorators"]
+    assert fixer_report["candidates"] == 1
+    assert fixer_report["rewrites"] == 1
+    assert fixer_report["noop_ratio"] == 0.0
+    assert report["fixers"]["utils_translation"]["rewrites"] == 2
+
+
+def test_main_profile_jobs(tmp_path, capsys, parallel_few_files):
+    paths = [tmp_path / f"example{i}.py" for i in range(3)]
+    for path in paths:
+        path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    result = main(["--profile", "--jobs", "2", *(str(p) for p in paths)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert re.search(r"^queryset_paginator +[0-9.]+ +[0-9.]+ +3 +3$", err, re.M)
+
+
 def test_main_exit_zero_even_if_changed(tmp_path, capsys):
     path = tmp_path / "example.py"
     path.write_text("from django.core.paginator import QuerySetPaginator\n")
@@ -147,6 +465,16 @@ def test_main_stdin_no_changes(capsys):
     assert err == ""
 
 
+def test_main_stdin_non_ascii_no_changes(capsys):
+    stdin = io.TextIOWrapper(io.BytesIO("print('café')\n".encode()), "UTF-8")
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["-"])
+
+    assert result == 0
+    assert capsys.readouterr() == ("print('café')\n", "")
+
+
 def test_main_stdin_with_changes(capsys):
     input_ = "from django.core.paginator import QuerySetPaginator\n"
     stdin = io.TextIOWrapper(io.BytesIO(input_.encode()), "UTF-8")
@@ -267,6 +595,326 @@ def test_fixup_dedent_tokens():
     assert tokens[15].name == UNIMPORTANT_WS
 
 
+def test_resolve_callbacks():
+    tokens = src_to_tokens("x = 1\ny = 2\n")
+    x_callback = mock.Mock()
+    y_callback = mock.Mock()
+    y2_callback = mock.Mock()
+    missing_callback = mock.Mock()
+
+    resolved = resolve_callbacks(
+        tokens,
+        {
+            Offset(1, 0): [x_callback],
+            Offset(2, 0): [y_callback, y2_callback],
+            Offset(1, 7): [missing_callback],
+        },
+    )
+
+    assert resolved == [(6, [y_callback, y2_callback]), (0, [x_callback])]
+
+
+def test_resolve_callbacks_after_dedent():
+    tokens = src_to_tokens(
+        dedent(
+            """\
+            class A:
+                def f(self):
+                    ...
+
+                x = 1
+            """
+        )
+    )
+    fixup_dedent_tokens(tokens)
+    callback = mock.Mock()
+
+    resolved = resolve_callbacks(tokens, {Offset(5, 4): [callback]})
+
+    assert len(resolved) == 1
+    i, callbacks = resolved[0]
+    assert tokens[i].name == "NAME"
+    assert tokens[i].src == "x"
+    assert callbacks == [callback]
+
+
+def test_apply_callbacks_batches_edits():
+    tokens = src_to_tokens("x = 1\ny = 2\n")
+
+    apply_callbacks(
+        tokens,
+        {
+            Offset(1, 0): [partial(replace_edits, src="a")],
+            Offset(2, 0): [partial(replace_edits, src="b")],
+        },
+    )
+
+    assert tokens_to_src(tokens) == "a = 1\nb = 2\n"
+
+
+def test_apply_callbacks_mutating_after_edits():
+    tokens = src_to_tokens("x = 1\ny = 2\n")
+
+    apply_callbacks(
+        tokens,
+        {
+            Offset(1, 0): [partial(insert, new_src="z = 0\n")],
+            Offset(2, 0): [partial(replace_edits, src="b")],
+        },
+    )
+
+    assert tokens_to_src(tokens) == "z = 0\nx = 1\nb = 2\n"
+
+
+@plans_edits
+def upper_line(tokens: list[Token], i: int) -> list[Edit]:
+    j = find(tokens, i, name=LOGICAL_NEWLINE)
+    return [Edit(i, j, [Token(CODE, tokens_to_src(tokens[i:j]).upper())])]
+
+
+def test_apply_callbacks_overlapping_edits():
+    tokens = src_to_tokens("x = 1\ny = 2\n")
+
+    apply_callbacks(
+        tokens,
+        {
+            Offset(1, 0): [upper_line],
+            Offset(1, 4): [partial(replace_edits, src="a")],
+            Offset(2, 0): [partial(replace_edits, src="b")],
+        },
+    )
+
+    assert tokens_to_src(tokens) == "X = A\nb = 2\n"
+
+
+@plans_edits
+def prefix(tokens: list[Token], i: int, *, src: str) -> list[Edit]:
+    return [Edit(i, i, [Token(CODE, src)])]
+
+
+def test_apply_callbacks_insertions_at_same_index():
+    tokens = src_to_tokens("x = 1\n")
+
+    apply_callbacks(
+        tokens,
+        {Offset(1, 0): [partial(prefix, src="a"), partial(prefix, src="b")]},
+    )
+
+    assert tokens_to_src(tokens) == "bax = 1\n"
+
+
+NULL_BOOLEAN_FIELD = (
+    "from django.db.models import NullBooleanField\n"
+    + 'field = NullBooleanField(verbose_name="My Field", validators=[])\n'
+)
+
+
+def test_apply_fixers_single_round():
+    result = apply_fixers(
+        NULL_BOOLEAN_FIELD, Settings(target_version=(3, 1)), "models/blog.py"
+    )
+
+    assert result.endswith(
+        'BooleanField(verbose_name="My Field", validators=[], null=True)\n'
+    )
+
+
+def test_apply_fixers_max_rounds():
+    result = apply_fixers(
+        NULL_BOOLEAN_FIELD,
+        Settings(target_version=(3, 1)),
+        "models/blog.py",
+        max_rounds=10,
+    )
+
+    # The reorder_model_field_kwargs fixer acts on the keyword argument
+    # added by the null_boolean_field fixer
+    assert result.endswith(
+        'BooleanField(verbose_name="My Field", null=True, validators=[])\n'
+    )
+
+
+def test_apply_fixers_max_rounds_cap():
+    with mock.patch.object(
+        main_module, "_apply_fixers_once", side_effect=lambda text, *args: text + "#"
+    ) as mock_once:
+        result = apply_fixers(
+            "VERSION", Settings(target_version=(3, 1)), "a.py", max_rounds=3
+        )
+
+    assert result == "VERSION###"
+    assert mock_once.call_count == 3
+
+
+def test_apply_fixers_syntax_error():
+    source = "from django.core.paginator import QuerySetPaginator\nx = (\n"
+
+    result = apply_fixers(source, Settings(target_version=(3, 1)), "a.py")
+
+    assert result == source
+
+
+def test_apply_fixers_syntax_error_later_round():
+    def fix_once(text, *args):
+        if text.endswith("#"):
+            raise SyntaxError
+        return text + "#"
+
+    with mock.patch.object(main_module, "_apply_fixers_once", side_effect=fix_once):
+        result = apply_fixers(
+            "VERSION", Settings(target_version=(3, 1)), "a.py", max_rounds=3
+        )
+
+    assert result == "VERSION#"
+
+
+def test_apply_fixers_regions():
+    source = dedent(
+        """\
+        from django.core.paginator import QuerySetPaginator
+
+        def f():
+            return 1
+        # comment
+
+        x = QuerySetPaginator
+        """
+    )
+
+    result = apply_fixers(source, Settings(target_version=(4, 0)), "a.py")
+
+    assert result == source.replace("QuerySetPaginator", "Paginator")
+
+
+def test_apply_fixers_regions_crlf():
+    source = "x = 1\r\nfrom django.core.paginator import QuerySetPaginator\r\n"
+
+    result = apply_fixers(source, Settings(target_version=(4, 0)), "a.py")
+
+    assert result == "x = 1\r\nfrom django.core.paginator import Paginator\r\n"
+
+
+def test_apply_fixers_regions_lone_cr():
+    source = "from django.core.paginator import QuerySetPaginator\rx = 1\n"
+
+    with mock.patch.object(main_module, "find_regions") as mock_find_regions:
+        mock_find_regions.return_value = []
+        result = apply_fixers(source, Settings(target_version=(4, 0)), "a.py")
+
+    assert result == "from django.core.paginator import Paginator\rx = 1\n"
+
+
+REGIONS_SOURCE = dedent(
+    """\
+    import a
+
+    # b
+    @dec
+    def b():
+        pass
+    c = 1; d = 2
+    e = 3
+    # trailing
+    """
+)
+
+
+def regions_for(
+    offsets: list[Offset], callback: TokenFunc = mock.sentinel.callback
+) -> list[Region] | None:
+    module = ast.parse(REGIONS_SOURCE)
+    return find_regions(module, {offset: [callback] for offset in offsets})
+
+
+def test_find_regions_none():
+    assert regions_for([]) == []
+
+
+def test_find_regions_first():
+    assert regions_for([Offset(1, 0)]) == [
+        (1, 3, {Offset(1, 0): [mock.sentinel.callback]})
+    ]
+
+
+def test_find_regions_decorated():
+    assert regions_for([Offset(5, 0)]) == [
+        (2, 6, {Offset(5, 0): [mock.sentinel.callback]})
+    ]
+
+
+def test_find_regions_shared_line():
+    assert regions_for([Offset(7, 7)]) == [
+        (7, 7, {Offset(7, 7): [mock.sentinel.callback]})
+    ]
+
+
+def test_find_regions_last():
+    assert regions_for([Offset(8, 0)]) == [
+        (8, None, {Offset(8, 0): [mock.sentinel.callback]})
+    ]
+
+
+def test_find_regions_separate():
+    assert regions_for([Offset(8, 0), Offset(1, 0)]) == [
+        (1, 3, {Offset(1, 0): [mock.sentinel.callback]}),
+        (8, None, {Offset(8, 0): [mock.sentinel.callback]}),
+    ]
+
+
+def test_find_regions_merged():
+    assert regions_for([Offset(7, 0), Offset(5, 0)]) == [
+        (
+            2,
+            7,
+            {
+                Offset(5, 0): [mock.sentinel.callback],
+                Offset(7, 0): [mock.sentinel.callback],
+            },
+        ),
+    ]
+
+
+def test_find_regions_callback_nodes():
+    node = ast.parse(REGIONS_SOURCE).body[-1]
+    callback = partial(partial(mock.Mock(), node=node), [node])
+
+    assert regions_for([Offset(1, 0)], callback) == [
+        (1, None, {Offset(1, 0): [callback]})
+    ]
+
+
+def test_find_regions_outside_statements():
+    assert regions_for([Offset(9, 0)]) is None
+
+
+def test_find_regions_callback_nodes_stats_planner():
+    @plans_edits
+    def planner(tokens: list[Token], i: int, *, node: ast.AST) -> list[Edit]:
+        return []
+
+    node = ast.parse(REGIONS_SOURCE).body[-1]
+    callback = _wrap_token_func(FixerStats(), partial(planner, node=node))
+
+    assert regions_for([Offset(1, 0)], callback) == [
+        (1, None, {Offset(1, 0): [callback]})
+    ]
+
+
+def test_main_until_stable(tmp_path, capsys):
+    path = tmp_path / "models" / "blog.py"
+    path.parent.mkdir()
+    path.write_text(NULL_BOOLEAN_FIELD)
+
+    result = main(["--target-version", "3.1", "--until-stable", str(path)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert err == f"Rewriting {path}\n"
+    assert path.read_text().endswith(
+        'BooleanField(verbose_name="My Field", null=True, validators=[])\n'
+    )
+
+
 def test_main_only(tmp_path, capsys):
     """
     Main with --only runs that fixer only.
@@ -414,3 +1062,403 @@ def test_main_list_fixers_filename(tmp_path, capsys):
     assert excinfo.value.code == 0
     # No change
     assert path.read_text() == source
+
+
+def test_main_jobs(tmp_path, capsys, parallel_few_files):
+    paths = [tmp_path / f"example{i}.py" for i in range(5)]
+    for i, path in enumerate(paths):
+        if i % 2:
+            path.write_text("x = 1\n" * i)
+        else:
+            # Later files are bigger so get scheduled first
+            path.write_text(
+                "from django.core.paginator import QuerySetPaginator\n"
+                + "x = 1\n" * (i * 100)
+            )
+
+    result = main(["--jobs", "2", *(str(p) for p in paths)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == "".join(f"Rewriting {p}\n" for p in paths[::2])
+    for path in paths[::2]:
+        assert path.read_text().startswith(
+            "from django.core.paginator import Paginator\n"
+        )
+
+
+def test_main_files_from(tmp_path, capsys):
+    paths = [tmp_path / f"example{i}.py" for i in range(2)]
+    for path in paths:
+        path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "models.py").write_text("x = 1\n")
+    stdin = io.TextIOWrapper(
+        io.BytesIO(f"{paths[1]}\0{tmp_path / 'app'}\0".encode()), "UTF-8"
+    )
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["--files-from", "-", "-0", "--jobs", "1", str(paths[0])])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == "".join(f"Rewriting {p}\n" for p in paths)
+
+
+def test_main_files_from_stdin_twice(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--files-from", "-", "-"])
+
+    assert excinfo.value.code == 2
+    out, err = capsys.readouterr()
+    assert "error: cannot read both filenames and a file from stdin\n" in err
+
+
+def stdin_batch(*records: dict[str, object] | bytes) -> io.TextIOWrapper:
+    data = b"".join(
+        (record if isinstance(record, bytes) else json.dumps(record).encode()) + b"\n"
+        for record in records
+    )
+    return io.TextIOWrapper(io.BytesIO(data), "UTF-8")
+
+
+def test_main_stdin_batch(capsys):
+    stdin = stdin_batch(
+        {
+            "filename": "example.py",
+            "contents": "from django.core.paginator import QuerySetPaginator\n",
+        },
+        b"",
+        {"filename": "app/settings.py", "contents": "USE_L10N = True\n"},
+        {"filename": "other.py", "contents": "x = 1\n"},
+    )
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["--stdin-batch", "--target-version", "4.0"])
+
+    assert result == 0
+    out, err = capsys.readouterr()
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {
+            "filename": "example.py",
+            "changed": True,
+            "contents": "from django.core.paginator import Paginator\n",
+        },
+        {"filename": "app/settings.py", "changed": True, "contents": ""},
+        {"filename": "other.py", "changed": False, "contents": "x = 1\n"},
+    ]
+    assert err == ""
+
+
+@pytest.mark.parametrize(
+    "record,message",
+    [
+        (b"{", "JSONDecodeError: "),
+        (b'{"filename": "example.py"}', "KeyError: 'contents'"),
+        (
+            b'{"filename": "example.py", "contents": 1}',
+            "TypeError: filename and contents must be strings",
+        ),
+    ],
+)
+def test_main_stdin_batch_invalid(capsys, record, message):
+    stdin = stdin_batch({"filename": "example.py", "contents": ""}, record)
+
+    with mock.patch.object(sys, "stdin", stdin), pytest.raises(SystemExit) as excinfo:
+        main(["--stdin-batch"])
+
+    assert str(excinfo.value).startswith(
+        f"django-upgrade: invalid --stdin-batch record on line 2: {message}"
+    )
+    out, err = capsys.readouterr()
+    assert json.loads(out) == {
+        "filename": "example.py",
+        "changed": False,
+        "contents": "",
+    }
+
+
+def test_main_stdin_batch_with_filenames(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--stdin-batch", "example.py"])
+
+    assert excinfo.value.code == 2
+    out, err = capsys.readouterr()
+    assert (
+        "error: --stdin-batch cannot be combined with filenames, --since,"
+        + " or --files-from\n"
+    ) in err
+
+
+def test_main_jobs_single_file(tmp_path, capsys):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    with mock.patch.object(ProcessPoolExecutor, "__init__") as mock_init:
+        result = main(["--jobs", "2", str(path)])
+
+    assert result == 1
+    mock_init.assert_not_called()
+    out, err = capsys.readouterr()
+    assert err == f"Rewriting {path}\n"
+
+
+def test_fix_files_parallel_stats(tmp_path, capsys):
+    paths = [tmp_path / f"example{i}.py" for i in range(2)]
+    for path in paths:
+        path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    stats = Stats()
+    stats.files.append(FileStats("earlier.py"))
+    fix = partial(
+        fix_file,
+        settings=Settings(target_version=(4, 2)),
+        exit_zero_even_if_changed=False,
+        check=True,
+        stats=stats,
+    )
+
+    result = fix_files_parallel([str(p) for p in paths], fix, jobs=2, stats=stats)
+
+    assert result == 1
+    assert [file_stats.filename for file_stats in stats.files] == [
+        "earlier.py",
+        *(str(p) for p in paths),
+    ]
+
+
+def test_main_jobs_few_files(tmp_path, capsys):
+    paths = [tmp_path / f"example{i}.py" for i in range(3)]
+    for path in paths:
+        path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    with mock.patch.object(ProcessPoolExecutor, "__init__") as mock_init:
+        result = main(["--jobs", "2", *(str(p) for p in paths)])
+
+    assert result == 1
+    mock_init.assert_not_called()
+    out, err = capsys.readouterr()
+    assert err == "".join(f"Rewriting {p}\n" for p in paths)
+
+
+def test_main_jobs_serial(tmp_path, capsys):
+    paths = [tmp_path / f"example{i}.py" for i in range(2)]
+    for path in paths:
+        path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    result = main(["--jobs", "1", *(str(p) for p in paths)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == "".join(f"Rewriting {p}\n" for p in paths)
+
+
+def test_main_jobs_check(tmp_path, capsys, parallel_few_files):
+    paths = [tmp_path / f"example{i}.py" for i in range(3)]
+    for path in paths:
+        path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    result = main(["--jobs", "3", "--check", *(str(p) for p in paths)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == "".join(f"Would rewrite {p}\n" for p in paths)
+
+
+def test_main_jobs_stdin(tmp_path, capsys, parallel_few_files):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    input_ = "from django.core.paginator import QuerySetPaginator\n"
+    stdin = io.TextIOWrapper(io.BytesIO(input_.encode()), "UTF-8")
+
+    with mock.patch.object(sys, "stdin", stdin):
+        result = main(["--jobs", "2", "-", str(path)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == "from django.core.paginator import Paginator\n"
+    assert err == f"Rewriting {path}\n"
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1", "many"])
+def test_main_jobs_invalid(capsys, jobs):
+    with pytest.raises(SystemExit) as excinfo:
+        main([f"--jobs={jobs}", "example.py"])
+
+    assert excinfo.value.code == 2
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert f"error: argument --jobs: Invalid job count: {jobs!r}\n" in err
+
+
+def test_fix_file_in_worker(tmp_path):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    _init_worker(
+        partial(
+            fix_file,
+            settings=Settings(target_version=(4, 2)),
+            exit_zero_even_if_changed=False,
+            check=True,
+        )
+    )
+
+    result = _fix_file_in_worker(str(path))
+
+    assert result == (1, "", f"Would rewrite {path}\n", [])
+
+
+def test_fix_file_in_worker_stats(tmp_path):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    stats = Stats()
+    _init_worker(
+        partial(
+            fix_file,
+            settings=Settings(target_version=(4, 2)),
+            exit_zero_even_if_changed=False,
+            check=True,
+            stats=stats,
+        ),
+        stats,
+    )
+
+    result = _fix_file_in_worker(str(path))
+
+    assert [file_stats.filename for file_stats in result[3]] == [str(path)]
+    assert stats.files == []
+
+
+def test_file_size_missing(tmp_path):
+    assert _file_size(str(tmp_path / "missing.py")) == 0
+
+
+def test_main_directory_named_daemon(tmp_path, capsys):
+    path = tmp_path / "daemon" / "example.py"
+    path.parent.mkdir()
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    with chdir(tmp_path):
+        result = main(["daemon"])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert err == f"Rewriting {os.path.join('daemon', 'example.py')}\n"
+    assert path.read_text() == "from django.core.paginator import Paginator\n"
+
+
+def test_main_directory(tmp_path, capsys):
+    (tmp_path / "app").mkdir()
+    path = tmp_path / "app" / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+    (tmp_path / "app" / "excluded.py").write_text(
+        "from django.core.paginator import QuerySetPaginator\n"
+    )
+
+    result = main(["--exclude", "excluded.py", str(tmp_path)])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == f"Rewriting {path}\n"
+    assert path.read_text() == "from django.core.paginator import Paginator\n"
+
+
+def test_main_cache(tmp_path, capsys, cache_dir):
+    path = tmp_path / "example.py"
+    path.write_text("x = 1\n")
+    old = path.stat().st_mtime - 60
+    os.utime(path, (old, old))
+
+    assert main([str(path)]) == 0
+    # Entries for the file's stat and contents
+    assert sum(len(os.listdir(d)) for d in cache_dir.iterdir() if d.is_dir()) == 2
+
+    # Found by stat, so not read
+    with mock.patch.object(Cache, "contents_key", side_effect=AssertionError):
+        assert main([str(path)]) == 0
+
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == ""
+
+
+def test_main_cache_contents(tmp_path, capsys, cache_dir):
+    path = tmp_path / "example.py"
+    path.write_text("x = 1\n")
+
+    assert main([str(path)]) == 0
+    assert main([str(path)]) == 0
+    # Recently modified, so only cached by contents
+    assert sum(len(os.listdir(d)) for d in cache_dir.iterdir() if d.is_dir()) == 1
+
+    old = path.stat().st_mtime - 60
+    os.utime(path, (old, old))
+    assert main([str(path)]) == 0
+    assert sum(len(os.listdir(d)) for d in cache_dir.iterdir() if d.is_dir()) == 2
+
+
+def test_main_cache_syntax_error(tmp_path, capsys, cache_dir):
+    # Might parse on a newer Python, which shares the cache.
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\nx = (\n")
+    old = path.stat().st_mtime - 60
+    os.utime(path, (old, old))
+
+    assert main([str(path)]) == 0
+
+    assert list(cache_dir.glob("*/*")) == []
+
+
+def test_main_cache_changed_file(tmp_path, capsys, cache_dir):
+    path = tmp_path / "example.py"
+    path.write_text("from django.core.paginator import QuerySetPaginator\n")
+
+    assert main(["--check", str(path)]) == 1
+    assert main(["--check", str(path)]) == 1
+
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == f"Would rewrite {path}\n" * 2
+    assert not cache_dir.exists()
+
+
+def test_main_no_cache(tmp_path, capsys, cache_dir):
+    path = tmp_path / "example.py"
+    path.write_text("x = 1\n")
+
+    assert main(["--no-cache", str(path)]) == 0
+
+    assert not cache_dir.exists()
+
+
+def test_main_since(tmp_path, capsys):
+    def git(*args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+            cwd=tmp_path,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "--quiet")
+    (tmp_path / "unchanged.py").write_text(
+        "from django.core.paginator import QuerySetPaginator\n"
+    )
+    git("add", ".")
+    git("commit", "--quiet", "-m", "Initial")
+    (tmp_path / "changed.py").write_text(
+        "from django.core.paginator import QuerySetPaginator\n"
+    )
+    git("add", ".")
+
+    with chdir(tmp_path):
+        result = main(["--since", "HEAD"])
+
+    assert result == 1
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert err == "Rewriting changed.py\n"
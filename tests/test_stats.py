@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import ast
+from collections import defaultdict
+
+from tokenize_rt import Offset, Token
+
+from django_upgrade.data import ASTFunc, Parents, Settings, State, TokenFunc
+from django_upgrade.stats import FileStats, Stats, null_timer
+from django_upgrade.tokens import Edit, TokenList, is_edit_planner, plans_edits
+
+settings = Settings(target_version=(4, 0))
+
+
+def visit_example(
+    file_stats: FileStats, ast_func: ASTFunc[ast.Module]
+) -> list[tuple[Offset, TokenFunc]]:
+    """
+    Run ast_func, wrapped by file_stats, on an empty module.
+    """
+    wrapped = file_stats.wrap_ast_func("example", ast_func)
+    state = State(settings, "example.py", defaultdict(set))
+    return list(wrapped(state, ast.parse(""), Parents(None)))
+
+
+def test_null_timer():
+    with null_timer("parse"):
+        pass
+
+
+def test_timer():
+    file_stats = FileStats("example.py")
+
+    with file_stats.timer("parse"):
+        pass
+
+    assert file_stats.phases["parse"] > 0
+    assert file_stats.total_time == file_stats.phases["parse"]
+
+
+def test_wrap_ast_func_counts_rewrites():
+    def noop(tokens, i):
+        pass
+
+    def replace(tokens, i):
+        tokens[i] = tokens[i]._replace(src="y")
+
+    def ast_func(state, node, parents):
+        yield Offset(1, 0), noop
+        yield Offset(1, 0), replace
+
+    for tokens in (
+        [Token("NAME", "x", line=1, utf8_byte_offset=0)],
+        TokenList([Token("NAME", "x", line=1, utf8_byte_offset=0)]),
+    ):
+        file_stats = FileStats("example.py")
+
+        for _, callback in visit_example(file_stats, ast_func):
+            callback(tokens, 0)
+
+        assert tokens[0].src == "y"
+        fixer_stats = file_stats.fixers["example"]
+        assert fixer_stats.candidates == 2
+        assert fixer_stats.rewrites == 1
+
+
+def test_wrap_ast_func_counts_planned_rewrites():
+    @plans_edits
+    def noop(tokens, i):
+        return []
+
+    @plans_edits
+    def replace(tokens, i):
+        return [Edit(i, i + 1, [tokens[i]._replace(src="y")])]
+
+    def ast_func(state, node, parents):
+        yield Offset(1, 0), noop
+        yield Offset(1, 0), replace
+
+    file_stats = FileStats("example.py")
+
+    callbacks = visit_example(file_stats, ast_func)
+    tokens = [Token("NAME", "x", line=1, utf8_byte_offset=0)]
+    edits = [edit for _, callback in callbacks for edit in callback(tokens, 0) or []]
+
+    assert all(is_edit_planner(callback) for _, callback in callbacks)
+    assert edits == [Edit(0, 1, [tokens[0]._replace(src="y")])]
+    fixer_stats = file_stats.fixers["example"]
+    assert fixer_stats.candidates == 2
+    assert fixer_stats.rewrites == 1
+
+
+def test_fixer_totals():
+    def noop(tokens, i):
+        pass
+
+    stats = Stats()
+    for filename in ("a.py", "b.py"):
+        file_stats = FileStats(filename)
+        visit_example(file_stats, lambda state, node, parents: [(Offset(1, 0), noop)])
+        stats.files.append(file_stats)
+
+    assert stats.fixer_totals()["example"].candidates == 2
+
+
+def test_as_json():
+    stats = Stats()
+    file_stats = FileStats("example.py")
+    file_stats.size = 6
+    visit_example(file_stats, lambda state, node, parents: [])
+    stats.files.append(file_stats)
+
+    report = stats.as_json()
+
+    assert report["fixers"]["example"]["noop_ratio"] is None
+    assert report["files"][0]["bytes"] == 6
+    assert report["files"][0]["tokens"] is None
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
 import ast
+from collections.abc import Callable
+from functools import partial
 
 import pytest
 from tokenize_rt import Token, src_to_tokens, tokens_to_src
 
 from django_upgrade.tokens import (
+    CODE,
     OP,
+    Edit,
+    TokenList,
+    apply_edits,
     delete_argument,
+    erase_decorator,
     erase_def,
+    erase_node_edits,
     find,
     find_call_arg,
     find_first_token,
+    find_first_token_at_line,
+    find_last_token,
+    is_edit_planner,
     parse_call_args,
     remove_call_arg,
     replace_argument_names,
@@ -39,6 +50,125 @@ def tokenize_and_parse(source: str) -> tuple[list[Token], ast.Module]:
     return src_to_tokens(source), ast.parse(source)
 
 
+class TestTokenList:
+    def test_line_start(self):
+        tokens = TokenList(src_to_tokens('x = 1\ny = """\n\n"""\nz = 2\n'))
+
+        assert tokens.line_start(1) == 0
+        assert tokens[tokens.line_start(2)].src == "y"
+        # Lines within a multi-line string map to the next token.
+        assert tokens.line_start(3) == tokens.line_start(4)
+        assert tokens[tokens.line_start(4)].name == "NEWLINE"
+        assert tokens[tokens.line_start(5)].src == "z"
+        assert tokens.line_start(100) == len(tokens)
+
+    def test_insert_rebuilds(self):
+        tokens = TokenList(src_to_tokens("x = 1\ny = 2\n"))
+        assert tokens.line_start(2) == 6
+
+        tokens.insert(0, Token(CODE, "a\n"))
+
+        assert tokens.line_start(2) == 7
+
+    def test_delete_rebuilds(self):
+        tokens = TokenList(src_to_tokens("x = 1\ny = 2\n"))
+        assert tokens.line_start(2) == 6
+
+        del tokens[0:6]
+
+        assert tokens.line_start(2) == 0
+
+    def test_replace_keeps_index(self):
+        tokens = TokenList(src_to_tokens("x = 1\ny = 2\n"))
+        assert tokens.line_start(2) == 6
+        line_starts = tokens._line_starts
+
+        tokens[6] = tokens[6]._replace(name=CODE, src="b")
+        tokens[0] = Token(CODE, "a")
+
+        assert tokens._line_starts is line_starts
+
+    def test_move_rebuilds(self):
+        tokens = TokenList(src_to_tokens("x = 1\ny = 2\n"))
+        assert tokens.line_start(2) == 6
+
+        tokens[0] = tokens[6]
+
+        assert tokens.line_start(2) == 0
+
+    def test_change_keeps_earlier_lines(self):
+        tokens = TokenList(src_to_tokens("x = 1\ny = 2\n"))
+        assert tokens.line_start(2) == 6
+
+        tokens.insert(7, Token(CODE, "a"))
+
+        assert tokens._line_starts == [0, 0, 6]
+
+    def test_changes(self):
+        tokens = TokenList(src_to_tokens("x = 1\n"))
+        assert tokens.changes == 0
+
+        tokens[0] = tokens[0]._replace(name=CODE, src="y")
+        tokens.insert(0, Token(CODE, "a"))
+        tokens.append(Token(CODE, "b"))
+        del tokens[0]
+
+        assert tokens.changes == 4
+
+    def test_mutations(self):
+        def naive_line_start(tokens: list[Token], line: int) -> int:
+            return next(
+                (
+                    i
+                    for i, token in enumerate(tokens)
+                    if token.line is not None and token.line >= line
+                ),
+                len(tokens),
+            )
+
+        mutations: list[Callable[[TokenList], object]] = [
+            lambda tokens: tokens.insert(0, Token(CODE, "a\n")),
+            lambda tokens: tokens.insert(8, Token(CODE, "a\n")),
+            lambda tokens: tokens.insert(-3, Token(CODE, "a\n")),
+            lambda tokens: tokens.__delitem__(slice(0, 6)),
+            lambda tokens: tokens.__delitem__(-4),
+            lambda tokens: tokens.__setitem__(slice(6, 8), [Token(CODE, "a")]),
+            lambda tokens: tokens.__setitem__(slice(None, None, -1), list(tokens)),
+            lambda tokens: tokens.__setitem__(0, tokens[6]),
+            lambda tokens: tokens.__setitem__(-1, tokens[0]),
+            lambda tokens: tokens.append(Token(CODE, "a")),
+            lambda tokens: tokens.extend([Token(CODE, "a")]),
+            lambda tokens: tokens.__iadd__([Token(CODE, "a")]),
+            lambda tokens: tokens.pop(),
+            lambda tokens: tokens.pop(0),
+            lambda tokens: tokens.remove(tokens[-1]),
+            lambda tokens: tokens.reverse(),
+            lambda tokens: tokens.sort(key=lambda token: token.src),
+            lambda tokens: tokens.clear(),
+        ]
+        for mutate in mutations:
+            tokens = TokenList(src_to_tokens("x = 1\ny = 2\nz = 3\n"))
+            assert tokens.line_start(2) == 6
+            mutate(tokens)
+            for line in range(1, 6):
+                assert tokens.line_start(line) == naive_line_start(tokens, line)
+
+    def test_find_helpers(self):
+        source = "x = 1\nf(\n    a,\n    b,\n)\n"
+        plain, mod = tokenize_and_parse(source)
+        indexed = TokenList(plain)
+        stmt = mod.body[1]
+        assert isinstance(stmt, ast.Expr)
+        call = stmt.value
+        assert isinstance(call, ast.Call)
+
+        for tokens in (plain, indexed):
+            assert tokens[find_first_token(tokens, 0, node=call.args[1])].src == "b"
+            assert tokens[find_last_token(tokens, 0, node=call)].src == ")"
+            assert find_first_token_at_line(tokens, 0, line=3) == 9
+            assert find_first_token_at_line(tokens, 12, line=3) == 12
+
+
 class TestRemoveCallArg:
     def check_transformed(self, *, before: str, arg_index: int, after: str) -> None:
         tokens, mod = tokenize_and_parse(before)
@@ -204,6 +334,26 @@ class TestEraseDef:
         )
 
 
+class TestEraseDecorator:
+    def test_one_of_two(self):
+        tokens, mod = tokenize_and_parse(
+            "class A:\n    @dec1()\n    @dec2()\n    def foo():\n        pass\n"
+        )
+        class_def = mod.body[0]
+        assert isinstance(class_def, ast.ClassDef)
+        node = class_def.body[0]
+        assert isinstance(node, ast.FunctionDef)
+        decorator = node.decorator_list[1]
+        assert isinstance(decorator, ast.Call)
+        i = find_first_token(tokens, 0, node=decorator)
+
+        erase_decorator(tokens, i, node=decorator)
+
+        assert tokens_to_src(tokens) == (
+            "class A:\n    @dec1()\n    def foo():\n        pass\n"
+        )
+
+
 class TestUpdateImportNames:
     def check_transformed(
         self, *, before: str, name_map: dict[str, str], after: str
@@ -320,3 +470,69 @@ def test_delete_arguments(before, delete_idx, after):
     delete_argument(delete_idx, tokens, func_args)
 
     assert tokens_to_src(tokens) == after
+
+
+class TestApplyEdits:
+    def test_no_edits(self):
+        tokens = src_to_tokens("x = 1\n")
+        original = tokens.copy()
+
+        apply_edits(tokens, [])
+
+        assert tokens == original
+
+    def test_single(self):
+        tokens = src_to_tokens("x = 1\n")
+
+        apply_edits(tokens, [Edit(0, 1, [Token(CODE, "y")])])
+
+        assert tokens_to_src(tokens) == "y = 1\n"
+
+    def test_many_unordered(self):
+        tokens = src_to_tokens("x = 1\ny = 2\n")
+
+        apply_edits(
+            tokens,
+            [
+                Edit(10, 11, [Token(CODE, "3")]),
+                Edit(0, 1, [Token(CODE, "a")]),
+                Edit(4, 4, [Token(CODE, "-")]),
+            ],
+        )
+
+        assert tokens_to_src(tokens) == "a = -1\ny = 3\n"
+
+    def test_insertions_before_edits_at_same_index(self):
+        tokens = src_to_tokens("x = 1\n")
+
+        apply_edits(
+            tokens,
+            [
+                Edit(0, 6, []),
+                Edit(0, 0, [Token(CODE, "a\n")]),
+                Edit(0, 0, [Token(CODE, "b\n")]),
+            ],
+        )
+
+        assert tokens_to_src(tokens) == "a\nb\n"
+
+    def test_adjacent(self):
+        tokens = src_to_tokens("x = 1\ny = 2\n")
+
+        apply_edits(tokens, [Edit(0, 6, []), Edit(6, 12, [])])
+
+        assert tokens_to_src(tokens) == ""
+
+    def test_overlapping(self):
+        tokens = src_to_tokens("x = 1\n")
+
+        with pytest.raises(AssertionError) as excinfo:
+            apply_edits(tokens, [Edit(0, 3, []), Edit(2, 4, [])])
+
+        assert str(excinfo.value) == "Overlapping token edits at index 2"
+
+
+def test_is_edit_planner():
+    assert is_edit_planner(erase_node_edits)
+    assert is_edit_planner(partial(erase_node_edits, node=ast.Pass()))
+    assert not is_edit_planner(erase_def)